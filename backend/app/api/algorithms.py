@@ -1,18 +1,22 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from typing import List
 from app.models.schemas import Algorithm
 from app.core.metrics import ALGORITHMS
+from app.core.http_cache import StaticPayload
 
 router = APIRouter()
 
+# Serialized once at import - ALGORITHMS only changes on deploy
+ALGORITHMS_PAYLOAD = StaticPayload([
+    Algorithm(
+        id=algo_id,
+        name=info["name"],
+        description=info["description"]
+    )
+    for algo_id, info in ALGORITHMS.items()
+])
+
 @router.get("/list", response_model=List[Algorithm])
-async def get_algorithms():
-    """Get all available recommendation algorithms"""
-    return [
-        Algorithm(
-            id=algo_id,
-            name=info["name"],
-            description=info["description"]
-        )
-        for algo_id, info in ALGORITHMS.items()
-    ]
\ No newline at end of file
+async def get_algorithms(request: Request):
+    """Get all available recommendation algorithms (ETag / 304 aware)"""
+    return ALGORITHMS_PAYLOAD.response(request)
@@ -1,149 +1,197 @@
 # backend/app/api/forwards.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List, Optional  # ADD Optional here
-import pandas as pd
 from app.models.schemas import (
     RecommendationRequest, 
     RecommendationResponse,
     ForwardMetric,
-    PCAResponse
+    PCAResponse,
+    PCAProjectionRequest,
+    PCAProjectionResponse,
+    SimilarPlayersResponse
+)
+import numpy as np
+from app.core.http_cache import DATA_CACHE_CONTROL, check_not_modified, data_etag
+from app.core.analyzers import get_pca_analyzer, get_pca_service, peek_pca_analyzer
+from app.core.compute_pool import ComputeBusy
+from app.core.serialization import FastJSONResponse
+# The forward routes predate /api/{position}/... and delegate to those handlers
+from app.api.positions import (
+    get_position_metrics, get_position_recommendations, get_position_similar_players
 )
-from app.core.metrics import FORWARD_METRICS
-from app.core.database import execute_query
 
 router = APIRouter()
 
-# Lazy initialization
-_analyzer = None
-_pca_analyzer = None
-
-def get_analyzer():
-    global _analyzer
-    if _analyzer is None:
-        from app.core.calculations import PlayerAnalyzer
-        _analyzer = PlayerAnalyzer()
-    return _analyzer
-
-def get_pca_analyzer():
-    global _pca_analyzer
-    if _pca_analyzer is None:
-        from app.core.pca_analysis import ForwardPCAAnalyzer
-        _pca_analyzer = ForwardPCAAnalyzer()
-    return _pca_analyzer
-
 @router.get("/metrics", response_model=List[ForwardMetric])
-async def get_forward_metrics():
-    """Get all available metrics for forwards with descriptions"""
-    metrics = []
-    for metric_id, info in FORWARD_METRICS.items():
-        metrics.append(ForwardMetric(
-            id=metric_id,
-            name=info["name"],
-            description=info["description"],
-            stat_columns=info["columns"]
-        ))
-    return metrics
+async def get_forward_metrics(request: Request):
+    """Get all available metrics for forwards with descriptions (ETag / 304 aware)"""
+    return await get_position_metrics("forward", request)
 
 @router.post("/recommend", response_model=RecommendationResponse)
-async def get_recommendations(request: RecommendationRequest):
-    """Get top forward recommendations based on preferences"""
-    try:
-        # Convert weights to dict format
-        weights = {w.metric: w.weight for w in request.weights}
-        
-        # Validate metrics
-        for metric in weights.keys():
-            if metric not in FORWARD_METRICS:
-                raise HTTPException(status_code=400, detail=f"Invalid metric: {metric}")
-        
-        # Get recommendations
-        analyzer = get_analyzer()
-        recommendations = analyzer.get_recommendations(
-            weights=weights,
-            algorithm=request.algorithm,
-            limit=request.limit
-        )
-        
-        return RecommendationResponse(
-            algorithm_used=request.algorithm,
-            recommendations=recommendations
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_recommendations(request: RecommendationRequest, http_request: Request):
+    """Get top forward recommendations based on preferences (304 if unchanged since the client's ETag)"""
+    return await get_position_recommendations("forward", request, http_request)
 
 @router.get("/pca-data", response_model=PCAResponse)
-async def get_pca_data(k: Optional[int] = None):
+async def get_pca_data(http_request: Request, k: Optional[int] = None,
+                       lod: Optional[str] = None, bins: int = 40, bbox: Optional[str] = None,
+                       layout: str = "rows"):
     """
     Get PCA coordinates for all forwards
     Args:
         k: Optional number of clusters (if not provided, uses optimal)
+        lod: Optional "grid" or "hex" - also return per-cell counts and
+             dominant cluster for the whole map (zoomed-out views)
+        bins: Number of cells across the wider axis of the map in LOD mode
+        bbox: Optional "x_min,y_min,x_max,y_max" - only return the points inside it.
+              In LOD mode no individual points are returned without a bbox.
+        layout: "rows" (list of point objects) or "columns" (parallel arrays, much
+                smaller to serialize and parse for large maps)
     """
+    from app.core.lod import LOD_MODES, bin_points, in_bbox, parse_bbox
+    
+    if lod is not None and lod not in LOD_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid lod: {lod}")
+    if bins < 1 or bins > 500:
+        raise HTTPException(status_code=400, detail="bins must be between 1 and 500")
+    if layout not in ("rows", "columns"):
+        raise HTTPException(status_code=400, detail=f"Invalid layout: {layout}")
     try:
-        # Get the data - reuse the same data structure from PlayerAnalyzer
-        query = """
-            SELECT 
-                p.id as player_id,
-                p.name,
-                p.team,
-                p.position,
-                pp.percentiles,
-                -- Add these for filtering
-                s.performance_gls,
-                s.playing_time_90s
-            FROM football_data.players p
-            JOIN football_data.player_percentiles_all pp ON p.id = pp.player_id
-            LEFT JOIN football_data.player_standard_stats s ON p.name = s.player
-            WHERE pp.position_group = 'forward'
-            AND pp.percentiles IS NOT NULL
-            -- ADD FILTERS HERE:
-            AND CAST(s.performance_gls AS FLOAT) >= 5  -- Min 5 goals
-            AND CAST(s.playing_time_90s AS FLOAT) >= 10  -- Min 10 90s played
-        """
-        
-        df = execute_query(query)
+        box = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid bbox: {e}")
+    
+    # ETag from the data version and normalized parameters - checked before any compute
+    pca_analyzer = get_pca_analyzer()
+    version, _, normalized_k = pca_analyzer.cache_key(k)
+    etag = data_etag(version, "forward/pca-data", {
+        "k": normalized_k, "lod": lod, "bins": bins if lod else None, "bbox": box, "layout": layout
+    })
+    cached = check_not_modified(http_request, etag)
+    if cached is not None:
+        return cached
+    
+    try:
+        print(f"Computing PCA with k={k}")  # Debug log
+        # Cached per data version and k; otherwise computed in the worker pool
+        pca_results = await get_pca_service().get_pca(custom_k=k)
         
-        if df.empty:
+        if pca_results is None:
             raise HTTPException(status_code=404, detail="No forward data found")
         
-        # Expand percentiles JSON into columns more efficiently
-        import json
-        
-        # Collect all percentile columns first
-        percentile_data = {}
+        # Indexes of the points to send (None = all of them)
+        selected = None
+        if box is not None:
+            selected = np.flatnonzero(in_bbox(pca_results["coords"], box)).tolist()
+        elif lod is not None:
+            selected = []
         
-        for idx, row in df.iterrows():
-            percentiles = json.loads(row['percentiles']) if isinstance(row['percentiles'], str) else row['percentiles']
-            for key, value in percentiles.items():
-                if value is not None:  # Only add non-null percentiles
-                    col_name = f"{key}_pct"
-                    if col_name not in percentile_data:
-                        percentile_data[col_name] = {}
-                    percentile_data[col_name][idx] = value
+        points, columns = [], None
+        if layout == "columns":
+            columns = {
+                field: values if selected is None else [values[i] for i in selected]
+                for field, values in pca_results["columns"].items()
+                if field != "cluster"
+            }
+        else:
+            points = pca_results["points"] if selected is None else [pca_results["points"][i] for i in selected]
         
-        # Convert to DataFrame and join all at once
-        if percentile_data:
-            percentile_df = pd.DataFrame.from_dict(percentile_data)
-            percentile_df.index = df.index
-            df = pd.concat([df, percentile_df], axis=1)
+        binned = bin_points(pca_results["coords"], pca_results["clusters"], lod, bins) if lod else {}
         
-        # Get PCA analyzer and compute with custom k if provided
-        pca_analyzer = get_pca_analyzer()
-        print(f"Computing PCA with k={k}")  # Debug log
-        pca_results = pca_analyzer.compute_pca(df, custom_k=k)  # Pass the k parameter
-        
-        # Format for response
-        return PCAResponse(
-            points=pca_results["points"],
-            explained_variance=pca_results["explained_variance"],
-            pc_interpretation=pca_results["pc_interpretation"],
-            cluster_centers=pca_results.get("cluster_centers", [])
-        )
+        # Format for response - the cached parts are already in PCAResponse shape,
+        # so they are serialized as-is instead of being validated point by point
+        return FastJSONResponse({
+            "points": points,
+            "columns": columns,
+            "explained_variance": pca_results["explained_variance"],
+            "pc_interpretation": pca_results["pc_interpretation"],
+            "cluster_centers": pca_results.get("cluster_centers", []),
+            "lod": lod,
+            "cell_size": binned.get("cell_size"),
+            "cells": binned.get("cells")
+        }, headers={"ETag": etag, "Cache-Control": DATA_CACHE_CONTROL})
         
+    except HTTPException:
+        raise
+    except ComputeBusy as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
     except ValueError as e:
         # Not enough data for PCA
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"PCA Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-        # Return the fallback mock data...
\ No newline at end of file
+        # Return the fallback mock data...
+
+@router.post("/pca-project", response_model=PCAProjectionResponse)
+async def project_players(request: PCAProjectionRequest):
+    """
+    Place forwards on the current PCA map using its frozen basis -
+    works for players outside the map's filters, without moving anyone else
+    """
+    pca_analyzer = get_pca_analyzer()
+    snapshot = pca_analyzer.store.view("forward")
+    
+    # player_id -> first snapshot row
+    ids, first_rows = np.unique(snapshot.player_ids, return_index=True)
+    positions = np.searchsorted(ids, request.player_ids)
+    found = np.array([
+        pos < len(ids) and ids[pos] == player_id
+        for pos, player_id in zip(positions, request.player_ids)
+    ], dtype=bool)
+    rows = first_rows[positions[found]] if found.any() else np.array([], dtype=int)
+    missing = [player_id for player_id, ok in zip(request.player_ids, found) if not ok]
+    
+    try:
+        # Map and fitted basis for this k, computed (or refitted) off the event loop
+        basis = await get_pca_service().get_basis(request.k)
+        if basis is None:
+            raise HTTPException(status_code=404, detail="No forward data found")
+        if not len(rows):
+            # Nothing to project (no ids, or none of them known) - the scaler rejects 0 rows
+            return PCAProjectionResponse(k=basis[1], points=[], missing=missing)
+        
+        X = snapshot.matrix(basis[0]["feature_cols"])[rows].astype(float)
+        projected = pca_analyzer.project_features(X, basis=basis)
+        names = snapshot.labels('name', rows)
+        teams = snapshot.labels('team', rows)
+        
+        points = [
+            {
+                "player_id": int(snapshot.player_ids[row]),
+                "name": names[i],
+                "team": teams[i] or 'Unknown',
+                "x": float(projected["coords"][i, 0]),
+                "y": float(projected["coords"][i, 1]),
+                "cluster": f"Group {projected['clusters'][i] + 1}",
+                "cluster_id": int(projected['clusters'][i])
+            }
+            for i, row in enumerate(rows)
+        ]
+        return PCAProjectionResponse(k=projected["k"], points=points, missing=missing)
+    
+    except HTTPException:
+        raise
+    except ComputeBusy as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        print(f"PCA projection error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/pca-status")
+async def get_pca_status():
+    """Progress of the background clustering of every k for the current data"""
+    pca_analyzer = peek_pca_analyzer()  # a status read must not load the store
+    if pca_analyzer is None:
+        return {"state": "idle", "version": None, "done": 0, "total": 0, "error": None}
+    return pca_analyzer.precompute_status
+
+@router.get("/{player_id}/similar", response_model=SimilarPlayersResponse)
+async def get_similar_players(player_id: int, limit: int = 10, metric: str = "cosine"):
+    """
+    Get the forwards most similar to a given player
+    Args:
+        limit: Number of similar players to return
+        metric: "cosine" or "euclidean" distance over standardized percentiles
+    """
+    return await get_position_similar_players("forward", player_id, limit=limit, metric=metric)
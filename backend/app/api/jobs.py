@@ -0,0 +1,103 @@
+# backend/app/api/jobs.py
+from fastapi import APIRouter, HTTPException
+from app.models.schemas import JobRequest, JobStatus, PCAResponse, RecommendationResponse
+from app.core.metrics import POSITION_METRICS
+from app.core.analyzers import get_analyzer, get_pca_analyzer
+from app.core.jobs import QueueFull, get_job_manager
+from app.api.positions import resolve_position
+
+router = APIRouter()
+
+JOB_TYPES = ["pca", "recommend"]
+
+
+def _pca_job(k):
+    """Forward PCA map (same body as /api/forwards/pca-data)"""
+    def run(report):
+        results = get_pca_analyzer().get_pca(custom_k=k)
+        if results is None:
+            raise ValueError("No forward data found")
+        return PCAResponse(
+            points=results["points"],
+            explained_variance=results["explained_variance"],
+            pc_interpretation=results["pc_interpretation"],
+            cluster_centers=results.get("cluster_centers", [])
+        ).model_dump()
+    return run
+
+
+def _recommend_job(group, requests):
+    """Several recommendation queries for one position, in order"""
+    def run(report):
+        analyzer = get_analyzer(group)
+        responses = []
+        for i, request in enumerate(requests):
+            recommendations = analyzer.get_recommendations(
+                weights={w.metric: w.weight for w in request.weights},
+                algorithm=request.algorithm,
+                limit=request.limit,
+                filters=request.filters.model_dump(exclude_none=True) if request.filters else None
+            )
+            responses.append(RecommendationResponse(
+                algorithm_used=request.algorithm,
+                recommendations=recommendations
+            ).model_dump())
+            report((i + 1) / len(requests))
+        return {"position": group, "responses": responses}
+    return run
+
+
+@router.post("", response_model=JobStatus, status_code=202)
+async def submit_job(request: JobRequest):
+    """
+    Queue a long-running analysis and return its id immediately
+    Types:
+        pca: forward PCA map with request.k clusters (optimal when omitted)
+        recommend: every request in request.requests for request.position
+    """
+    if request.type not in JOB_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid job type: {request.type}")
+
+    if request.type == "pca":
+        func = _pca_job(request.k)
+        params = {"k": request.k}
+    else:
+        group = resolve_position(request.position)
+        if not request.requests:
+            raise HTTPException(status_code=400, detail="recommend jobs need at least one request")
+        for item in request.requests:
+            for w in item.weights:
+                if w.metric not in POSITION_METRICS[group]:
+                    raise HTTPException(status_code=400, detail=f"Invalid metric for {group}: {w.metric}")
+        func = _recommend_job(group, request.requests)
+        params = {"position": group, "requests": len(request.requests)}
+
+    try:
+        job = get_job_manager().submit(request.type, func, params)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    return job.to_dict()
+
+
+def _get_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+    return job
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job_status(job_id: str):
+    """Status and progress of a submitted job"""
+    return _get_job(job_id).to_dict()
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Result of a finished job - 409 while it is still queued or running"""
+    job = _get_job(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return job.result
@@ -0,0 +1,147 @@
+# backend/app/api/positions.py
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import List
+from app.models.schemas import (
+    RecommendationRequest,
+    RecommendationResponse,
+    ForwardMetric,
+    SimilarPlayersResponse
+)
+from app.core.metrics import POSITION_METRICS
+from app.core.analyzers import get_analyzer, get_feature_store
+from app.core.serialization import FastJSONResponse
+from app.core.http_cache import (
+    StaticPayload, DATA_CACHE_CONTROL, check_not_modified, data_etag, recommendation_params
+)
+
+router = APIRouter()
+
+def resolve_position(position: str) -> str:
+    """Map a path segment ("forward", "forwards", "Midfielders", ...) to a position group"""
+    group = position.lower()
+    if group not in POSITION_METRICS and group.endswith("s"):
+        group = group[:-1]
+    if group not in POSITION_METRICS:
+        raise HTTPException(status_code=404, detail=f"Unknown position: {position}")
+    return group
+
+# Serialized once at import - one catalog per position group
+METRICS_PAYLOADS = {
+    group: StaticPayload([
+        ForwardMetric(
+            id=metric_id,
+            name=info["name"],
+            description=info["description"],
+            stat_columns=info["columns"]
+        )
+        for metric_id, info in metrics.items()
+    ])
+    for group, metrics in POSITION_METRICS.items()
+}
+
+@router.get("/{position}/metrics", response_model=List[ForwardMetric])
+async def get_position_metrics(position: str, request: Request):
+    """Get all available metrics for a position with descriptions (ETag / 304 aware)"""
+    return METRICS_PAYLOADS[resolve_position(position)].response(request)
+
+@router.post("/{position}/recommend", response_model=RecommendationResponse)
+async def get_position_recommendations(position: str, request: RecommendationRequest,
+                                       http_request: Request):
+    """Get top recommendations for a position based on preferences (304 if unchanged since the client's ETag)"""
+    group = resolve_position(position)
+    weights = {w.metric: w.weight for w in request.weights}
+    
+    for metric in weights.keys():
+        if metric not in POSITION_METRICS[group]:
+            raise HTTPException(status_code=400, detail=f"Invalid metric for {group}: {metric}")
+    
+    analyzer = get_analyzer(group)
+    etag = data_etag(analyzer.store.version, f"{group}/recommend", recommendation_params(request))
+    cached = check_not_modified(http_request, etag)
+    if cached is not None:
+        return cached
+    
+    try:
+        recommendations = analyzer.get_recommendations(
+            weights=weights,
+            algorithm=request.algorithm,
+            limit=request.limit,
+            filters=request.filters.model_dump(exclude_none=True) if request.filters else None
+        )
+        
+        # Validated once here, then serialized without FastAPI re-validating it
+        return FastJSONResponse(
+            RecommendationResponse(
+                algorithm_used=request.algorithm,
+                recommendations=recommendations
+            ).model_dump(),
+            headers={"ETag": etag, "Cache-Control": DATA_CACHE_CONTROL}
+        )
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{position}/{player_id}/similar", response_model=SimilarPlayersResponse)
+async def get_position_similar_players(position: str, player_id: int, limit: int = 10, metric: str = "cosine"):
+    """Get the players of a position most similar to a given player"""
+    from app.core.similarity import SIMILARITY_METRICS
+    
+    group = resolve_position(position)
+    if metric not in SIMILARITY_METRICS:
+        raise HTTPException(status_code=400, detail=f"Invalid metric: {metric}")
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    
+    index = get_analyzer(group).similarity_index
+    if player_id not in index:
+        raise HTTPException(status_code=404, detail=f"No percentile data for {group} {player_id}")
+    
+    try:
+        return SimilarPlayersResponse(
+            player_id=player_id,
+            name=index.player_name(player_id),
+            metric=metric,
+            similar=index.query(player_id, limit=limit, metric=metric)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{position}/export")
+async def export_position(position: str, http_request: Request, format: str = "ndjson",
+                          chunk_size: int = 1000):
+    """
+    Stream every player of a position with display fields and percentiles
+    Args:
+        format: "ndjson" (one JSON object per line) or "arrow" (Arrow IPC stream, needs pyarrow)
+        chunk_size: Rows encoded per chunk of the response
+    """
+    from app.core.export import EXPORT_FORMATS, iter_arrow, iter_ndjson, pyarrow
+    
+    group = resolve_position(position)
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format: {format}")
+    if format == "arrow" and pyarrow is None:
+        raise HTTPException(status_code=501, detail="Arrow export requires pyarrow")
+    if chunk_size < 1 or chunk_size > 100000:
+        raise HTTPException(status_code=400, detail="chunk_size must be between 1 and 100000")
+    
+    store = get_feature_store()
+    etag = data_etag(store.version, f"{group}/export", {"format": format})
+    cached = check_not_modified(http_request, etag)
+    if cached is not None:
+        return cached
+    
+    # The generator keeps its own reference to this view, so a concurrent reload can't tear the export
+    snapshot = store.view(group)
+    rows = iter_ndjson(snapshot, chunk_size) if format == "ndjson" else iter_arrow(snapshot, chunk_size)
+    extension = "ndjson" if format == "ndjson" else "arrows"
+    return StreamingResponse(
+        rows,
+        media_type=EXPORT_FORMATS[format],
+        headers={
+            "ETag": etag,
+            "Cache-Control": DATA_CACHE_CONTROL,
+            "Content-Disposition": f'attachment; filename="{group}s.{extension}"'
+        }
+    )
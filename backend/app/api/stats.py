@@ -1,19 +1,29 @@
 from fastapi import APIRouter, HTTPException
 from typing import Dict
-from app.core.database import execute_query
+from app.models.schemas import PercentilesBatchRequest, PercentilesBatchResponse
+from app.core.analyzers import get_analyzer
+from app.api.positions import resolve_position
 
 router = APIRouter()
 
+# Upper bound on ids per batch request
+MAX_BATCH_PLAYERS = 500
+
 @router.get("/percentiles/{position}/{player_id}", response_model=Dict[str, float])
 async def get_player_percentiles(position: str, player_id: int):
-    """Get percentile ranks for a specific player"""
-    # For now, return mock data
-    return {
-        "finishing": 95.5,
-        "physical": 88.2,
-        "creativity": 45.3,
-        "pace_dribbling": 72.1,
-        "work_rate": 65.8,
-        "positioning": 92.3,
-        "linkup": 58.9
-    }
\ No newline at end of file
+    """Get percentile ranks for a specific player (metric ids and raw `*_pct` columns)"""
+    group = resolve_position(position)
+    result = get_analyzer(group).get_percentiles([player_id])
+    if result["missing"]:
+        raise HTTPException(status_code=404, detail=f"No percentile data for {group} {player_id}")
+    return result["players"][player_id]
+
+@router.post("/percentiles", response_model=PercentilesBatchResponse)
+async def get_players_percentiles(request: PercentilesBatchRequest):
+    """Get percentile ranks for several players of one position in one call"""
+    group = resolve_position(request.position)
+    if len(request.player_ids) > MAX_BATCH_PLAYERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_PLAYERS} players per request")
+    
+    result = get_analyzer(group).get_percentiles(request.player_ids)
+    return PercentilesBatchResponse(position=group, players=result["players"], missing=result["missing"])
@@ -0,0 +1,121 @@
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+from app.core.metrics import POSITION_METRICS
+
+if TYPE_CHECKING:  # imported lazily below - calculations pulls in the data layer
+    from app.core.calculations import PlayerAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Lazy initialization - one shared feature store, one analyzer view per position
+# and the PCA analyzer, all reading the same snapshot.
+# The startup warm-up builds these from a worker thread, so creation is locked.
+_lock = threading.RLock()
+_feature_store = None
+_analyzers: Dict[str, "PlayerAnalyzer"] = {}
+_pca_analyzer = None
+_pca_service = None
+
+# Data-version watcher (see reload_if_changed)
+_reload_lock = threading.Lock()
+_watcher: Optional[threading.Thread] = None
+_watcher_stop = threading.Event()
+
+def get_feature_store():
+    global _feature_store
+    with _lock:
+        if _feature_store is None:
+            from app.core.feature_store import FeatureStore
+            _feature_store = FeatureStore()
+    return _feature_store
+
+def get_analyzer(position: str = "forward"):
+    if position not in POSITION_METRICS:
+        raise ValueError(f"Unknown position: {position}")
+    with _lock:
+        if position not in _analyzers:
+            from app.core.calculations import PlayerAnalyzer
+            _analyzers[position] = PlayerAnalyzer(position, store=get_feature_store())
+    return _analyzers[position]
+
+def get_pca_analyzer():
+    global _pca_analyzer
+    with _lock:
+        if _pca_analyzer is None:
+            from app.core.pca_analysis import ForwardPCAAnalyzer
+            _pca_analyzer = ForwardPCAAnalyzer(store=get_feature_store())
+    return _pca_analyzer
+
+def peek_pca_analyzer():
+    """The PCA analyzer if it was already built, else None - never waits or loads (for probes)"""
+    return _pca_analyzer
+
+def get_pca_service():
+    global _pca_service
+    with _lock:
+        if _pca_service is None:
+            from app.core.compute_pool import PCAComputeService
+            _pca_service = PCAComputeService(get_pca_analyzer())
+    return _pca_service
+
+def shutdown_pca_service():
+    global _pca_service
+    with _lock:
+        if _pca_service is not None:
+            _pca_service.shutdown()
+            _pca_service = None
+
+def reload_if_changed() -> bool:
+    """
+    Re-check the percentiles table's version and, if it changed, build a new
+    feature store plus every position analyzer loaded so far, then swap them in
+    together. Requests keep using the old objects until the swap, so nothing
+    ever sees a half-built store. Returns True when new data was loaded.
+    """
+    global _feature_store, _analyzers
+    from app.core.feature_store import FeatureStore, fetch_data_version
+    from app.core.calculations import PlayerAnalyzer
+
+    with _reload_lock:
+        current = _feature_store
+        if current is None:
+            return False  # nothing loaded yet - the first request loads the latest data
+        if fetch_data_version() == current.version:
+            return False
+
+        store = FeatureStore()
+        with _lock:
+            positions = list(_analyzers)
+        analyzers = {position: PlayerAnalyzer(position, store=store) for position in positions}
+
+        with _lock:
+            _feature_store = store
+            _analyzers = analyzers
+            if _pca_analyzer is not None:
+                _pca_analyzer.use_store(store)
+
+    logger.info(f"Data changed ({current.version} -> {store.version}), feature store reloaded")
+    return True
+
+def _watch_data_version(interval: float):
+    while not _watcher_stop.wait(interval):
+        try:
+            reload_if_changed()
+        except Exception as e:
+            logger.warning(f"Data version check failed: {e}")
+
+def start_version_watcher(interval: float):
+    """Check for new data every `interval` seconds in a background thread (<= 0: never)"""
+    global _watcher
+    if interval <= 0 or _watcher is not None:
+        return
+    _watcher_stop.clear()
+    _watcher = threading.Thread(target=_watch_data_version, args=(interval,),
+                                name="data-version-watcher", daemon=True)
+    _watcher.start()
+
+def stop_version_watcher():
+    global _watcher
+    _watcher_stop.set()
+    _watcher = None
@@ -0,0 +1,311 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.core.timing import span
+
+try:
+    import redis
+except ImportError:  # optional - only needed for CACHE_BACKEND=redis
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Value encoding: magic | flags | then, zlib'd when large: uint32 structure length |
+# uint32 array count | JSON structure | uint64 array sizes | raw array buffers
+_MAGIC = b"LC1"
+_COMPRESSED = 1
+_COMPRESS_MIN = 1024
+_ARRAY_TAG = "__ndarray__"
+
+
+def pack(value: Any) -> bytes:
+    """
+    Compact binary encoding for cached values. JSON-shaped data is encoded
+    once, NumPy arrays are appended as raw buffers (a float32 coordinate is
+    4 bytes instead of ~20 characters of text), and payloads over 1 KB are
+    zlib-compressed. No pickle, so a shared cache can't execute code.
+    """
+    buffers: List[bytes] = []
+
+    def strip(obj):
+        if isinstance(obj, np.ndarray) and obj.dtype != object:
+            buffers.append(np.ascontiguousarray(obj).tobytes())
+            return {_ARRAY_TAG: [len(buffers) - 1, obj.dtype.str, list(obj.shape)]}
+        if isinstance(obj, dict):
+            return {key: strip(item) for key, item in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [strip(item) for item in obj]
+        return obj
+
+    structure = dumps(strip(value))
+    sizes = struct.pack(f"<{len(buffers)}Q", *(len(b) for b in buffers))
+    payload = (struct.pack("<II", len(structure), len(buffers)) + structure + sizes + b"".join(buffers))
+
+    flags = 0
+    if len(payload) >= _COMPRESS_MIN:
+        payload = zlib.compress(payload, 1)
+        flags |= _COMPRESSED
+    return _MAGIC + bytes([flags]) + payload
+
+
+def unpack(data: bytes) -> Any:
+    """Inverse of pack() - arrays come back as read-only views of the payload"""
+    if data[:len(_MAGIC)] != _MAGIC:
+        raise ValueError("not a packed cache value")
+    flags = data[len(_MAGIC)]
+    payload = data[len(_MAGIC) + 1:]
+    if flags & _COMPRESSED:
+        payload = zlib.decompress(payload)
+
+    structure_len, n_buffers = struct.unpack_from("<II", payload)
+    offset = 8
+    structure = json.loads(payload[offset:offset + structure_len])
+    offset += structure_len
+    sizes = struct.unpack_from(f"<{n_buffers}Q", payload, offset)
+    offset += 8 * n_buffers
+    starts = []
+    for size in sizes:
+        starts.append(offset)
+        offset += size
+
+    def restore(obj):
+        if isinstance(obj, dict):
+            if _ARRAY_TAG in obj and len(obj) == 1:
+                index, dtype, shape = obj[_ARRAY_TAG]
+                count = int(np.prod(shape)) if shape else 1
+                return np.frombuffer(payload, dtype=np.dtype(dtype), count=count,
+                                     offset=starts[index]).reshape(shape)
+            return {key: restore(item) for key, item in obj.items()}
+        if isinstance(obj, list):
+            return [restore(item) for item in obj]
+        return obj
+
+    return restore(structure)
+
+
+class CacheBackend:
+    """Byte store behind ResultCache - get/set/delete by string key, optional TTL in seconds"""
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU - nothing is shared between workers"""
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    Stand-in for Redis on a single host: one file per key in a directory, so
+    every worker on the machine shares entries and they survive restarts.
+    Files are replaced atomically; expired ones are removed when read and
+    swept now and then on write.
+    """
+    SWEEP_EVERY = 256  # writes between sweeps of expired files, on average
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".bin")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < 8:
+            return None
+        (expires,) = struct.unpack_from("<d", data)
+        if expires and expires < time.time():
+            self._remove(path)
+            return None
+        return data[8:]
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(struct.pack("<d", time.time() + ttl if ttl else 0.0) + value)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Local cache write failed: {e}")
+            self._remove(tmp_path)
+        if random.randrange(self.SWEEP_EVERY) == 0:
+            self.sweep()
+
+    def delete(self, key: str):
+        self._remove(self._path(key))
+
+    def sweep(self):
+        """Delete expired entries (old data versions are never read again, so they age out here)"""
+        now = time.time()
+        for name in os.listdir(self.directory):
+            if not name.endswith(".bin"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "rb") as f:
+                    (expires,) = struct.unpack("<d", f.read(8))
+            except (OSError, struct.error):
+                continue
+            if expires and expires < now:
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis, shared by every worker and instance. Connection problems are
+    logged (at most once a minute) and treated as misses - the cache must
+    never fail a request.
+    """
+    def __init__(self, url: str, timeout: float = 0.25):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package")
+        self.client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self._last_error = 0.0
+
+    def _failed(self, e: Exception):
+        now = time.monotonic()
+        if now - self._last_error > 60:
+            logger.warning(f"Redis cache unavailable: {e}")
+        self._last_error = now
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(key)
+        except redis.RedisError as e:
+            self._failed(e)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None):
+        try:
+            self.client.set(key, value, ex=ttl or None)
+        except redis.RedisError as e:
+            self._failed(e)
+
+    def delete(self, key: str):
+        try:
+            self.client.delete(key)
+        except redis.RedisError as e:
+            self._failed(e)
+
+
+CACHE_BACKENDS = ["memory", "local", "redis"]
+
+# Lazy initialization - one backend per process, shared by every ResultCache
+_lock = threading.Lock()
+_backend: Optional[CacheBackend] = None
+
+def create_cache_backend(name: str) -> CacheBackend:
+    if name == "redis":
+        try:
+            return RedisCacheBackend(settings.REDIS_URL)
+        except RuntimeError as e:
+            logger.warning(f"{e} - using the in-process cache")
+            return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+    if name == "local":
+        return LocalCacheBackend(settings.CACHE_DIR)
+    if name != "memory":
+        logger.warning(f"Unknown CACHE_BACKEND {name!r} - using the in-process cache")
+    return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+
+def get_cache_backend() -> CacheBackend:
+    global _backend
+    with _lock:
+        if _backend is None:
+            _backend = create_cache_backend(settings.CACHE_BACKEND)
+    return _backend
+
+
+class ResultCache:
+    """
+    Cached results of one kind (recommendations, PCA maps, image lookups).
+    Keys are "lens:<namespace>:<data version>:<params digest>", so a new
+    data version never reads an older entry; values go through pack().
+    Backend errors and undecodable values count as misses.
+    """
+    def __init__(self, namespace: str, ttl: Optional[int] = None):
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def key(self, version: Optional[str], params: Dict) -> str:
+        version_tag = hashlib.sha1(str(version).encode()).hexdigest()[:12] if version is not None else "-"
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, separators=(",", ":"), default=str).encode()
+        ).hexdigest()
+        return f"lens:{self.namespace}:{version_tag}:{digest}"
+
+    def get(self, version: Optional[str], params: Dict) -> Optional[Any]:
+        with span(f"{self.namespace}_cache"):
+            data = get_cache_backend().get(self.key(version, params))
+            if data is None:
+                return None
+            try:
+                return unpack(data)
+            except (ValueError, struct.error, zlib.error) as e:
+                logger.warning(f"Dropping unreadable {self.namespace} cache entry: {e}")
+                return None
+
+    def set(self, version: Optional[str], params: Dict, value: Any, ttl: Optional[int] = None):
+        """Store value - `ttl` overrides the namespace TTL (e.g. what is left of an older entry's)"""
+        if ttl is None:
+            ttl = self.ttl if self.ttl is not None else settings.CACHE_TTL
+        with span(f"{self.namespace}_cache"):
+            get_cache_backend().set(self.key(version, params), pack(value), ttl)
@@ -1,120 +1,124 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
-from app.core.database import execute_query
-from app.core.metrics import FORWARD_METRICS
+from typing import Dict, List, Optional
+from app.core.metrics import POSITION_METRICS, RADAR_PERCENTILES
+from app.core.feature_store import FeatureStore
+from app.core.pca_analysis import PCA_FEATURE_COLUMNS
+from app.core.filters import FilterIndex
+from app.core.similarity import PlayerSimilarityIndex
+from app.core.skyline import pareto_fronts
+from app.core.cache import ResultCache
+from app.core.timing import span, timed
 from app.services.player_images import player_image_service
 
+# Ranked recommendations per (data version, position, request), shared across workers
+RECOMMENDATION_CACHE = ResultCache("recommend")
+
 class PlayerAnalyzer:
-    def __init__(self):
-        self.position = "forward"
+    def __init__(self, position: str = "forward", store: Optional[FeatureStore] = None):
+        self.position = position
+        self.metrics = POSITION_METRICS[position]
+        self.store = store if store is not None else FeatureStore()
         self._load_data()
         
     def _load_data(self):
-        """Load all forward data with precomputed percentiles"""
-        try:
-            # Get forwards with their precomputed percentiles AND stats
-            query = """
-            SELECT 
-                p.id as player_id,
-                p.name,
-                p.team,
-                p.position,
-                p.age,
-                pp.percentiles,
-                s.performance_gls,
-                s.performance_ast,
-                s.expected_xg,
-                sh.standard_sh,
-                pos.touches_att_pen
-            FROM football_data.players p
-            JOIN football_data.player_percentiles_all pp ON p.id = pp.player_id
-            LEFT JOIN football_data.player_standard_stats s ON p.name = s.player
-            LEFT JOIN football_data.player_shooting_stats sh ON p.name = sh.player
-            LEFT JOIN football_data.player_possession_stats pos ON p.name = pos.player
-            WHERE pp.position_group = 'forward'
-            """
-            
-            self.df = execute_query(query)
-            
-            # Expand the JSON percentiles into columns more efficiently
-            if not self.df.empty and 'percentiles' in self.df.columns:
-                import json
-                
-                # Method 1: Collect all percentile data first, then create DataFrame
-                percentile_data = {}
-                
-                for idx, row in self.df.iterrows():
-                    percentiles = json.loads(row['percentiles']) if isinstance(row['percentiles'], str) else row['percentiles']
-                    for key, value in percentiles.items():
-                        col_name = f"{key}_pct"
-                        if col_name not in percentile_data:
-                            percentile_data[col_name] = {}
-                        percentile_data[col_name][idx] = value
-                
-                # Create a new DataFrame from the collected data and join it all at once
-                if percentile_data:
-                    percentile_df = pd.DataFrame.from_dict(percentile_data)
-                    percentile_df.index = self.df.index
-                    # Join all columns at once to avoid fragmentation
-                    self.df = pd.concat([self.df, percentile_df], axis=1)
-            
-            print(f"Loaded {len(self.df)} forwards with precomputed percentiles")
-            
-            # Convert numeric columns
-            numeric_cols = ['performance_gls', 'performance_ast', 'expected_xg', 'n_90s', 'standard_sh', 'touches_att_pen']
-            for col in numeric_cols:
-                if col in self.df.columns:
-                    self.df[col] = pd.to_numeric(self.df[col], errors='coerce').fillna(0)
-            
-        except Exception as e:
-            print(f"Error loading data: {e}")
-            # Fallback
-            self._load_data_fallback()
-                        
-    def _compute_percentiles(self):
-        """Compute percentile ranks for all numeric columns"""
-        # First, identify truly numeric columns by trying to convert them
-        for col in self.df.columns:
-            if col not in ['player_id', 'id', 'age', 'name', 'team', 'position', 'player', 'nation', 'born', 'league', 'season']:
-                try:
-                    # Try to convert to numeric
-                    self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
-                except:
-                    pass
-        
-        # Now get numeric columns
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-        
-        for col in numeric_cols:
-            if col not in ['player_id', 'id', 'age']:
-                # Create percentile column
-                self.df[f"{col}_pct"] = self.df[col].rank(pct=True, na_option='keep') * 100
+        """Take this position's rows from the shared feature store and build indexes"""
+        # A view of the shared snapshot - percentiles are already parsed into the float32 matrix
+        self.snapshot = self.store.view(self.position)
+        
+        print(f"Loaded {len(self.snapshot)} {self.position}s with precomputed percentiles")
+        
+        # Precompute sorted columns / category codes for request filters
+        self.filter_index = FilterIndex(self.snapshot)
+        
+        # Neighbour index for "players like X" queries
+        feature_cols = PCA_FEATURE_COLUMNS if self.position == "forward" else RADAR_PERCENTILES[self.position]
+        self.similarity_index = PlayerSimilarityIndex(self.snapshot, feature_cols)
+        
+        # player_id -> snapshot row (first row if a player appears twice) for direct lookups
+        ids, first_rows = np.unique(self.snapshot.player_ids, return_index=True)
+        self.row_by_player = dict(zip(ids.tolist(), first_rows.tolist()))
+        
+        # Percentile columns this position actually has, and every metric's percentile per row
+        self.percentile_cols = self.snapshot.populated_columns('_pct')
+        self.percentile_col_idx = np.array([self.snapshot.column_index[col] for col in self.percentile_cols],
+                                           dtype=np.int64)
+        self.metric_index = {metric_id: i for i, metric_id in enumerate(self.metrics)}
+        self.metric_percentiles = self._metric_percentiles()
+    
+    def _metric_percentiles(self) -> np.ndarray:
+        """
+        (rows x metrics) percentile of each metric: the mean of its `columns` percentiles.
+        The one definition behind both recommendation percentile_ranks and
+        get_percentiles(). Missing columns are left out of a player's mean, all missing gives NaN.
+        """
+        result = np.full((len(self.snapshot), len(self.metrics)), np.nan)
+        for i, metric_info in enumerate(self.metrics.values()):
+            pct_cols = [f"{col}_pct" for col in metric_info['columns'] if self.snapshot.has_column(f"{col}_pct")]
+            if not pct_cols:
+                continue
+            # Percentiles are stored with 2 decimals - drop float32 noise before averaging
+            values = np.round(self.snapshot.matrix(pct_cols).astype(np.float64), 2)
+            present = ~np.isnan(values)
+            counts = present.sum(axis=1)
+            totals = np.where(present, values, 0.0).sum(axis=1)
+            result[:, i] = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+        # Rounded once here, so every caller shows the same 2-decimal value
+        return result.round(2)
+    
+    def get_percentiles(self, player_ids: List[int]) -> Dict:
+        """
+        Metric percentiles plus raw `*_pct` percentiles for each requested player, in one
+        gather over the snapshot. Returns {"players": {player_id: {...}}, "missing": [...]}
+        """
+        found = [pid for pid in player_ids if pid in self.row_by_player]
+        missing = [pid for pid in player_ids if pid not in self.row_by_player]
+        rows = np.array([self.row_by_player[pid] for pid in found], dtype=np.int64)
+        
+        names = list(self.metrics.keys()) + self.percentile_cols
+        values = np.hstack([
+            self.metric_percentiles[rows],
+            # Only the requested rows - not a full column copy first
+            self.snapshot.features[np.ix_(rows, self.percentile_col_idx)]
+        ]).astype(np.float64).round(2)
+        present = ~np.isnan(values)
+        
+        players = {}
+        for i, pid in enumerate(found):
+            players[pid] = {name: value for name, value, ok in zip(names, values[i].tolist(), present[i].tolist()) if ok}
+        return {"players": players, "missing": missing}
 
-    def calculate_metric_scores(self, metric_weights: Dict[str, float]) -> pd.DataFrame:
-        """Calculate composite scores for each metric based on user preferences"""
-        scores_df = self.df[['player_id', 'name', 'team', 'position', 'age']].copy()
+    @timed("score")
+    def calculate_metric_scores(self, metric_weights: Dict[str, float],
+                                mask: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Calculate composite scores for each metric based on user preferences
+        Args:
+            metric_weights: User weights per metric (0-100)
+            mask: Optional boolean row mask from FilterIndex - only these rows are scored
+        Returns one row per scored player with its snapshot row, player_id and metric scores
+        """
+        rows = np.arange(len(self.snapshot)) if mask is None else np.flatnonzero(mask)
+        scores_df = pd.DataFrame({
+            'row': rows,
+            'player_id': self.snapshot.player_ids[rows]
+        })
         
         for metric_id, user_weight in metric_weights.items():
-            if metric_id in FORWARD_METRICS:
-                metric_info = FORWARD_METRICS[metric_id]
+            if metric_id in self.metrics:
+                metric_info = self.metrics[metric_id]
                 
                 # Calculate composite score for this metric
-                metric_score = pd.Series([0] * len(self.df), index=self.df.index)
-                valid_cols = 0
-                
-                for col, col_weight in metric_info['weights'].items():
-                    pct_col = f"{col}_pct"
-                    if pct_col in self.df.columns:
-                        # Fill NaN with 50th percentile (average)
-                        col_values = self.df[pct_col].fillna(50)
-                        metric_score += col_values * col_weight
-                        valid_cols += 1
+                pct_cols = [f"{col}_pct" for col in metric_info['weights'] if self.snapshot.has_column(f"{col}_pct")]
                 
                 # If no valid columns found, use a default score
-                if valid_cols == 0:
+                if not pct_cols:
                     print(f"Warning: No percentile data found for metric {metric_id}")
-                    metric_score = pd.Series([50] * len(self.df), index=self.df.index)
+                    metric_score = np.full(len(rows), 50.0)
+                else:
+                    col_weights = np.array([metric_info['weights'][col[:-len('_pct')]] for col in pct_cols])
+                    # Fill NaN with 50th percentile (average)
+                    values = np.nan_to_num(self.snapshot.matrix(pct_cols)[rows], nan=50.0)
+                    metric_score = values.astype(np.float64) @ col_weights
                 
                 # Apply user weight (0-100 scale)
                 # If user_weight is 0, the metric won't contribute
@@ -122,40 +126,59 @@ class PlayerAnalyzer:
         
         return scores_df            
         
-    def apply_algorithm(self, scores_df: pd.DataFrame, algorithm: str) -> pd.DataFrame:
+    @timed("rank")
+    def apply_algorithm(self, scores_df: pd.DataFrame, algorithm: str, limit: Optional[int] = None) -> pd.DataFrame:
         """Apply the selected algorithm to rank players"""
         score_cols = [col for col in scores_df.columns if col.endswith('_score')]
         
-        if algorithm == "weighted_score":
-            # Simple sum of weighted scores
-            scores_df['final_score'] = scores_df[score_cols].sum(axis=1)
+        # Simple sum of weighted scores
+        scores_df['final_score'] = scores_df[score_cols].sum(axis=1)
+        
+        # Scale to a more meaningful range (0-1000)
+        max_possible = len(score_cols) * 100  # If all metrics at 100
+        scores_df['final_score'] = (scores_df['final_score'] / max_possible) * 1000
+        
+        if algorithm == "pareto":
+            # Only metrics the user actually weighted take part in dominance
+            active_cols = [col for col in score_cols if scores_df[col].abs().sum() > 0]
+            if active_cols:
+                # Peel enough fronts to fill the limit (duplicate join rows count once)
+                max_rows = None
+                if limit is not None:
+                    max_rows = limit + len(scores_df) - scores_df['player_id'].nunique()
+                scores_df['pareto_front'] = pareto_fronts(scores_df[active_cols].to_numpy(dtype=float), max_rows)
+            else:
+                scores_df['pareto_front'] = 1.0
             
-            # Scale to a more meaningful range (0-1000)
-            max_possible = len(score_cols) * 100  # If all metrics at 100
-            scores_df['final_score'] = (scores_df['final_score'] / max_possible) * 1000
+            # Front first, weighted score breaks ties within a front
+            return scores_df.sort_values(['pareto_front', 'final_score'], ascending=[True, False])
         
         return scores_df.sort_values('final_score', ascending=False)
 
     # Update the get_recommendations method (partial update showing the changed section)
-    def get_recommendations(self, weights: Dict[str, float], algorithm: str = "weighted_score", limit: int = 3):
-        """Get top player recommendations"""
+    def get_recommendations(self, weights: Dict[str, float], algorithm: str = "weighted_score", limit: int = 3,
+                            filters: Optional[Dict] = None):
+        """Get top player recommendations, optionally restricted by filters"""
+        cache_params = {"position": self.position, "weights": weights, "algorithm": algorithm,
+                        "limit": limit, "filters": filters}
+        cached = RECOMMENDATION_CACHE.get(self.store.version, cache_params)
+        if cached is not None:
+            return cached
+        
         try:
-            scores_df = self.calculate_metric_scores(weights)
-            ranked_df = self.apply_algorithm(scores_df, algorithm)
+            with span("filter"):
+                mask = self.filter_index.mask(filters) if filters else None
+            scores_df = self.calculate_metric_scores(weights, mask)
+            ranked_df = self.apply_algorithm(scores_df, algorithm, limit)
             
             recommendations = []
             ranked_df = ranked_df.drop_duplicates(subset=['player_id'])
             for _, player in ranked_df.head(limit).iterrows():  
-                # Get key stats for this player
-                player_data = self.df[self.df['player_id'] == player['player_id']].iloc[0]
-                
-                # Safely get stats with defaults
-                n_90s = float(player_data.get('n_90s', 1)) if pd.notna(player_data.get('n_90s')) else 1.0
-                n_90s = max(n_90s, 0.1)  # Avoid division by zero
+                row = int(player['row'])
                 
                 # Get player name and team
-                player_name = player['name']
-                player_team = player.get('team', 'Unknown')
+                player_name = self.snapshot.label('name', row)
+                player_team = self.snapshot.label('team', row) or 'Unknown'
                 
                 # Get player image
                 player_image = None
@@ -171,81 +194,55 @@ class PlayerAnalyzer:
                     print(f"Error getting image for {player_name}: {e}")
                     player_image = player_image_service.get_fallback_image(player_name)
                 
+                # Get key stats for this player (raw stats are stored with NaN -> 0)
+                player_values = self.snapshot.features[row]
+                
+                def stat(col: str) -> float:
+                    index = self.snapshot.column_index.get(col)
+                    value = player_values[index] if index is not None else np.nan
+                    return float(value) if not np.isnan(value) else 0.0
+                
+                def pct(col: str) -> Optional[float]:
+                    index = self.snapshot.column_index.get(col)
+                    value = player_values[index] if index is not None else np.nan
+                    # Percentiles are stored with 2 decimals - drop float32 noise
+                    return round(float(value), 2) if not np.isnan(value) else None
+                
                 key_stats = {
-                    "goals": float(player_data.get('performance_gls', 0)) if pd.notna(player_data.get('performance_gls')) else 0.0,
-                    "xG": float(player_data.get('expected_xg', 0)) if pd.notna(player_data.get('expected_xg')) else 0.0,
-                    "shots": float(player_data.get('standard_sh', 0)) if pd.notna(player_data.get('standard_sh')) else 0.0,
-                    "assists": float(player_data.get('performance_ast', 0)) if pd.notna(player_data.get('performance_ast')) else 0.0
+                    "goals": stat('performance_gls'),
+                    "xG": stat('expected_xg'),
+                    "shots": stat('standard_sh'),
+                    "assists": stat('performance_ast')
                 }
                 
-                # Get percentile ranks for display
+                # Get percentile ranks for display (same values as get_percentiles)
                 percentiles = {}
                 for metric_id in weights.keys():
-                    if metric_id in FORWARD_METRICS:
-                        # Average percentile across the metric's columns
-                        cols = FORWARD_METRICS[metric_id]['columns']
-                        pct_values = []
-                        for col in cols:
-                            pct_col = f"{col}_pct"
-                            if pct_col in player_data:
-                                val = player_data[pct_col]
-                                if pd.notna(val):
-                                    pct_values.append(float(val))
-                        
-                        if pct_values:
-                            percentiles[metric_id] = np.mean(pct_values)
-                        else:
-                            percentiles[metric_id] = 50.0  # Default to average
+                    if metric_id in self.metric_index:
+                        value = self.metric_percentiles[row, self.metric_index[metric_id]]
+                        percentiles[metric_id] = float(value) if not np.isnan(value) else 50.0  # Default to average
                 
                 # Add raw percentiles for radar chart
-                raw_percentiles = [
-                    'performance_gls_pct',
-                    'expected_npxg_pct', 
-                    'standard_sot_pct',
-                    'performance_ast_pct',
-                    'expected_xag_pct',
-                    'kp_pct',
-                    'take_ons_succ_pct',
-                    'aerial_duels_wonpct_pct',
-                    'touches_att_pen_pct',
-                    'carries_prgc_pct'
-                ]
-
-                for pct_col in raw_percentiles:
-                    if pct_col in player_data.index:
-                        val = player_data[pct_col]
-                        if pd.notna(val):
-                            percentiles[pct_col] = float(val)
-                        else:
-                            percentiles[pct_col] = 50.0
-                    else:
-                        percentiles[pct_col] = 50.0
+                for pct_col in RADAR_PERCENTILES[self.position]:
+                    value = pct(pct_col)
+                    percentiles[pct_col] = value if value is not None else 50.0
                 
                 recommendations.append({
                     "player_id": int(player['player_id']),
                     "name": player_name,
                     "team": player_team,
-                    "position": player.get('position', 'FW'),
+                    "position": self.snapshot.label('position', row) or 'FW',
                     "match_score": float(player.get('final_score', 0)),
                     "key_stats": key_stats,
                     "percentile_ranks": percentiles,
-                    "image_url": player_image  # ADD THIS LINE
+                    "image_url": player_image,  # ADD THIS LINE
+                    "pareto_front": int(player['pareto_front']) if 'pareto_front' in player else None
                 })
         
+            RECOMMENDATION_CACHE.set(self.store.version, cache_params, recommendations)
             return recommendations
             
         except Exception as e:
+            # No placeholder result - it would be served (and HTTP-cached) as real data
             print(f"Error in get_recommendations: {e}")
-            # Return mock data on error
-            return [
-                {
-                    "player_id": 1,
-                    "name": "Error - Check Database",
-                    "team": "N/A",
-                    "position": "FW",
-                    "match_score": 0.0,
-                    "key_stats": {"goals": 0.0, "xG": 0.0, "shots": 0.0, "assists": 0.0},
-                    "percentile_ranks": {k: 50.0 for k in weights.keys()},
-                    "image_url": None
-                }
-            ]
\ No newline at end of file
+            raise
\ No newline at end of file
@@ -0,0 +1,229 @@
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.timing import span
+
+try:
+    import brotli
+except ImportError:  # optional - "br" is simply not offered
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional - "zstd" is simply not offered
+    zstandard = None
+
+# Only text-like bodies are worth compressing
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def available_encodings() -> List[str]:
+    """Configured encodings, in server preference order, whose library is installed"""
+    installed = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+    wanted = [name.strip() for name in settings.COMPRESSION_ENCODINGS.split(",")]
+    return [name for name in wanted if installed.get(name)]
+
+
+def choose_encoding(accept_encoding: str, offered: List[str]) -> Optional[str]:
+    """Best offered encoding the client accepts (q=0 excludes it), or None"""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+
+    for name in offered:
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > 0:
+            return name
+    return None
+
+
+class _Compressor:
+    """Incremental compressor with one interface for every encoding"""
+    def __init__(self, encoding: str):
+        if encoding == "gzip":
+            obj = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._process = obj.compress
+            self._flush = lambda: obj.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = obj.flush
+        elif encoding == "br":
+            obj = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self._process = obj.process
+            self._flush = obj.flush
+            self._finish = obj.finish
+        else:
+            obj = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+            self._process = obj.compress
+            self._flush = lambda: obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            self._finish = obj.flush
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        """Compress data; with flush, everything so far is emitted (for streamed chunks)"""
+        out = self._process(data)
+        return out + self._flush() if flush else out
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    compressor = _Compressor(encoding)
+    return compressor.compress(body) + compressor.finish()
+
+
+class CompressedBodyCache:
+    """
+    LRU of compressed bodies keyed by (ETag, encoding). Responses with an ETag
+    (catalog payloads, version-tagged PCA / recommend bodies) are identical
+    bytes until the data changes, so they are compressed once.
+    """
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Tuple[str, str], body: bytes):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class CompressionMiddleware:
+    """
+    gzip / Brotli / zstd response compression (Brotli and zstd when installed).
+
+    Bodies below COMPRESSION_MIN_SIZE, non-text types, already-encoded responses
+    and 204/304s pass through. Single-message responses that carry an ETag are
+    compressed through CompressedBodyCache; streamed responses are compressed
+    chunk by chunk.
+    """
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None,
+                 cache_entries: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.cache = CompressedBodyCache(
+            settings.COMPRESSION_CACHE_ENTRIES if cache_entries is None else cache_entries
+        )
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """Send wrapper for one response"""
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        self.active = False  # compressing this response
+        self.streaming = False
+        self.compressor: Optional[_Compressor] = None
+
+    def _eligible(self, headers: Headers, status: int) -> bool:
+        content_type = headers.get("content-type", "")
+        return (status not in (204, 304)
+                and "content-encoding" not in headers
+                and content_type.startswith(COMPRESSIBLE_TYPES))
+
+    def _encoded_headers(self, length: Optional[int]) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The encoded bytes differ, so the tag can only be a weak validator now
+            headers["ETag"] = "W/" + etag
+        if length is None:
+            del headers["content-length"]
+        else:
+            headers["Content-Length"] = str(length)
+        self.start["headers"] = headers.raw
+        return headers
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            self.active = self._eligible(Headers(raw=message["headers"]), message["status"])
+            if not self.active:
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or not self.active:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.streaming and not more_body:
+            # Whole body in one message
+            if len(body) < self.middleware.minimum_size:
+                await self._send(self.start)
+                await self._send(message)
+                return
+
+            # Only successful bodies are reused - an error must never be served for a tag
+            etag = Headers(raw=self.start["headers"]).get("etag") if self.start["status"] == 200 else None
+            key = (etag, self.encoding)
+            compressed = self.middleware.cache.get(key) if etag else None
+            if compressed is None:
+                with span("compress"):
+                    compressed = compress(body, self.encoding)
+                if etag:
+                    self.middleware.cache.put(key, compressed)
+
+            self._encoded_headers(len(compressed))
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        # Streamed body - compress each chunk as it arrives
+        if not self.streaming:
+            self.streaming = True
+            self.compressor = _Compressor(self.encoding)
+            self._encoded_headers(None)
+            await self._send(self.start)
+
+        chunk = self.compressor.compress(body, flush=more_body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,187 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.pca_analysis import ForwardPCAAnalyzer, PCA_FEATURE_COLUMNS, compute_pca_task
+from app.core.timing import span
+
+
+# Seconds precompute() waits for a free slot when requests fill the pool
+PRECOMPUTE_BACKOFF_S = 0.5
+
+
+class ComputeBusy(Exception):
+    """Too many distinct computations in flight - the API answers 429"""
+
+
+class PCAComputeService:
+    """
+    Runs PCA fitting/clustering off the event loop.
+
+    Work goes to a bounded process pool (or the default thread pool when
+    PCA_WORKER_PROCESSES is 0). Identical requests - same store version,
+    feature set and k - that arrive while one is computing await the same
+    task instead of starting their own. At most `max_inflight` distinct
+    computations run or wait at once; beyond that ComputeBusy is raised.
+
+    With PCA_PRECOMPUTE_ALL_K, the first default map of a data version also
+    starts precompute(), which clusters every k through the same pool.
+    """
+    def __init__(self, analyzer: ForwardPCAAnalyzer, workers: Optional[int] = None,
+                 max_inflight: Optional[int] = None):
+        self.analyzer = analyzer
+        self.workers = settings.PCA_WORKER_PROCESSES if workers is None else workers
+        self.max_inflight = settings.PCA_MAX_INFLIGHT if max_inflight is None else max_inflight
+        self._executor: Optional[Executor] = None
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self._precompute_task: Optional[asyncio.Task] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.workers <= 0:
+            return None  # loop's default thread pool
+        if self._executor is None:
+            # spawn: workers must not inherit the parent's threads (precompute, joblib)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    async def get_pca(self, custom_k: Optional[int] = None,
+                      feature_cols: List[str] = PCA_FEATURE_COLUMNS) -> Optional[Dict]:
+        """Async ForwardPCAAnalyzer.get_pca - cached results return without touching the pool"""
+        key = await self._cache_key(custom_k, feature_cols)
+        # Local results only here - the shared cache is consulted off the event loop in _compute
+        result = self.analyzer.local_pca(key)
+        if result is None:
+            result = await self._coalesced(key)
+        if result is not None and key[1] == tuple(PCA_FEATURE_COLUMNS):
+            self._start_precompute(key[0])
+        return result
+
+    async def _cache_key(self, custom_k: Optional[int], feature_cols: List[str]) -> tuple:
+        """analyzer.cache_key() - off the event loop while reading the version could load the store"""
+        if self.analyzer.store_loaded:
+            return self.analyzer.cache_key(custom_k, feature_cols)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.analyzer.cache_key, custom_k, feature_cols)
+
+    async def get_basis(self, custom_k: Optional[int] = None) -> Optional[Tuple[Dict, int]]:
+        """
+        Async ForwardPCAAnalyzer.get_basis. A map found in the shared cache comes
+        without its fitted basis; the refit runs in the pool like any computation.
+        """
+        result = await self.get_pca(custom_k)
+        if result is None:
+            return None
+        basis = self.analyzer.cached_basis(custom_k)
+        if basis is None:
+            key = self.analyzer.cache_key(result["optimal_k"])
+            await self._coalesced(key, shared=False)
+            basis = self.analyzer.cached_basis(custom_k)
+        return basis
+
+    async def _coalesced(self, key: tuple, shared: bool = True) -> Optional[Dict]:
+        """_compute(key), shared with any identical computation already in flight"""
+        task_key = key if shared else ("refit",) + key
+        task = self._inflight.get(task_key)
+        if task is None:
+            if len(self._inflight) >= self.max_inflight:
+                raise ComputeBusy(f"{len(self._inflight)} PCA computations already running")
+            task = asyncio.ensure_future(self._compute(key, shared))
+            self._inflight[task_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(task_key, None))
+
+        # shield: a client disconnecting must not cancel work others are waiting on
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: tuple, shared: bool = True) -> Optional[Dict]:
+        """Compute key's map in the pool - unless `shared` and another worker already did"""
+        version, features, k = key
+        loop = asyncio.get_running_loop()
+
+        # Another worker may already have computed this map
+        if shared:
+            with span("pca_cache"):
+                result = await loop.run_in_executor(None, self.analyzer.shared_pca, key)
+            if result is not None:
+                return result
+
+        projection, df = await loop.run_in_executor(None, self._compute_inputs, version, features)
+        if projection is None and df.empty:
+            return None
+
+        # Timed as a whole - the work itself runs in another process / thread
+        with span("pca_compute"):
+            projection, result = await loop.run_in_executor(
+                self._get_executor(), compute_pca_task, df, list(features), k, projection
+            )
+        # Publishing to the shared cache may do I/O
+        return await loop.run_in_executor(None, self.analyzer.store_result, key, projection, result)
+
+    def _compute_inputs(self, version: str, features: tuple):
+        """(fitted projection, None) or (None, forwards frame to fit) - runs off the event loop"""
+        projection = self.analyzer.cached_projection(version, features)
+        if projection is not None:
+            return projection, None
+        return None, self.analyzer.load_data()
+
+    def _start_precompute(self, version: str):
+        """Start precompute() for a data version once, unless disabled or one is running"""
+        if not settings.PCA_PRECOMPUTE_ALL_K or self.analyzer.precompute_status["version"] == version:
+            return
+        if self._precompute_task is not None and not self._precompute_task.done():
+            return
+        self.analyzer.precompute_status = {"state": "pending", "version": version, "done": 0,
+                                           "total": 0, "error": None}
+        self._precompute_task = asyncio.ensure_future(self.precompute(version))
+
+    async def precompute(self, version: str, k_values: range = range(2, 11)):
+        """
+        Cluster the automatic-k map and every k in k_values for one data version,
+        so moving the k slider is a lookup. Runs through the pool one k at a time
+        and backs off while requests have it full; stops if the data changes.
+        """
+        status = {"state": "running", "version": version, "done": 0,
+                  "total": len(k_values) + 1, "error": None}
+        self.analyzer.precompute_status = status
+        try:
+            result = await self._get_pca_when_free(None)
+            if result is None:
+                status["state"] = "no_data"
+                return
+            status["done"] = 1
+
+            n_players = len(result["coords"])
+            for k in k_values:
+                if self.analyzer.store.version != version:
+                    status["state"] = "superseded"  # new data - its own precompute takes over
+                    return
+                if k < n_players:
+                    await self._get_pca_when_free(k)
+                status["done"] += 1
+
+            status["state"] = "done"
+        except Exception as e:
+            print(f"PCA precompute failed: {e}")
+            status.update(state="failed", error=str(e))
+
+    async def _get_pca_when_free(self, custom_k: Optional[int]) -> Optional[Dict]:
+        """get_pca(), waiting for a free slot instead of failing while requests fill the pool"""
+        while True:
+            try:
+                return await self.get_pca(custom_k=custom_k)
+            except ComputeBusy:
+                await asyncio.sleep(PRECOMPUTE_BACKOFF_S)
+
+    def shutdown(self):
+        if self._precompute_task is not None:
+            self._precompute_task.cancel()
+            self._precompute_task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,6 +16,67 @@ class Settings:
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "LENS Player Profiler"
     
+    # Startup warm-up of analyzers: "background", "blocking" or "off" (lazy on first request)
+    ANALYZER_WARMUP: str = os.getenv("ANALYZER_WARMUP", "background")
+    # Seconds before a failed warm-up is retried (0 = stay failed until restart)
+    WARMUP_RETRY_INTERVAL: float = float(os.getenv("WARMUP_RETRY_INTERVAL", "30"))
+    
+    # Directory for the memory-mapped feature snapshot shared by all workers on a host
+    # (one file per data version); empty = every worker keeps its own in-memory copy
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "lens-snapshots"))
+    
+    # Seconds between checks of the percentiles table's version; new data rebuilds the
+    # feature store and analyzers in the background (0 = load once per process)
+    DATA_VERSION_CHECK_INTERVAL: float = float(os.getenv("DATA_VERSION_CHECK_INTERVAL", "60"))
+    
+    # PCA optimal-k search: "fast" (parallel, sampled silhouette) or "exact"
+    PCA_K_SEARCH_MODE: str = os.getenv("PCA_K_SEARCH_MODE", "fast")
+    PCA_K_SEARCH_JOBS: int = int(os.getenv("PCA_K_SEARCH_JOBS", "-1"))
+    PCA_SILHOUETTE_SAMPLE_SIZE: int = int(os.getenv("PCA_SILHOUETTE_SAMPLE_SIZE", "1000"))
+    PCA_MINIBATCH_THRESHOLD: int = int(os.getenv("PCA_MINIBATCH_THRESHOLD", "5000"))
+    
+    # Cluster every k (2-10) in the background whenever new data is loaded
+    PCA_PRECOMPUTE_ALL_K: bool = os.getenv("PCA_PRECOMPUTE_ALL_K", "true").lower() == "true"
+    
+    # PCA requests run in a process pool (0 = threads); over PCA_MAX_INFLIGHT distinct jobs -> 429
+    PCA_WORKER_PROCESSES: int = int(os.getenv("PCA_WORKER_PROCESSES", "2"))
+    PCA_MAX_INFLIGHT: int = int(os.getenv("PCA_MAX_INFLIGHT", "4"))
+    
+    # Background analysis jobs (/api/jobs): worker threads, max unfinished jobs, result lifetime (s)
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_QUEUE_DEPTH: int = int(os.getenv("JOB_QUEUE_DEPTH", "16"))
+    JOB_RESULT_TTL: int = int(os.getenv("JOB_RESULT_TTL", "900"))
+    
+    # Cache-Control max-age (s) for catalog endpoints (metrics, algorithms) served with ETags
+    CATALOG_CACHE_MAX_AGE: int = int(os.getenv("CATALOG_CACHE_MAX_AGE", "3600"))
+    
+    # Serialize large responses with orjson when it is installed
+    FAST_JSON: bool = os.getenv("FAST_JSON", "true").lower() == "true"
+    
+    # Response compression: encodings in preference order (br / zstd only if installed),
+    # minimum body size in bytes, levels, and how many compressed ETag'd bodies to keep
+    COMPRESSION_ENCODINGS: str = os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip")
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+    COMPRESSION_CACHE_ENTRIES: int = int(os.getenv("COMPRESSION_CACHE_ENTRIES", "128"))
+    
+    # Shared result cache (recommendations, PCA maps, image lookups): "memory" (per worker),
+    # "local" (files in CACHE_DIR, shared by the workers on one host) or "redis" (REDIS_URL)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "local")
+    CACHE_DIR: str = os.getenv("CACHE_DIR", "backend/cache/results")
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    CACHE_TTL: int = int(os.getenv("CACHE_TTL", "86400"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    
+    # Per-stage Server-Timing headers; requests slower than TIMING_LOG_THRESHOLD_MS also
+    # log their spans as one JSON line (negative = never)
+    SERVER_TIMING: bool = os.getenv("SERVER_TIMING", "true").lower() == "true"
+    TIMING_LOG_THRESHOLD_MS: float = float(os.getenv("TIMING_LOG_THRESHOLD_MS", "1000"))
+    # Level for the app.* loggers (timing lines are INFO, so WARNING hides them)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    
     # CORS
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000"]
     
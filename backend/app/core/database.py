@@ -4,6 +4,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 import pandas as pd
 from app.core.config import settings
+from app.core.timing import timed
 
 # Use NullPool to avoid connection issues
 engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
@@ -18,6 +19,7 @@ def get_db():
     finally:
         db.close()
 
+@timed("db")
 def execute_query(query: str, params: dict = None):
     """Execute a SQL query and return results as DataFrame"""
     # Use text() for SQLAlchemy 1.4 compatibility
@@ -0,0 +1,102 @@
+import numpy as np
+from typing import Iterator, List
+from app.core.snapshot import PlayerSnapshot
+from app.core.serialization import dumps
+
+try:
+    import pyarrow
+except ImportError:  # optional - only needed for format=arrow
+    pyarrow = None
+
+# Text fields written for every player, in output order
+EXPORT_TEXT_FIELDS = ['name', 'team', 'position', 'league']
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def iter_ndjson(snapshot: PlayerSnapshot, chunk_size: int = 1000) -> Iterator[bytes]:
+    """
+    One JSON object per player and line: display fields plus a "percentiles" map.
+    Rows are encoded a chunk at a time straight from the snapshot arrays, so memory
+    stays flat whatever the row count and the first bytes go out immediately.
+    """
+    pct_cols = snapshot.populated_columns('_pct')
+    keys = [col[:-len('_pct')] for col in pct_cols]
+    matrix_cols = pct_cols + ['age']
+
+    for start in range(0, len(snapshot), chunk_size):
+        # A view of this chunk's rows, so only chunk_size rows are gathered and copied
+        chunk = snapshot.view(slice(start, start + chunk_size))
+        values = np.round(chunk.matrix(matrix_cols).astype(np.float64), 2)
+        missing = np.isnan(values)
+        values = values.tolist()
+        missing = missing.tolist()
+        text = {field: chunk.labels(field) for field in EXPORT_TEXT_FIELDS}
+        player_ids = chunk.player_ids.tolist()
+
+        lines = []
+        for i, player_id in enumerate(player_ids):
+            row_values = [None if gap else value for value, gap in zip(values[i], missing[i])]
+            lines.append(dumps({
+                "player_id": int(player_id),
+                **{field: text[field][i] for field in EXPORT_TEXT_FIELDS},
+                "age": int(row_values[-1]) if row_values[-1] is not None else None,
+                "percentiles": dict(zip(keys, row_values[:-1])),
+            }))
+        yield b"\n".join(lines) + b"\n"
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain"""
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def iter_arrow(snapshot: PlayerSnapshot, chunk_size: int = 10000) -> Iterator[bytes]:
+    """Arrow IPC stream - one record batch per chunk, flat `*_pct` float32 columns"""
+    if pyarrow is None:
+        raise RuntimeError("Arrow export requires pyarrow")
+
+    pct_cols = snapshot.populated_columns('_pct')
+    schema = pyarrow.schema(
+        [("player_id", pyarrow.int64())]
+        + [(field, pyarrow.string()) for field in EXPORT_TEXT_FIELDS]
+        + [("age", pyarrow.float32())]
+        + [(col, pyarrow.float32()) for col in pct_cols]
+    )
+
+    sink = _ChunkSink()
+    writer = pyarrow.ipc.new_stream(pyarrow.PythonFile(sink, mode="w"), schema)
+    yield sink.drain()  # schema message
+
+    for start in range(0, len(snapshot), chunk_size):
+        rows = np.arange(start, min(start + chunk_size, len(snapshot)))
+        arrays = (
+            [pyarrow.array(snapshot.player_ids[rows])]
+            + [pyarrow.array(snapshot.labels(field, rows), type=pyarrow.string()) for field in EXPORT_TEXT_FIELDS]
+            + [pyarrow.array(snapshot.column(col)[rows], from_pandas=True) for col in ['age'] + pct_cols]
+        )
+        writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=schema))
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
@@ -0,0 +1,169 @@
+import pandas as pd
+import numpy as np
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.database import execute_query
+from app.core.snapshot import PlayerSnapshot
+from app.core import snapshot_file
+from app.core.timing import span
+
+POSITION_GROUPS = ["forward", "midfielder", "defender", "goalkeeper"]
+
+# Raw stat columns converted to numbers once for every position
+NUMERIC_STAT_COLUMNS = ['performance_gls', 'performance_ast', 'expected_xg', 'n_90s', 'playing_time_90s',
+                        'standard_sh', 'touches_att_pen']
+
+
+def fetch_data_version(position_group: Optional[str] = None) -> str:
+    """
+    Cheap fingerprint of the percentiles table - changes whenever
+    precompute_percentiles.py rewrites it
+    """
+    query = """
+    SELECT COUNT(*) AS n, MAX(computed_at) AS last_computed
+    FROM football_data.player_percentiles_all
+    """
+    params = None
+    if position_group:
+        query += " WHERE position_group = :position_group"
+        params = {'position_group': position_group}
+
+    row = execute_query(query, params).iloc[0]
+    last_computed = pd.Timestamp(row['last_computed']).isoformat() if pd.notna(row['last_computed']) else 'none'
+    return f"{int(row['n'])}@{last_computed}"
+
+
+class FeatureStore:
+    """
+    Columnar store of precomputed percentiles for every position group.
+    All groups are loaded with one query and one JSON pass into a single
+    PlayerSnapshot ordered by position_group, so each group is a contiguous
+    row block and per-position analyzers work on views instead of copies.
+    """
+    def __init__(self):
+        self.snapshot = PlayerSnapshot.empty()
+        self.slices: Dict[str, slice] = {}
+        self.version = None
+        self._load_data()
+
+    def _load_data(self):
+        """
+        Load every position group with precomputed percentiles. With SNAPSHOT_DIR
+        set, the snapshot for the current data version is mapped from a shared
+        file (written by whichever worker gets there first), so all workers on the
+        host share one copy of the arrays and a new worker skips the database.
+        """
+        # Read the version first so a concurrent rewrite can only make it look stale, never fresh
+        self.version = fetch_data_version()
+
+        with span("snapshot_load"):
+            if settings.SNAPSHOT_DIR:
+                self.snapshot, self.slices = self._map_snapshot_file()
+            else:
+                self.snapshot, self.slices = self._build_snapshot()
+
+    def _map_snapshot_file(self) -> Tuple[PlayerSnapshot, Dict[str, slice]]:
+        """Map the file for this version, building it under the cross-process lock if missing"""
+        start = time.monotonic()
+        path = snapshot_file.snapshot_path(settings.SNAPSHOT_DIR, self.version)
+
+        with snapshot_file.build_lock(settings.SNAPSHOT_DIR):
+            mapped = snapshot_file.read_snapshot(path, self.version)
+            if mapped is None:
+                snapshot, slices = self._build_snapshot()
+                if not len(snapshot):
+                    return snapshot, slices  # nothing worth sharing yet
+                snapshot_file.write_snapshot(path, snapshot, slices, self.version)
+                snapshot_file.remove_stale(settings.SNAPSHOT_DIR, keep=path)
+                # Map what was just written so this worker shares the same pages as the others
+                mapped = snapshot_file.read_snapshot(path, self.version)
+                if mapped is None:
+                    return snapshot, slices
+            else:
+                print(f"Mapped feature store from {path} in {(time.monotonic() - start) * 1000:.1f} ms")
+
+        return mapped
+
+    def _build_snapshot(self) -> Tuple[PlayerSnapshot, Dict[str, slice]]:
+        """Query and parse every position group into a new snapshot"""
+        query = """
+        SELECT
+            p.id as player_id,
+            p.name,
+            p.team,
+            p.position,
+            p.age,
+            p.league,
+            pp.position_group,
+            pp.percentiles,
+            s.performance_gls,
+            s.performance_ast,
+            s.expected_xg,
+            s.playing_time_90s,
+            sh.standard_sh,
+            pos.touches_att_pen
+        FROM football_data.players p
+        JOIN football_data.player_percentiles_all pp ON p.id = pp.player_id
+        LEFT JOIN football_data.player_standard_stats s ON p.name = s.player
+        LEFT JOIN football_data.player_shooting_stats sh ON p.name = sh.player
+        LEFT JOIN football_data.player_possession_stats pos ON p.name = pos.player
+        WHERE pp.percentiles IS NOT NULL
+        ORDER BY pp.position_group, p.id
+        """
+
+        df = execute_query(query)
+        frame_bytes = 0
+
+        if not df.empty:
+            # Expand the JSON percentiles into columns in one pass for all positions
+            with span("json_parse"):
+                records = [
+                    json.loads(value) if isinstance(value, str) else value
+                    for value in df['percentiles']
+                ]
+            percentile_df = pd.DataFrame.from_records(records, index=df.index)
+            percentile_df.columns = [f"{key}_pct" for key in percentile_df.columns]
+            percentile_df = percentile_df.apply(pd.to_numeric, errors='coerce')
+            df = pd.concat([df, percentile_df], axis=1)
+
+            for col in NUMERIC_STAT_COLUMNS:
+                if col in df.columns:
+                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+            # Size of the old per-analyzer DataFrame layout, for the load log
+            frame_bytes = int(df.memory_usage(deep=True).sum())
+
+            # Raw JSON is not needed once parsed
+            df = df.drop(columns=['percentiles'])
+
+            # Make sure each position group is one contiguous block
+            df = df.sort_values(['position_group', 'player_id'], kind='stable').reset_index(drop=True)
+
+        snapshot = PlayerSnapshot.from_frame(df) if not df.empty else PlayerSnapshot.empty()
+        slices = {}
+        if len(snapshot):
+            groups = snapshot.codes['position_group']
+            for code, group in enumerate(snapshot.categories['position_group']):
+                rows = np.flatnonzero(groups == code)
+                slices[group] = slice(int(rows[0]), int(rows[-1]) + 1)
+
+        counts = ", ".join(f"{s.stop - s.start} {group}s" for group, s in slices.items())
+        print(f"Loaded feature store: {counts or 'no players'}")
+        if len(snapshot):
+            print(f"Snapshot memory: {snapshot.nbytes / 1e6:.2f} MB "
+                  f"(DataFrame layout: {frame_bytes / 1e6:.2f} MB)")
+        return snapshot, slices
+
+    @property
+    def positions(self) -> List[str]:
+        return list(self.slices.keys())
+
+    def view(self, position: str) -> PlayerSnapshot:
+        """Rows for one position group (a view of the shared snapshot)"""
+        return self.snapshot.view(self.slices.get(position, slice(0, 0)))
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Bytes held by the shared snapshot"""
+        return self.snapshot.memory_usage()
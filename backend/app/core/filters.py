@@ -0,0 +1,82 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from app.core.snapshot import PlayerSnapshot
+
+# Range filters: filter name -> (snapshot column, bound)
+RANGE_FILTERS = {
+    "min_90s": ("playing_time_90s", "min"),
+    "min_goals": ("performance_gls", "min"),
+    "min_age": ("age", "min"),
+    "max_age": ("age", "max"),
+}
+
+# Set-membership filters: filter name -> snapshot text field
+CATEGORY_FILTERS = {
+    "teams": "team",
+    "leagues": "league",
+}
+
+
+class FilterIndex:
+    """
+    Precomputed indexes for recommendation filters over a player snapshot.
+    Numeric columns are kept sorted (with their row order) so range filters are
+    a binary search; string columns reuse the snapshot's category codes so set
+    filters are an integer membership test. Masks are combined with vectorized AND.
+    """
+    def __init__(self, snapshot: PlayerSnapshot):
+        self.n_rows = len(snapshot)
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray, int]] = {}
+        self._codes: Dict[str, Tuple[np.ndarray, Dict[str, List[int]]]] = {}
+
+        for column in {col for col, _ in RANGE_FILTERS.values()}:
+            values = snapshot.column(column)
+            order = np.argsort(values, kind='stable')  # NaN sorts last
+            n_valid = int(np.count_nonzero(~np.isnan(values)))
+            self._sorted[column] = (values[order], order, n_valid)
+
+        for column in CATEGORY_FILTERS.values():
+            codes = snapshot.codes.get(column, np.full(self.n_rows, -1, dtype=np.int32))
+            lookup: Dict[str, List[int]] = {}
+            for code, value in enumerate(snapshot.categories.get(column, [])):
+                lookup.setdefault(str(value).strip().lower(), []).append(code)
+            self._codes[column] = (codes, lookup)
+
+    def _range_mask(self, column: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        """Rows whose value lies in [low, high] - missing values never match"""
+        sorted_values, order, n_valid = self._sorted[column]
+        valid = sorted_values[:n_valid]
+        start = np.searchsorted(valid, low, side='left') if low is not None else 0
+        end = np.searchsorted(valid, high, side='right') if high is not None else n_valid
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[order[start:end]] = True
+        return mask
+
+    def _category_mask(self, column: str, values: List[str]) -> np.ndarray:
+        """Rows whose value is one of `values` (case-insensitive)"""
+        codes, lookup = self._codes[column]
+        wanted = [code for v in values for code in lookup.get(v.strip().lower(), [])]
+        return np.isin(codes, wanted)
+
+    def mask(self, filters: Dict) -> Optional[np.ndarray]:
+        """
+        Build a boolean row mask for the given filters
+        Returns None when no filter is set (score every row)
+        """
+        bounds: Dict[str, List[Optional[float]]] = {}
+        for name, (column, bound) in RANGE_FILTERS.items():
+            value = filters.get(name)
+            if value is not None:
+                low_high = bounds.setdefault(column, [None, None])
+                low_high[0 if bound == "min" else 1] = value
+
+        masks = [self._range_mask(column, low, high) for column, (low, high) in bounds.items()]
+        masks += [
+            self._category_mask(column, filters[name])
+            for name, column in CATEGORY_FILTERS.items()
+            if filters.get(name)
+        ]
+
+        if not masks:
+            return None
+        return np.logical_and.reduce(masks)
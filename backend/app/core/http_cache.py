@@ -0,0 +1,75 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+
+
+# Data responses may be stored but must be revalidated - cheap with a version ETag
+DATA_CACHE_CONTROL = "no-cache"
+
+
+def make_etag(data: bytes) -> str:
+    """Strong ETag for a response body"""
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches (weak comparison, as RFC 9110 asks for GET)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+def data_etag(version: str, scope: str, params: Dict) -> str:
+    """
+    Weak ETag for a computed response - derived from the data version and the
+    normalized request parameters, so it is known before any work is done
+    """
+    key = json.dumps([version, scope, params], sort_keys=True, separators=(",", ":"), default=str)
+    return "W/" + make_etag(key.encode("utf-8"))
+
+
+def recommendation_params(request) -> Dict:
+    """RecommendationRequest as ETag parameters - weight order does not change the result"""
+    params = request.model_dump(exclude_none=True)
+    params["weights"] = {w.metric: w.weight for w in request.weights}
+    return params
+
+
+def check_not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 for the request if the client already has this version, else None"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, DATA_CACHE_CONTROL)
+    return None
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """304 with no body - only the validators the client needs"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+class StaticPayload:
+    """
+    A JSON body serialized once, with its ETag. Used for catalog endpoints whose
+    content only changes on deploy: each request is a header compare plus
+    returning the same bytes (or a bodiless 304).
+    """
+    def __init__(self, content: Any, max_age: Optional[int] = None):
+        self.body = json.dumps(jsonable_encoder(content), separators=(",", ":")).encode("utf-8")
+        self.etag = make_etag(self.body)
+        max_age = settings.CATALOG_CACHE_MAX_AGE if max_age is None else max_age
+        self.cache_control = f"public, max-age={max_age}"
+
+    def response(self, request: Request) -> Response:
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return not_modified(self.etag, self.cache_control)
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers={"ETag": self.etag, "Cache-Control": self.cache_control},
+        )
@@ -0,0 +1,127 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from app.core.config import settings
+
+JOB_STATES = ["queued", "running", "done", "failed"]
+
+
+class QueueFull(Exception):
+    """The job queue is at its configured depth - the API answers 429"""
+
+
+class Job:
+    """One submitted analysis and its progress / result"""
+    def __init__(self, kind: str, params: Dict):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = "queued"
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def report(self, progress: float):
+        """Progress callback handed to the job function (0..1)"""
+        self.progress = max(0.0, min(1.0, float(progress)))
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "type": self.kind,
+            "status": self.status,
+            "progress": round(self.progress, 3),
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    In-process job runner for analyses that outlive an HTTP request.
+    Jobs run on a small thread pool; at most `max_queued` may be waiting or
+    running at once. Finished jobs (and their results) are kept for
+    `result_ttl` seconds after they finish, then evicted on the next access.
+    """
+    def __init__(self, workers: Optional[int] = None, max_queued: Optional[int] = None,
+                 result_ttl: Optional[float] = None):
+        self.workers = settings.JOB_WORKERS if workers is None else workers
+        self.max_queued = settings.JOB_QUEUE_DEPTH if max_queued is None else max_queued
+        self.result_ttl = settings.JOB_RESULT_TTL if result_ttl is None else result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analysis-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def _evict_expired(self):
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def pending(self) -> int:
+        """Jobs queued or running"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.finished_at is None)
+
+    def submit(self, kind: str, func: Callable[[Callable[[float], None]], Any], params: Dict) -> Job:
+        """Queue func(report) - raises QueueFull when max_queued jobs are unfinished"""
+        with self._lock:
+            self._evict_expired()
+            unfinished = sum(1 for job in self._jobs.values() if job.finished_at is None)
+            if unfinished >= self.max_queued:
+                raise QueueFull(f"{unfinished} jobs already queued or running")
+            job = Job(kind, params)
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def _run(self, job: Job, func: Callable):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = func(job.report)
+            job.progress = 1.0
+            job.status = "done"
+        except Exception as e:
+            print(f"Job {job.id} ({job.kind}) failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """The job, or None if it is unknown or its result has expired"""
+        with self._lock:
+            self._evict_expired()
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Lazy initialization - one job manager per process
+_lock = threading.Lock()
+_job_manager: Optional[JobManager] = None
+
+def get_job_manager() -> JobManager:
+    global _job_manager
+    with _lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+    return _job_manager
+
+def shutdown_job_manager():
+    global _job_manager
+    with _lock:
+        if _job_manager is not None:
+            _job_manager.shutdown()
+            _job_manager = None
@@ -0,0 +1,102 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+LOD_MODES = ["grid", "hex"]
+
+SQRT3 = np.sqrt(3.0)
+
+
+def parse_bbox(value: str) -> Tuple[float, float, float, float]:
+    """Parse "x_min,y_min,x_max,y_max" into a tuple of floats"""
+    parts = value.split(",")
+    if len(parts) != 4:
+        raise ValueError("bbox must be x_min,y_min,x_max,y_max")
+    x_min, y_min, x_max, y_max = (float(part) for part in parts)
+    if x_min > x_max or y_min > y_max:
+        raise ValueError("bbox minimum must not exceed its maximum")
+    return x_min, y_min, x_max, y_max
+
+
+def in_bbox(coords: np.ndarray, bbox: Tuple[float, float, float, float]) -> np.ndarray:
+    """Boolean mask of the points inside the box (edges included)"""
+    x_min, y_min, x_max, y_max = bbox
+    return ((coords[:, 0] >= x_min) & (coords[:, 0] <= x_max) &
+            (coords[:, 1] >= y_min) & (coords[:, 1] <= y_max))
+
+
+def _grid_cells(coords: np.ndarray, size: float, origin: np.ndarray):
+    """Square cell index per point and the cell centres"""
+    ij = np.floor((coords - origin) / size).astype(np.int64)
+    centres = origin + (ij + 0.5) * size
+    return ij, centres
+
+
+def _hex_cells(coords: np.ndarray, size: float, origin: np.ndarray):
+    """
+    Pointy-top hexagon (axial q, r) per point and the hexagon centres.
+    `size` is the hexagon width; fractional axial coordinates are rounded
+    through cube coordinates so every point lands in its nearest centre.
+    """
+    radius = size / SQRT3
+    x = (coords[:, 0] - origin[0]) / radius
+    y = (coords[:, 1] - origin[1]) / radius
+    q = SQRT3 / 3 * x - y / 3
+    r = 2 / 3 * y
+    s = -q - r
+
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq[fix_q] = -rr[fix_q] - rs[fix_q]
+    rr[fix_r] = -rq[fix_r] - rs[fix_r]
+
+    qr = np.column_stack([rq, rr]).astype(np.int64)
+    centres = np.column_stack([
+        origin[0] + radius * SQRT3 * (rq + rr / 2),
+        origin[1] + radius * 1.5 * rr,
+    ])
+    return qr, centres
+
+
+def bin_points(coords: np.ndarray, clusters: np.ndarray, mode: str = "hex",
+               bins: int = 40) -> Dict:
+    """
+    Aggregate scatter points into grid or hexagon cells for zoomed-out views.
+    Cell size is `bins` cells across the wider axis of the full map, so cells
+    stay put as the viewport moves. Returns the cell size and one entry per
+    non-empty cell with its centre, player count and dominant cluster.
+    """
+    if mode not in LOD_MODES:
+        raise ValueError(f"Unknown LOD mode: {mode}")
+    if bins < 1:
+        raise ValueError("bins must be at least 1")
+    if len(coords) == 0:
+        return {"cell_size": 0.0, "cells": []}
+
+    origin = coords.min(axis=0)
+    span = float(np.max(coords.max(axis=0) - origin))
+    size = span / bins if span > 0 else 1.0
+
+    keys, centres = (_hex_cells if mode == "hex" else _grid_cells)(coords, size, origin)
+    _, first, inverse, counts = np.unique(keys, axis=0, return_index=True,
+                                          return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+
+    # Points per (cell, cluster) in one bincount, then the majority cluster per cell
+    n_clusters = int(clusters.max()) + 1 if len(clusters) else 1
+    per_cluster = np.bincount(inverse * n_clusters + clusters,
+                              minlength=len(counts) * n_clusters).reshape(len(counts), n_clusters)
+    dominant = per_cluster.argmax(axis=1)
+
+    cells: List[Dict] = [
+        {
+            "x": float(centres[row, 0]),
+            "y": float(centres[row, 1]),
+            "count": int(count),
+            "cluster": f"Group {cluster + 1}",
+            "cluster_id": int(cluster),
+        }
+        for row, count, cluster in zip(first, counts, dominant)
+    ]
+    return {"cell_size": size, "cells": cells}
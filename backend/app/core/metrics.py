@@ -81,10 +81,262 @@ FORWARD_METRICS = {
     }
 }
 
+# Metric definitions for midfielders
+MIDFIELDER_METRICS = {
+    "passing": {
+        "name": "Passing Accuracy",
+        "description": "Completion rates across short and long passes",
+        "columns": [
+            "total_cmppct",
+            "long_cmppct"
+        ],
+        "weights": {
+            "total_cmppct": 0.7,
+            "long_cmppct": 0.3
+        }
+    },
+    "progression": {
+        "name": "Progression",
+        "description": "Progressive passes, carries and receptions",
+        "columns": [
+            "prgp",
+            "carries_prgc",
+            "receiving_prgr"
+        ],
+        "weights": {
+            "prgp": 0.5,
+            "carries_prgc": 0.3,
+            "receiving_prgr": 0.2
+        }
+    },
+    "creativity": {
+        "name": "Creativity",
+        "description": "Assists, key passes, chance creation",
+        "columns": [
+            "expected_xag",
+            "kp",
+            "sca_sca"
+        ],
+        "weights": {
+            "expected_xag": 0.4,
+            "kp": 0.3,
+            "sca_sca": 0.3
+        }
+    },
+    "ball_winning": {
+        "name": "Ball Winning",
+        "description": "Tackles, interceptions, recoveries",
+        "columns": [
+            "tackles_tklw",
+            "int",
+            "performance_recov"
+        ],
+        "weights": {
+            "tackles_tklw": 0.4,
+            "int": 0.3,
+            "performance_recov": 0.3
+        }
+    },
+    "involvement": {
+        "name": "Involvement",
+        "description": "Touches and passes attempted",
+        "columns": [
+            "touches_touches",
+            "total_att"
+        ],
+        "weights": {
+            "touches_touches": 0.5,
+            "total_att": 0.5
+        }
+    }
+}
+
+# Metric definitions for defenders
+DEFENDER_METRICS = {
+    "tackling": {
+        "name": "Tackling",
+        "description": "Tackles won and dribblers stopped",
+        "columns": [
+            "tackles_tklw",
+            "challenges_tklpct"
+        ],
+        "weights": {
+            "tackles_tklw": 0.6,
+            "challenges_tklpct": 0.4
+        }
+    },
+    "reading_game": {
+        "name": "Reading the Game",
+        "description": "Interceptions, blocks, clearances",
+        "columns": [
+            "int",
+            "blocks_blocks",
+            "clr"
+        ],
+        "weights": {
+            "int": 0.4,
+            "blocks_blocks": 0.3,
+            "clr": 0.3
+        }
+    },
+    "aerial": {
+        "name": "Aerial Dominance",
+        "description": "Aerials won, duels",
+        "columns": [
+            "aerial_duels_wonpct",
+            "aerial_duels_won"
+        ],
+        "weights": {
+            "aerial_duels_wonpct": 0.5,
+            "aerial_duels_won": 0.5
+        }
+    },
+    "build_up": {
+        "name": "Build-up Play",
+        "description": "Pass completion and progressive passing",
+        "columns": [
+            "total_cmppct",
+            "prgp",
+            "long_cmppct"
+        ],
+        "weights": {
+            "total_cmppct": 0.4,
+            "prgp": 0.4,
+            "long_cmppct": 0.2
+        }
+    },
+    "overlapping": {
+        "name": "Attacking Support",
+        "description": "Crosses, progressive carries, chance creation",
+        "columns": [
+            "pass_types_crs",
+            "carries_prgc",
+            "sca_sca"
+        ],
+        "weights": {
+            "pass_types_crs": 0.4,
+            "carries_prgc": 0.3,
+            "sca_sca": 0.3
+        }
+    }
+}
+
+# Metric definitions for goalkeepers (outfield tables only - keeper stats are not in the percentiles yet)
+GOALKEEPER_METRICS = {
+    "distribution": {
+        "name": "Distribution",
+        "description": "Pass completion from the back",
+        "columns": [
+            "total_cmppct",
+            "short_cmppct"
+        ],
+        "weights": {
+            "total_cmppct": 0.6,
+            "short_cmppct": 0.4
+        }
+    },
+    "long_passing": {
+        "name": "Long Passing",
+        "description": "Long pass volume and accuracy",
+        "columns": [
+            "long_cmppct",
+            "long_att"
+        ],
+        "weights": {
+            "long_cmppct": 0.6,
+            "long_att": 0.4
+        }
+    },
+    "command_of_area": {
+        "name": "Command of Area",
+        "description": "Aerials won, recoveries",
+        "columns": [
+            "aerial_duels_won",
+            "performance_recov"
+        ],
+        "weights": {
+            "aerial_duels_won": 0.5,
+            "performance_recov": 0.5
+        }
+    },
+    "availability": {
+        "name": "Availability",
+        "description": "Minutes and starts",
+        "columns": [
+            "playing_time_min",
+            "playing_time_starts"
+        ],
+        "weights": {
+            "playing_time_min": 0.5,
+            "playing_time_starts": 0.5
+        }
+    }
+}
+
+POSITION_METRICS = {
+    "forward": FORWARD_METRICS,
+    "midfielder": MIDFIELDER_METRICS,
+    "defender": DEFENDER_METRICS,
+    "goalkeeper": GOALKEEPER_METRICS
+}
+
+# Raw percentiles returned with each recommendation for the radar chart
+RADAR_PERCENTILES = {
+    "forward": [
+        'performance_gls_pct',
+        'expected_npxg_pct',
+        'standard_sot_pct',
+        'performance_ast_pct',
+        'expected_xag_pct',
+        'kp_pct',
+        'take_ons_succ_pct',
+        'aerial_duels_wonpct_pct',
+        'touches_att_pen_pct',
+        'carries_prgc_pct'
+    ],
+    "midfielder": [
+        'total_cmppct_pct',
+        'prgp_pct',
+        'carries_prgc_pct',
+        'expected_xag_pct',
+        'kp_pct',
+        'sca_sca_pct',
+        'tackles_tklw_pct',
+        'int_pct',
+        'performance_recov_pct',
+        'touches_touches_pct'
+    ],
+    "defender": [
+        'tackles_tklw_pct',
+        'challenges_tklpct_pct',
+        'int_pct',
+        'blocks_blocks_pct',
+        'clr_pct',
+        'aerial_duels_won_pct',
+        'aerial_duels_wonpct_pct',
+        'total_cmppct_pct',
+        'prgp_pct',
+        'carries_prgc_pct'
+    ],
+    "goalkeeper": [
+        'total_cmppct_pct',
+        'short_cmppct_pct',
+        'long_cmppct_pct',
+        'long_att_pct',
+        'aerial_duels_won_pct',
+        'performance_recov_pct',
+        'playing_time_min_pct'
+    ]
+}
+
 # Algorithm definitions
 ALGORITHMS = {
     "weighted_score": {
         "name": "Weighted Score",
         "description": "Balanced approach - combines all metrics based on your preferences"
+    },
+    "pareto": {
+        "name": "Pareto Front",
+        "description": "No trade-offs - players nobody beats on every weighted metric, ranked in layers"
     }
 }
\ No newline at end of file
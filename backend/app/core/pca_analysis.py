@@ -4,22 +4,126 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.metrics import silhouette_score, davies_bouldin_score
-from typing import Optional, Dict, List
-import json
+from joblib import Parallel, delayed
+from typing import Optional, Dict, List, Tuple
+import threading
+from app.core.config import settings
+from app.core.feature_store import FeatureStore
+from app.core.cache import ResultCache
+from app.core.timing import timed
+
+# Eligibility for the style map (same thresholds as the old SQL filters)
+PCA_MIN_GOALS = 5
+PCA_MIN_90S = 10
+
+# Data versions kept in the PCA cache (current + the one being replaced)
+MAX_CACHED_VERSIONS = 2
+
+# Finished maps shared with other workers / instances (see shared_pca)
+PCA_RESULT_CACHE = ResultCache("pca")
+
+# Percentile features used for the forward style map (and similarity search)
+PCA_FEATURE_COLUMNS = [
+    'performance_gls_pct', 'expected_npxg_pct', 'expected_npxg_per_sh_pct', 'standard_sot_pct', #SHOOTING
+    'aerial_duels_wonpct_pct', 'aerial_duels_won_pct', #AERIAL
+    'performance_ast_pct', 'expected_xag_pct', 'kp_pct', 'sca_sca_pct', 'gca_gca_pct', 'sca_types_passlive_pct','sca_types_to_pct', 'sca_types_sho_pct','sca_types_fld_pct','sca_types_def_pct',#CREATING
+    'pass_types_tb_pct','pass_types_crs_pct',
+    'take_ons_succ_pct', 'carries_prgc_pct', 'touches_att_pen_pct', 'carries_1_per_3_pct', #CARRYING/DRIBBLING
+    'tackles_att_3rd_pct','performance_recov_pct' #DEFENDING
+]
+
+def select_feature_rows(df: pd.DataFrame, feature_cols: List[str] = PCA_FEATURE_COLUMNS):
+    """
+    Keep the feature columns present in df and the players that have
+    at least 70% of them. Returns (filtered copy, available columns)
+    """
+    available_cols = [col for col in feature_cols if col in df.columns]
+    return df.dropna(subset=available_cols, thresh=len(available_cols)*0.7).copy(), available_cols
+
+def _score_k(X: np.ndarray, k: int, use_minibatch: bool = False,
+             silhouette_sample: Optional[int] = None):
+    """Fit one candidate k and return (silhouette, davies_bouldin, inertia)"""
+    if use_minibatch:
+        kmeans = MiniBatchKMeans(n_clusters=k, random_state=42, n_init=3, batch_size=2048)
+    else:
+        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
+    labels = kmeans.fit_predict(X)
+    
+    # Fixed seed so the sampled silhouette (and therefore k) is reproducible
+    sil_score = silhouette_score(X, labels, sample_size=silhouette_sample, random_state=42)
+    db_score = davies_bouldin_score(X, labels)
+    return sil_score, db_score, kmeans.inertia_
 
 class ForwardPCAAnalyzer:
-    def __init__(self):
+    def __init__(self, store: Optional[FeatureStore] = None):
+        self._store = store  # loaded on first use - worker processes never need it
         self.pca = PCA(n_components=2)
         self.scaler = StandardScaler()
         self.optimal_clusters = None
         self.kmeans = None
         
-    def find_optimal_clusters(self, X: np.ndarray, max_k: int = 10) -> int:
+        # Results cache: (data version, features) -> projection, (data version, features, k) -> result
+        self._projections: Dict = {}
+        self._results: Dict = {}
+        self._versions: List[str] = []
+        self._cache_lock = threading.Lock()
+        
+        # Background fill of every k for the current data version (PCAComputeService.precompute)
+        self.precompute_status: Dict = {"state": "idle", "version": None, "done": 0, "total": 0, "error": None}
+    
+    @property
+    def store(self) -> FeatureStore:
+        if self._store is None:
+            self._store = FeatureStore()
+        return self._store
+    
+    @property
+    def store_loaded(self) -> bool:
+        """Whether reading `store` is free (no FeatureStore load on first use)"""
+        return self._store is not None
+    
+    def use_store(self, store: FeatureStore):
+        """Serve a reloaded feature store - results are cached per version, so nothing stale is reused"""
+        self._store = store
+    
+    @timed("pca_load")
+    def load_data(self) -> pd.DataFrame:
+        """
+        Forwards eligible for the PCA map with their percentiles expanded.
+        Taken from the shared feature snapshot - the goals / 90s eligibility
+        is a mask over the loaded matrix, so no query runs on the request path.
+        """
+        snapshot = self.store.view("forward")
+        eligible = ((snapshot.column('performance_gls') >= PCA_MIN_GOALS) &
+                    (snapshot.column('playing_time_90s') >= PCA_MIN_90S))  # NaN never passes
+        rows = np.flatnonzero(eligible)
+        
+        if len(rows) == 0:
+            return pd.DataFrame()
+        
+        pct_cols = [col for col in snapshot.columns if col.endswith('_pct')]
+        df = pd.DataFrame({
+            'player_id': snapshot.player_ids[rows],
+            'name': snapshot.labels('name', rows),
+            'team': snapshot.labels('team', rows),
+            'position': snapshot.labels('position', rows),
+            'performance_gls': snapshot.column('performance_gls')[rows],
+            'playing_time_90s': snapshot.column('playing_time_90s')[rows],
+        })
+        percentile_df = pd.DataFrame(snapshot.matrix(pct_cols)[rows].astype(np.float64), columns=pct_cols)
+        return pd.concat([df, percentile_df], axis=1)
+        
+    @timed("pca_k_search")
+    def find_optimal_clusters(self, X: np.ndarray, max_k: int = 10, mode: Optional[str] = None) -> int:
         """
         Find optimal number of clusters using multiple metrics
+        Args:
+            mode: "exact" (sequential KMeans + full silhouette) or "fast" (parallel sweep,
+                  MiniBatchKMeans for large n, sampled silhouette). Defaults to settings.
         """
+        mode = mode or settings.PCA_K_SEARCH_MODE
         scores = {
             'silhouette': [],
             'davies_bouldin': [],
@@ -29,20 +133,26 @@ class ForwardPCAAnalyzer:
         
         K_range = range(2, min(max_k + 1, len(X) // 5))  # At least 5 players per cluster
         
-        for k in K_range:
-            kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-            labels = kmeans.fit_predict(X)
-            
+        if mode == "fast":
+            # Below the sample size / minibatch threshold this is the exact computation, just parallel
+            sample_size = settings.PCA_SILHOUETTE_SAMPLE_SIZE
+            use_minibatch = len(X) > settings.PCA_MINIBATCH_THRESHOLD
+            results = Parallel(n_jobs=settings.PCA_K_SEARCH_JOBS, prefer="threads")(
+                delayed(_score_k)(X, k, use_minibatch, sample_size if len(X) > sample_size else None)
+                for k in K_range
+            )
+        else:
+            results = [_score_k(X, k) for k in K_range]
+        
+        for sil_score, db_score, inertia in results:
             # Silhouette score (higher is better, -1 to 1)
-            sil_score = silhouette_score(X, labels)
             scores['silhouette'].append(sil_score)
             
             # Davies-Bouldin score (lower is better)
-            db_score = davies_bouldin_score(X, labels)
             scores['davies_bouldin'].append(db_score)
             
             # Inertia (within-cluster sum of squares)
-            scores['inertia'].append(kmeans.inertia_)
+            scores['inertia'].append(inertia)
             
         # Find elbow point in inertia
         if len(scores['inertia']) > 2:
@@ -79,34 +189,50 @@ class ForwardPCAAnalyzer:
         """
         Apply transformations to ensure points are well-distributed
         """
-        # Check if points are clustered on one side
-        x_coords = X[:, 0]
-        y_coords = X[:, 1]
-        
-        # Calculate skewness
-        x_skew = np.mean(x_coords) / np.std(x_coords) if np.std(x_coords) > 0 else 0
-        y_skew = np.mean(y_coords) / np.std(y_coords) if np.std(y_coords) > 0 else 0
-        
-        # If data is too skewed, apply log or sqrt transformation
-        if abs(x_skew) > 1:
-            print(f"X-axis skewed ({x_skew:.2f}), applying transformation")
-            # Shift to positive if needed
-            if np.min(x_coords) < 0:
-                x_coords = x_coords - np.min(x_coords) + 1
-            # Apply sqrt transformation
-            x_coords = np.sign(x_coords) * np.sqrt(np.abs(x_coords))
-            X[:, 0] = x_coords
-        
-        if abs(y_skew) > 1:
-            print(f"Y-axis skewed ({y_skew:.2f}), applying transformation")
-            if np.min(y_coords) < 0:
-                y_coords = y_coords - np.min(y_coords) + 1
-            y_coords = np.sign(y_coords) * np.sqrt(np.abs(y_coords))
-            X[:, 1] = y_coords
+        return self.fit_spread_transform(X)[0]
+    
+    def fit_spread_transform(self, X: np.ndarray):
+        """
+        ensure_spread_distribution() that also returns its parameters,
+        so the same transform can be replayed on new points
+        Returns (transformed X, params)
+        """
+        params = {"shift": [None, None], "sqrt": [False, False]}
+        
+        for axis, name in enumerate(['X', 'Y']):
+            coords = X[:, axis]
+            
+            # Check if points are clustered on one side
+            skew = np.mean(coords) / np.std(coords) if np.std(coords) > 0 else 0
+            
+            # If data is too skewed, apply sqrt transformation
+            if abs(skew) > 1:
+                print(f"{name}-axis skewed ({skew:.2f}), applying transformation")
+                # Shift to positive if needed
+                if np.min(coords) < 0:
+                    params["shift"][axis] = float(np.min(coords))
+                params["sqrt"][axis] = True
+        
+        X = self._apply_skew_correction(X, params)
         
         # Re-center and scale
-        X = StandardScaler().fit_transform(X)
+        params["scaler"] = StandardScaler().fit(X)
+        X = params["scaler"].transform(X)
         
+        return X, params
+    
+    def apply_spread_transform(self, X: np.ndarray, params: Dict) -> np.ndarray:
+        """Replay a fitted spread transform on new PCA coordinates"""
+        return params["scaler"].transform(self._apply_skew_correction(X, params))
+    
+    def _apply_skew_correction(self, X: np.ndarray, params: Dict) -> np.ndarray:
+        X = X.copy()
+        for axis in range(2):
+            if params["sqrt"][axis]:
+                coords = X[:, axis]
+                if params["shift"][axis] is not None:
+                    coords = coords - params["shift"][axis] + 1
+                X[:, axis] = np.sign(coords) * np.sqrt(np.abs(coords))
         return X
     
     def compute_pca(self, df: pd.DataFrame, custom_k: Optional[int] = None) -> Dict:
@@ -116,109 +242,316 @@ class ForwardPCAAnalyzer:
             df: DataFrame with player data
             custom_k: Optional custom number of clusters (2-10)
         """
-        # Define metrics (same as before)
-        feature_cols = [
-            'performance_gls_pct', 'expected_npxg_pct', 'expected_npxg_per_sh_pct', 'standard_sot_pct', #SHOOTING
-            'aerial_duels_wonpct_pct', 'aerial_duels_won_pct', #AERIAL
-            'performance_ast_pct', 'expected_xag_pct', 'kp_pct', 'sca_sca_pct', 'gca_gca_pct', 'sca_types_passlive_pct','sca_types_to_pct', 'sca_types_sho_pct','sca_types_fld_pct','sca_types_def_pct',#CREATING
-            'pass_types_tb_pct','pass_types_crs_pct',
-            'take_ons_succ_pct', 'carries_prgc_pct', 'touches_att_pen_pct', 'carries_1_per_3_pct', #CARRYING/DRIBBLING
-            'tackles_att_3rd_pct','performance_recov_pct' #DEFENDING
-        ]
+        projection = self._fit_projection(df)
+        return self._cluster_projection(projection, custom_k)
+    
+    def cache_key(self, custom_k: Optional[int] = None,
+                  feature_cols: List[str] = PCA_FEATURE_COLUMNS) -> tuple:
+        """(store version, feature set, k) - k is None for the automatic choice"""
+        k = custom_k if custom_k and 2 <= custom_k <= 10 else None
+        return self.store.version, tuple(feature_cols), k
+    
+    def cached_pca(self, custom_k: Optional[int] = None,
+                   feature_cols: List[str] = PCA_FEATURE_COLUMNS, shared: bool = True) -> Optional[Dict]:
+        """
+        Cached get_pca() result, or None if it still has to be computed.
+        Looks in this process first, then (unless shared=False) in the shared cache.
+        """
+        key = self.cache_key(custom_k, feature_cols)
+        result = self.local_pca(key)
+        if result is None and shared:
+            result = self.shared_pca(key)
+        return result
+    
+    def local_pca(self, key: tuple) -> Optional[Dict]:
+        """Result computed or fetched by this process for a cache_key(), if any"""
+        with self._cache_lock:
+            return self._results.get(key)
+    
+    def shared_pca(self, key: tuple) -> Optional[Dict]:
+        """
+        Map computed by another worker for this key, kept locally once found.
+        The fitted basis is not shared - get_basis() refits it here when needed.
+        """
+        version, features, k = key
+        result = PCA_RESULT_CACHE.get(version, {"features": list(features), "k": k})
+        if result is None:
+            return None
+        
+        # Points are stored only as columns - rebuild the row view
+        columns = result["columns"]
+        result["points"] = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        with self._cache_lock:
+            self._track_version(version)
+            self._results[key] = result
+            self._results[(version, features, result["optimal_k"])] = result
+        return result
+    
+    def _publish(self, key: tuple, result: Dict):
+        """Share a computed map under its own key and its explicit k"""
+        version, features, k = key
+        shared = {name: value for name, value in result.items() if name != "points"}
+        for shared_k in {k, result["optimal_k"]}:
+            PCA_RESULT_CACHE.set(version, {"features": list(features), "k": shared_k}, shared)
+    
+    def cached_projection(self, version: str, features: tuple) -> Optional[Dict]:
+        """Fitted (k-independent) projection for a data version, if any"""
+        with self._cache_lock:
+            return self._projections.get((version, features))
+    
+    def get_pca(self, custom_k: Optional[int] = None,
+                feature_cols: List[str] = PCA_FEATURE_COLUMNS) -> Optional[Dict]:
+        """
+        compute_pca() over the shared snapshot, cached per (store version, k, feature set).
+        The projection is fitted once per store version and shared by every k, so only
+        the first request on new data pays for fitting.
+        Returns None when there is no forward data.
+        """
+        cached = self.cached_pca(custom_k, feature_cols)
+        if cached is not None:
+            return cached
+        
+        return self._compute_pca(self.cache_key(custom_k, feature_cols))
+    
+    def _compute_pca(self, key: tuple) -> Optional[Dict]:
+        """Fit (or reuse) the projection for key's version, cluster it and cache the result"""
+        version, features, k = key
+        projection = self.cached_projection(version, features)
+        if projection is None:
+            df = self.load_data()
+            if df.empty:
+                return None
+            projection = self._fit_projection(df, list(features))
+        
+        result = self._cluster_projection(projection, k)
+        return self.store_result(key, projection, result)
+    
+    def store_result(self, key: tuple, projection: Dict, result: Dict) -> Dict:
+        """
+        Cache a clustering computed here or in a worker process. A projection for a
+        version that is already cached only contributes its new centroids / optimal k,
+        so every k keeps sharing one fitted basis.
+        """
+        version, features, k = key
         
-        # Filter to available columns
-        available_cols = [col for col in feature_cols if col in df.columns]
+        with self._cache_lock:
+            self._track_version(version)
+            
+            existing = self._projections.get((version, features))
+            if existing is None:
+                self._projections[(version, features)] = projection
+            elif existing is not projection:
+                existing["centroids"].update(projection["centroids"])
+                if existing["optimal_k"] is None:
+                    existing["optimal_k"] = projection["optimal_k"]
+            
+            self._results[(version, features, k)] = result
+            # The automatic-k map is also the answer for its explicit k
+            self._results[(version, features, result["optimal_k"])] = result
         
+        self._publish(key, result)
+        return result
+    
+    def _track_version(self, version: str):
+        """Register a data version in the cache (caller holds _cache_lock)"""
+        if version not in self._versions:
+            self._versions.append(version)
+            # Drop everything computed for versions we no longer serve
+            while len(self._versions) > MAX_CACHED_VERSIONS:
+                stale = self._versions.pop(0)
+                self._projections = {old: v for old, v in self._projections.items() if old[0] != stale}
+                self._results = {old: v for old, v in self._results.items() if old[0] != stale}
+    
+    def cached_basis(self, custom_k: Optional[int] = None) -> Optional[Tuple[Dict, int]]:
+        """
+        get_basis() from this process's cache only - None if the map or its fitted
+        basis is not here yet. Never computes, so it is safe on the event loop.
+        """
+        result = self.cached_pca(custom_k, shared=False)
+        if result is None:
+            return None
+        version, features, k = self.cache_key(result["optimal_k"])
+        projection = self.cached_projection(version, features)
+        if projection is None or k not in projection["centroids"]:
+            return None
+        return projection, result["optimal_k"]
+    
+    def get_basis(self, custom_k: Optional[int] = None) -> Optional[Tuple[Dict, int]]:
+        """
+        Frozen projection for the current data version plus the k whose
+        centroids are in projection["centroids"][k] (custom k or the optimal one)
+        Returns (projection, k) or None when there is no data
+        """
+        result = self.get_pca(custom_k=custom_k)
+        if result is None:
+            return None
+        basis = self.cached_basis(custom_k)
+        if basis is None:
+            # The map came from the shared cache - fit the basis here too. Fitting and
+            # KMeans are seeded, so this reproduces the same map and centroids.
+            self._compute_pca(self.cache_key(result["optimal_k"]))
+            # Still None if the data changed in between - the next call sees the new version
+            basis = self.cached_basis(custom_k)
+        return basis
+    
+    def project_features(self, X: np.ndarray, custom_k: Optional[int] = None,
+                         basis: Optional[Tuple[Dict, int]] = None) -> Optional[Dict]:
+        """
+        Project feature rows (columns in projection["feature_cols"] order, NaN = missing)
+        onto the frozen basis and assign clusters by nearest centroid - no refitting.
+        `basis` is a get_basis() result the caller already holds (looked up otherwise).
+        """
+        if basis is None:
+            basis = self.get_basis(custom_k)
+        if basis is None:
+            return None
+        projection, k = basis
+        
+        X = np.where(np.isnan(X), 50, X)
+        coords = projection["basis"]["pca"].transform(projection["basis"]["scaler"].transform(X))
+        coords = self.apply_spread_transform(coords, projection["basis"]["spread"])
+        
+        centroids = projection["centroids"][k]
+        distances = ((coords[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        return {"coords": coords, "clusters": distances.argmin(axis=1), "k": k}
+    
+    @timed("pca_fit")
+    def _fit_projection(self, df: pd.DataFrame, feature_cols: List[str] = PCA_FEATURE_COLUMNS) -> Dict:
+        """
+        Standardize, project onto 2 PCs and spread the points.
+        Everything here is independent of k.
+        """
         # Prepare data
-        pca_df = df.dropna(subset=available_cols, thresh=len(available_cols)*0.7).copy()
+        pca_df, available_cols = select_feature_rows(df, feature_cols)
         
         # Extract features and standardize
         X = pca_df[available_cols].fillna(50).values
-        X_scaled = self.scaler.fit_transform(X)
+        scaler = StandardScaler()
+        pca = PCA(n_components=2)
+        X_scaled = scaler.fit_transform(X)
         
         # Perform PCA
-        pca_coords = self.pca.fit_transform(X_scaled)
+        pca_coords = pca.fit_transform(X_scaled)
         
         # Ensure good distribution
-        pca_coords = self.ensure_spread_distribution(pca_coords)
+        pca_coords, spread = self.fit_spread_transform(pca_coords)
+        self.scaler, self.pca = scaler, pca
+        
+        # Get feature loadings for interpretation
+        loadings = pd.DataFrame(
+            pca.components_.T,
+            columns=['PC1', 'PC2'],
+            index=available_cols
+        )
+        
+        return {
+            "pca_df": pca_df,
+            "feature_cols": available_cols,
+            "coords": pca_coords,
+            "explained_variance": pca.explained_variance_ratio_.tolist(),
+            "pc_interpretation": self._interpret_components(loadings),
+            "optimal_k": None,  # found lazily by the first automatic-k request
+            # Frozen basis - lets new players or subsets be projected without refitting
+            "basis": {"scaler": scaler, "pca": pca, "spread": spread},
+            "centroids": {}  # k -> KMeans centers in map coordinates
+        }
+    
+    @timed("pca_cluster")
+    def _cluster_projection(self, projection: Dict, custom_k: Optional[int] = None) -> Dict:
+        """Cluster a fitted projection with a custom or the optimal k and build the response"""
+        pca_df = projection["pca_df"]
+        available_cols = projection["feature_cols"]
+        pca_coords = projection["coords"]
         
         # Determine number of clusters
         if custom_k and 2 <= custom_k <= 10:
-            self.optimal_clusters = custom_k
+            n_clusters = custom_k
             print(f"Using custom cluster count: {custom_k}")
         else:
             # Find optimal number of clusters
-            self.optimal_clusters = self.find_optimal_clusters(pca_coords)
-            print(f"Using optimal cluster count: {self.optimal_clusters}")
+            if projection["optimal_k"] is None:
+                projection["optimal_k"] = self.find_optimal_clusters(pca_coords)
+            n_clusters = projection["optimal_k"]
+            print(f"Using optimal cluster count: {n_clusters}")
+        self.optimal_clusters = n_clusters
         
         # Perform clustering with the chosen k
-        self.kmeans = KMeans(n_clusters=self.optimal_clusters, random_state=42, n_init=10)
-        clusters = self.kmeans.fit_predict(pca_coords)
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+        clusters = kmeans.fit_predict(pca_coords)
+        self.kmeans = kmeans
+        projection["centroids"][n_clusters] = kmeans.cluster_centers_
         
         # Simple generic labels (you can rename in frontend)
-        cluster_labels = {i: f"Group {i+1}" for i in range(self.optimal_clusters)}
+        cluster_labels = {i: f"Group {i+1}" for i in range(n_clusters)}
         
         # Calculate cluster characteristics for reference
-        cluster_stats = self._get_cluster_characteristics(pca_df, clusters, available_cols)
-        # Create response data
-        points = []
-        for idx, (_, player) in enumerate(pca_df.iterrows()):
-            points.append({
-                "player_id": int(player['player_id']),
-                "name": player['name'],
-                "team": player.get('team', 'Unknown'),
-                "x": float(pca_coords[idx, 0]),
-                "y": float(pca_coords[idx, 1]),
-                "cluster": cluster_labels[clusters[idx]],
-                "cluster_id": int(clusters[idx])
-            })
+        cluster_stats = self._get_cluster_characteristics(pca_df, clusters, available_cols, n_clusters)
         
-        # Get feature loadings for interpretation
-        loadings = pd.DataFrame(
-            self.pca.components_.T,
-            columns=['PC1', 'PC2'],
-            index=available_cols
-        )
+        # Create response data columnwise - one list per field, no per-row pandas access
+        label_table = np.array([cluster_labels[i] for i in range(n_clusters)], dtype=object)
+        columns = {
+            "player_id": pca_df['player_id'].to_numpy(dtype=np.int64).tolist(),
+            "name": pca_df['name'].tolist(),
+            "team": [team or 'Unknown' for team in pca_df['team'].tolist()],
+            "x": pca_coords[:, 0].tolist(),
+            "y": pca_coords[:, 1].tolist(),
+            "cluster": label_table[clusters].tolist(),
+            "cluster_id": clusters.tolist()
+        }
+        points = [dict(zip(columns, values)) for values in zip(*columns.values())]
         
         return {
             "points": points,
-            "explained_variance": self.pca.explained_variance_ratio_.tolist(),
-            "pc_interpretation": self._interpret_components(loadings),
+            "columns": columns,  # same data as parallel arrays (layout=columns)
+            "coords": pca_coords,  # arrays aligned with points, for LOD binning
+            "clusters": clusters,
+            "explained_variance": projection["explained_variance"],
+            "pc_interpretation": projection["pc_interpretation"],
             "cluster_centers": self._get_cluster_centers(pca_coords, clusters, cluster_labels),
-            "optimal_k": self.optimal_clusters,
+            "optimal_k": n_clusters,
             "cluster_characteristics": cluster_stats,  # So you can name them yourself
             "distribution_quality": self._assess_distribution(pca_coords)
         }
 
     def _get_cluster_characteristics(self, df: pd.DataFrame, clusters: np.ndarray, 
-                                   feature_cols: List[str]) -> Dict:
+                                   feature_cols: List[str], n_clusters: Optional[int] = None) -> Dict:
         """
-        Get top characteristics of each cluster for manual naming
+        Get top characteristics of each cluster for manual naming.
+        All cluster x feature means come from one pair of matrix products
+        (missing percentiles are skipped, as pandas .mean() does)
         """
-        cluster_chars = {}
+        n_clusters = n_clusters or self.optimal_clusters
+        values = df[feature_cols].to_numpy(dtype=float)
+        present = ~np.isnan(values)
         
-        for cluster_id in range(self.optimal_clusters):
-            cluster_mask = clusters == cluster_id
-            cluster_players = df[cluster_mask]
-            
-            # Get mean percentiles
-            cluster_means = {}
-            for col in feature_cols:
-                cluster_means[col] = cluster_players[col].mean()
-            
-            # Find top 3 defining characteristics
-            top_features = sorted(cluster_means.items(), key=lambda x: x[1], reverse=True)[:3]
-            
+        membership = np.zeros((n_clusters, len(clusters)))
+        membership[clusters, np.arange(len(clusters))] = 1.0
+        sums = membership @ np.where(present, values, 0.0)
+        counts = membership @ present
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+        sizes = np.bincount(clusters, minlength=n_clusters)
+        
+        # Top 3 features per cluster (all-missing features rank last)
+        top = np.argsort(-np.where(np.isnan(means), -np.inf, means), axis=1, kind='stable')[:, :3]
+        
+        # First 3 players of each cluster in map order
+        names = np.asarray(df['name'].tolist(), dtype=object)
+        order = np.argsort(clusters, kind='stable')
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        
+        cluster_chars = {}
+        for cluster_id in range(n_clusters):
             cluster_chars[f"Group {cluster_id + 1}"] = {
-                "size": int(cluster_mask.sum()),
+                "size": int(sizes[cluster_id]),
                 "top_features": [
                     {
-                        "metric": feat[0].replace('_pct', ''),
-                        "avg_percentile": round(feat[1], 1)
+                        "metric": feature_cols[col].replace('_pct', ''),
+                        "avg_percentile": round(float(means[cluster_id, col]), 1)
                     }
-                    for feat in top_features
+                    for col in top[cluster_id][:len(feature_cols)]
                 ],
-                "sample_players": cluster_players['name'].tolist()[:3]  # Show 3 example players
+                "sample_players": names[order[starts[cluster_id]:starts[cluster_id] + min(3, sizes[cluster_id])]].tolist()  # Show 3 example players
             }
         
         return cluster_chars
@@ -240,21 +573,21 @@ class ForwardPCAAnalyzer:
     
     def _get_cluster_centers(self, pca_coords: np.ndarray, clusters: np.ndarray, 
                            cluster_labels: Dict[int, str]) -> List[Dict]:
-        """Calculate cluster centers for visualization"""
-        centers = []
-        for cluster_id, label in cluster_labels.items():
-            cluster_mask = clusters == cluster_id
-            if cluster_mask.any():
-                center_x = pca_coords[cluster_mask, 0].mean()
-                center_y = pca_coords[cluster_mask, 1].mean()
-                centers.append({
-                    "cluster_id": cluster_id,
-                    "label": label,
-                    "x": float(center_x),
-                    "y": float(center_y),
-                    "count": int(cluster_mask.sum())
-                })
-        return centers
+        """Calculate cluster centers for visualization (mean position of each cluster's points)"""
+        counts = np.bincount(clusters, minlength=len(cluster_labels))
+        sum_x = np.bincount(clusters, weights=pca_coords[:, 0], minlength=len(cluster_labels))
+        sum_y = np.bincount(clusters, weights=pca_coords[:, 1], minlength=len(cluster_labels))
+        return [
+            {
+                "cluster_id": cluster_id,
+                "label": label,
+                "x": float(sum_x[cluster_id] / counts[cluster_id]),
+                "y": float(sum_y[cluster_id] / counts[cluster_id]),
+                "count": int(counts[cluster_id])
+            }
+            for cluster_id, label in cluster_labels.items()
+            if counts[cluster_id] > 0
+        ]
     
     def _interpret_components(self, loadings: pd.DataFrame) -> Dict[str, str]:
         """Auto-interpret what each PC represents"""
@@ -276,4 +609,17 @@ class ForwardPCAAnalyzer:
             else:
                 interpretations[pc] = f"Mixed Attributes"
         
-        return interpretations
\ No newline at end of file
+        return interpretations
+
+
+def compute_pca_task(df: Optional[pd.DataFrame], feature_cols: List[str],
+                     custom_k: Optional[int], projection: Optional[Dict] = None):
+    """
+    Process-pool entry point: fit the projection (when not given) and cluster it.
+    Runs on a detached analyzer - no feature store, no cache - and returns
+    (projection, result) for ForwardPCAAnalyzer.store_result in the parent.
+    """
+    analyzer = ForwardPCAAnalyzer()
+    if projection is None:
+        projection = analyzer._fit_projection(df, feature_cols)
+    return projection, analyzer._cluster_projection(projection, custom_k)
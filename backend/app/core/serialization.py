@@ -0,0 +1,45 @@
+import json
+import numpy as np
+from typing import Any
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.core.timing import span
+
+try:
+    import orjson
+except ImportError:  # optional - falls back to the stdlib encoder
+    orjson = None
+
+
+def _default(value: Any):
+    """Types orjson does not handle natively (NumPy arrays/scalars are handled by the option flag)"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Compact JSON bytes. Uses orjson (NumPy-aware, NaN -> null) when installed
+    and enabled, otherwise the stdlib encoder with the same NumPy fallbacks.
+    """
+    if orjson is not None and settings.FAST_JSON:
+        return orjson.dumps(content, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False,
+                      allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with dumps(). Endpoints that return one directly
+    skip response_model validation - meant for payloads that were already
+    built (and cached) in the response shape.
+    """
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            return dumps(content)
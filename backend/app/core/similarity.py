@@ -0,0 +1,80 @@
+import numpy as np
+from sklearn.preprocessing import StandardScaler, normalize
+from sklearn.neighbors import KDTree
+from typing import Dict, List
+from app.core.pca_analysis import PCA_FEATURE_COLUMNS
+from app.core.snapshot import PlayerSnapshot
+
+SIMILARITY_METRICS = ["cosine", "euclidean"]
+
+
+class PlayerSimilarityIndex:
+    """
+    Nearest-neighbour index over standardized percentile feature vectors.
+    Built once per loaded snapshot; each query walks a KD-tree instead of
+    scanning every player.
+
+    Cosine similarity is served from a second tree over L2-normalized vectors:
+    for unit vectors ||a - b||^2 = 2 - 2cos(a, b), so Euclidean order there
+    is cosine order.
+    """
+    def __init__(self, snapshot: PlayerSnapshot, feature_cols: List[str] = PCA_FEATURE_COLUMNS):
+        self.snapshot = snapshot
+        self.feature_cols = [col for col in feature_cols if snapshot.has_column(col)]
+
+        # Same selection as the PCA map: one row per player with >= 70% of the features
+        _, first_rows = np.unique(snapshot.player_ids, return_index=True)
+        X = snapshot.matrix(self.feature_cols)[first_rows]
+        enough = np.count_nonzero(~np.isnan(X), axis=1) >= len(self.feature_cols) * 0.7
+        self.rows = first_rows[enough]
+        self.row_by_player = {int(pid): i for i, pid in enumerate(snapshot.player_ids[self.rows])}
+
+        if len(self.rows) == 0 or not self.feature_cols:
+            self.vectors = {}
+            self.trees = {}
+            return
+
+        X = StandardScaler().fit_transform(np.nan_to_num(X[enough], nan=50.0).astype(np.float64))
+        self.vectors = {
+            "euclidean": X,
+            "cosine": normalize(X),
+        }
+        self.trees = {metric: KDTree(vectors) for metric, vectors in self.vectors.items()}
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self.row_by_player
+
+    def query(self, player_id: int, limit: int = 10, metric: str = "cosine") -> List[Dict]:
+        """Find the `limit` players closest to player_id (excluding the player)"""
+        if metric not in SIMILARITY_METRICS:
+            raise ValueError(f"Invalid metric: {metric}")
+        if player_id not in self.row_by_player:
+            raise KeyError(player_id)
+
+        row = self.row_by_player[player_id]
+        k = min(limit + 1, len(self.rows))
+        distances, neighbors = self.trees[metric].query(self.vectors[metric][row:row + 1], k=k)
+
+        results = []
+        for distance, neighbor in zip(distances[0], neighbors[0]):
+            if neighbor == row:
+                continue
+            if metric == "cosine":
+                similarity = 1 - distance ** 2 / 2
+            else:
+                similarity = 1 / (1 + distance)
+            snapshot_row = self.rows[neighbor]
+            results.append({
+                "player_id": int(self.snapshot.player_ids[snapshot_row]),
+                "name": self.snapshot.label('name', snapshot_row),
+                "team": self.snapshot.label('team', snapshot_row) or 'Unknown',
+                "position": self.snapshot.label('position', snapshot_row) or 'FW',
+                "distance": float(distance),
+                "similarity": float(similarity)
+            })
+
+        return results[:limit]
+
+    def player_name(self, player_id: int) -> str:
+        """Name of an indexed player"""
+        return self.snapshot.label('name', self.rows[self.row_by_player[player_id]])
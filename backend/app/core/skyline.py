@@ -0,0 +1,55 @@
+import numpy as np
+from typing import Optional
+
+
+def _dominated_by(points: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """For each row of points, whether any row of others dominates it"""
+    if len(others) == 0:
+        return np.zeros(len(points), dtype=bool)
+    ge = np.all(others[None, :, :] >= points[:, None, :], axis=2)
+    gt = np.any(others[None, :, :] > points[:, None, :], axis=2)
+    return np.any(ge & gt, axis=1)
+
+
+def _skyline(X: np.ndarray, block_size: int = 256) -> np.ndarray:
+    """
+    Sort-filter-skyline: indexes of the non-dominated rows of X (higher is better).
+    Rows are visited in descending order of their sum - a monotone score, so a
+    row can only be dominated by rows visited before it. The window therefore
+    only ever holds skyline rows. Rows are filtered a block at a time against
+    the window and against the rest of their block (dominance is transitive, so
+    a dominated dominator is never needed).
+    """
+    order = np.argsort(-X.sum(axis=1), kind='stable')
+    window = np.empty((0, X.shape[1]), dtype=X.dtype)
+    skyline = []
+
+    for start in range(0, len(order), block_size):
+        rows = order[start:start + block_size]
+        block = X[rows]
+        keep = ~_dominated_by(block, window)
+        rows, block = rows[keep], block[keep]
+        keep = ~_dominated_by(block, block)
+        window = np.vstack([window, block[keep]])
+        skyline.extend(rows[keep])
+
+    return np.asarray(skyline, dtype=int)
+
+
+def pareto_fronts(X: np.ndarray, max_rows: Optional[int] = None) -> np.ndarray:
+    """
+    Assign each row of X to a Pareto front (1 = non-dominated, 2 = non-dominated
+    once front 1 is removed, ...). Peeling stops once max_rows rows have a front;
+    the remaining rows get np.inf.
+    """
+    fronts = np.full(len(X), np.inf)
+    remaining = np.arange(len(X))
+    front = 1
+
+    while len(remaining) and (max_rows is None or np.isfinite(fronts).sum() < max_rows):
+        layer = remaining[_skyline(X[remaining])]
+        fronts[layer] = front
+        remaining = np.setdiff1d(remaining, layer, assume_unique=True)
+        front += 1
+
+    return fronts
@@ -0,0 +1,132 @@
+import sys
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+
+# Text fields kept as category codes instead of per-row Python strings
+STRING_FIELDS = ['name', 'team', 'position', 'league', 'position_group']
+
+
+class PlayerSnapshot:
+    """
+    Compact, read-only player table.
+
+    Every numeric field (percentiles, raw stats, age) lives in one contiguous
+    float32 matrix addressed through a column index; text fields are stored
+    as int32 codes into a small table of unique strings. Row slices (e.g. one
+    position group) are views that share all arrays with the parent.
+    """
+    def __init__(self, player_ids: np.ndarray, features: np.ndarray, columns: List[str],
+                 codes: Dict[str, np.ndarray], categories: Dict[str, np.ndarray]):
+        self.player_ids = player_ids
+        self.features = features
+        self.columns = list(columns)
+        self.column_index = {col: i for i, col in enumerate(self.columns)}
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "PlayerSnapshot":
+        """Build a snapshot from a parsed frame (percentiles already expanded)"""
+        string_fields = [col for col in STRING_FIELDS if col in df.columns]
+        numeric_cols = [col for col in df.columns if col != 'player_id' and col not in string_fields]
+
+        features = np.empty((len(df), len(numeric_cols)), dtype=np.float32)
+        for i, col in enumerate(numeric_cols):
+            features[:, i] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float32, na_value=np.nan)
+
+        codes, categories = {}, {}
+        for field in string_fields:
+            field_codes, uniques = pd.factorize(df[field])  # missing -> -1
+            codes[field] = field_codes.astype(np.int32)
+            categories[field] = np.asarray(uniques, dtype=object)
+
+        return cls(
+            player_ids=df['player_id'].to_numpy(dtype=np.int64),
+            features=features,
+            columns=numeric_cols,
+            codes=codes,
+            categories=categories
+        )
+
+    @classmethod
+    def empty(cls) -> "PlayerSnapshot":
+        """Snapshot with no rows (no data loaded yet)"""
+        return cls(
+            player_ids=np.empty(0, dtype=np.int64),
+            features=np.empty((0, 0), dtype=np.float32),
+            columns=[],
+            codes={field: np.empty(0, dtype=np.int32) for field in STRING_FIELDS},
+            categories={field: np.empty(0, dtype=object) for field in STRING_FIELDS}
+        )
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def view(self, rows: slice) -> "PlayerSnapshot":
+        """Row slice sharing memory with this snapshot"""
+        return PlayerSnapshot(
+            player_ids=self.player_ids[rows],
+            features=self.features[rows],
+            columns=self.columns,
+            codes={field: field_codes[rows] for field, field_codes in self.codes.items()},
+            categories=self.categories
+        )
+
+    def has_column(self, name: str) -> bool:
+        return name in self.column_index
+
+    def column(self, name: str) -> np.ndarray:
+        """One numeric column (a view); all-NaN if the column does not exist"""
+        if name not in self.column_index:
+            return np.full(len(self), np.nan, dtype=np.float32)
+        return self.features[:, self.column_index[name]]
+
+    def populated_columns(self, suffix: str = '_pct') -> List[str]:
+        """Columns ending in `suffix` with at least one value in these rows
+        (a position view still carries every other position's stat columns)"""
+        return [
+            col for col in self.columns
+            if col.endswith(suffix) and not np.isnan(self.column(col)).all()
+        ]
+
+    def matrix(self, names: List[str]) -> np.ndarray:
+        """Gather several numeric columns into a new (rows x names) array"""
+        present = [self.column_index[name] for name in names if name in self.column_index]
+        if len(present) == len(names):
+            return self.features[:, present]
+        result = np.full((len(self), len(names)), np.nan, dtype=np.float32)
+        for i, name in enumerate(names):
+            if name in self.column_index:
+                result[:, i] = self.features[:, self.column_index[name]]
+        return result
+
+    def label(self, field: str, row: int) -> Optional[str]:
+        """Decoded text value for one row (None if missing)"""
+        if field not in self.codes:
+            return None
+        code = self.codes[field][row]
+        return self.categories[field][code] if code >= 0 else None
+
+    def labels(self, field: str, rows: Optional[np.ndarray] = None) -> List[Optional[str]]:
+        """Decoded text values for the given rows (all rows by default)"""
+        field_codes = self.codes[field] if rows is None else self.codes[field][rows]
+        # Append a None slot so missing values (code -1) decode to None
+        table = np.append(self.categories[field], None)
+        return table[field_codes].tolist()
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Bytes held by each part of the snapshot"""
+        return {
+            "player_ids": int(self.player_ids.nbytes),
+            "features": int(self.features.nbytes),
+            "codes": int(sum(field_codes.nbytes for field_codes in self.codes.values())),
+            "categories": int(sum(
+                values.nbytes + sum(sys.getsizeof(v) for v in values)
+                for values in self.categories.values()
+            ))
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self.memory_usage().values())
@@ -0,0 +1,143 @@
+import contextlib
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, Optional, Tuple
+import numpy as np
+from app.core.snapshot import PlayerSnapshot
+
+try:
+    import fcntl
+except ImportError:  # not on Windows - concurrent builders then race, which is still safe
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# File layout: magic | header length (uint64 LE) | JSON header | arrays, each 64-byte aligned
+SNAPSHOT_MAGIC = b"LENSSNAP"
+SNAPSHOT_FORMAT = 1
+_ALIGN = 64
+
+
+def snapshot_path(directory: str, version: str) -> str:
+    """File holding the snapshot for one data version"""
+    digest = hashlib.sha1(f"{SNAPSHOT_FORMAT}:{version}".encode()).hexdigest()[:16]
+    return os.path.join(directory, f"snapshot-{digest}.bin")
+
+
+@contextlib.contextmanager
+def build_lock(directory: str) -> Iterator[None]:
+    """
+    Exclusive lock across processes, so when several workers start together one
+    builds the file and the rest wait for it and map the result
+    """
+    os.makedirs(directory, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, ".build.lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_snapshot(path: str, snapshot: PlayerSnapshot, slices: Dict[str, slice], version: str):
+    """
+    Write the snapshot arrays, string tables and position slices to `path`.
+    The file is written under a temporary name and renamed into place, so a
+    reader only ever sees a complete file.
+    """
+    arrays = {"player_ids": snapshot.player_ids, "features": snapshot.features}
+    arrays.update({f"codes/{field}": codes for field, codes in snapshot.codes.items()})
+
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset = _aligned(offset + array.nbytes)
+
+    header = json.dumps({
+        "format": SNAPSHOT_FORMAT,
+        "version": version,
+        "columns": snapshot.columns,
+        "categories": {field: values.tolist() for field, values in snapshot.categories.items()},
+        "slices": {group: [s.start, s.stop] for group, s in slices.items()},
+        "arrays": layout,
+    }).encode("utf-8")
+    data_start = _aligned(len(SNAPSHOT_MAGIC) + 8 + len(header))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC + struct.pack("<Q", len(header)) + header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str, version: Optional[str] = None) -> Optional[Tuple[PlayerSnapshot, Dict[str, slice]]]:
+    """
+    Map a snapshot file read-only. The numeric arrays are views straight into
+    the mapping, so every process that maps the same file shares one copy in
+    the page cache. Returns None if the file is missing, unreadable or for
+    another data version.
+    """
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):  # ValueError: empty file
+        return None
+
+    try:
+        prefix = len(SNAPSHOT_MAGIC) + 8
+        if buffer[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError("not a snapshot file")
+        (header_len,) = struct.unpack("<Q", buffer[len(SNAPSHOT_MAGIC):prefix])
+        header = json.loads(buffer[prefix:prefix + header_len])
+        if header["format"] != SNAPSHOT_FORMAT:
+            raise ValueError(f"format {header['format']}")
+        if version is not None and header["version"] != version:
+            return None
+
+        data_start = _aligned(prefix + header_len)
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            shape = tuple(spec["shape"])
+            count = int(np.prod(shape))
+            arrays[name] = np.frombuffer(buffer, dtype=np.dtype(spec["dtype"]), count=count,
+                                         offset=data_start + spec["offset"]).reshape(shape)
+    except (ValueError, KeyError, struct.error) as e:
+        logger.warning(f"Ignoring snapshot file {path}: {e}")
+        return None
+
+    snapshot = PlayerSnapshot(
+        player_ids=arrays["player_ids"],
+        features=arrays["features"],
+        columns=header["columns"],
+        codes={name[len("codes/"):]: array for name, array in arrays.items() if name.startswith("codes/")},
+        categories={field: np.asarray(values, dtype=object) for field, values in header["categories"].items()},
+    )
+    slices = {group: slice(start, stop) for group, (start, stop) in header["slices"].items()}
+    return snapshot, slices
+
+
+def remove_stale(directory: str, keep: str):
+    """Delete snapshot files for other data versions (processes mapping them keep their copy)"""
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.startswith("snapshot-") and name.endswith(".bin") and path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,160 @@
+import contextvars
+import functools
+import json
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Timings of the request being handled; None outside a request or when timing is off
+_current: contextvars.ContextVar[Optional["RequestTimings"]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+class RequestTimings:
+    """Per-request span durations, summed by name (e.g. every db query of a request)"""
+    __slots__ = ("start", "spans")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans: Dict[str, List[float]] = {}  # name -> [total ms, count]
+
+    def add(self, name: str, duration_ms: float):
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = [duration_ms, 1]
+        else:
+            entry[0] += duration_ms
+            entry[1] += 1
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def header(self) -> str:
+        """Server-Timing value - one metric per span name plus the total so far"""
+        metrics = []
+        for name, (duration, count) in self.spans.items():
+            metric = f"{name};dur={duration:.1f}"
+            if count > 1:
+                metric += f';desc="{count} calls"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(metrics)
+
+
+class _Span:
+    __slots__ = ("timings", "name", "start")
+
+    def __init__(self, timings: RequestTimings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timings.add(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """
+    Time a block into the current request's Server-Timing:
+
+        with span("score"):
+            ...
+
+    Outside a request (warm-up, background jobs) or with SERVER_TIMING off
+    this is a context-variable read and a shared no-op object.
+    """
+    timings = _current.get()
+    if timings is None:
+        return _NO_SPAN
+    return _Span(timings, name)
+
+
+def timed(name: str) -> Callable:
+    """Decorator form of span() for a whole function"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.add(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
+
+
+class TimingMiddleware:
+    """
+    Collects span() timings for each HTTP request, adds them as a
+    Server-Timing header and logs one JSON line per request slower than
+    TIMING_LOG_THRESHOLD_MS (negative: no logs).
+
+    The header goes out with the response start, so for streamed responses
+    "total" is the time to first byte; the log has the full duration.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._log(scope, status, timings)
+
+    def _log(self, scope: Scope, status: int, timings: RequestTimings):
+        threshold = settings.TIMING_LOG_THRESHOLD_MS
+        total = timings.elapsed_ms()
+        if threshold < 0 or total < threshold:
+            return
+        logger.info(json.dumps({
+            "event": "request_timing",
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status,
+            "total_ms": round(total, 1),
+            "spans": {name: {"ms": round(duration, 1), "count": count}
+                      for name, (duration, count) in timings.spans.items()},
+        }))
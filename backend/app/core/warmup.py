@@ -0,0 +1,57 @@
+import logging
+import time
+from typing import Dict
+from app.core.analyzers import get_feature_store, get_analyzer, get_pca_service
+
+logger = logging.getLogger(__name__)
+
+# Readiness state reported by /ready
+readiness: Dict = {
+    "status": "cold",  # cold -> warming -> ready | failed
+    "snapshot_loaded": False,
+    "pca_ready": False,
+    "duration_s": None,
+    "error": None,
+    "attempts": 0,
+}
+
+def is_ready() -> bool:
+    return readiness["snapshot_loaded"]
+
+def warm_up():
+    """Build the feature snapshot and per-position analyzers (blocking - run in a thread)"""
+    readiness["status"] = "warming"
+    readiness["attempts"] += 1
+    start = time.monotonic()
+    
+    try:
+        store = get_feature_store()
+        for position in store.positions:
+            get_analyzer(position)
+        readiness["snapshot_loaded"] = True
+        logger.info(f"Analyzer snapshot ready in {time.monotonic() - start:.1f}s")
+        
+        readiness["status"] = "ready"
+        readiness["error"] = None
+    except Exception as e:
+        logger.error(f"Analyzer warm-up failed: {e}")
+        readiness["error"] = str(e)
+        readiness["status"] = "failed"
+    finally:
+        readiness["duration_s"] = round(time.monotonic() - start, 2)
+
+async def warm_up_pca():
+    """
+    Default PCA map for the current data version, computed through the PCA compute
+    service's bounded pool (which then precomputes every k in the background)
+    """
+    try:
+        await get_pca_service().get_pca()
+        readiness["pca_ready"] = True
+    except Exception as e:
+        logger.error(f"PCA warm-up failed: {e}")
+        readiness["error"] = str(e)
+
+def warm_up_failed() -> bool:
+    """The last warm-up could not load the snapshot (e.g. the database was down)"""
+    return readiness["status"] == "failed"
@@ -1,13 +1,80 @@
+import asyncio
+import logging
 from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+from app.core.config import settings
 from app.core.init_db import init_database
+from app.core.warmup import warm_up, warm_up_failed, warm_up_pca, is_ready, readiness
+from app.core.analyzers import (
+    peek_pca_analyzer, shutdown_pca_service, start_version_watcher, stop_version_watcher
+)
+from app.core.jobs import shutdown_job_manager
+from app.core.compression import CompressionMiddleware
+from app.core.timing import TimingMiddleware
+
+def configure_logging():
+    """
+    Send app.* logs (timing lines, cache and reload warnings) to stderr at LOG_LEVEL.
+    uvicorn only configures its own loggers, so without this INFO lines are dropped.
+    If the root logger already has handlers (e.g. a --log-config), they are used instead.
+    """
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.LOG_LEVEL)
+    if not app_logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+        app_logger.addHandler(handler)
+        app_logger.propagate = False
+
+configure_logging()
+
+async def finish_warm_up():
+    """
+    Retry a failed snapshot load every WARMUP_RETRY_INTERVAL seconds until it works,
+    then build the default PCA map
+    """
+    while warm_up_failed() and settings.WARMUP_RETRY_INTERVAL > 0:
+        await asyncio.sleep(settings.WARMUP_RETRY_INTERVAL)
+        await asyncio.to_thread(warm_up)
+    if not warm_up_failed():
+        await warm_up_pca()
+
+async def background_warm_up():
+    await asyncio.to_thread(warm_up)
+    await finish_warm_up()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     init_database()
+
+    # Build analyzer snapshot + default PCA so the first request isn't cold
+    warmup_task = None
+    if settings.ANALYZER_WARMUP == "blocking":
+        await asyncio.to_thread(warm_up)
+        if warm_up_failed():
+            warmup_task = asyncio.create_task(finish_warm_up())
+        else:
+            await warm_up_pca()
+    elif settings.ANALYZER_WARMUP == "background":
+        warmup_task = asyncio.create_task(background_warm_up())
+    else:
+        # Lazy mode: analyzers load on first request, so report ready straight away
+        readiness["status"] = "lazy"
+        readiness["snapshot_loaded"] = True
+
+    # Pick up re-run percentile precomputes without a restart
+    start_version_watcher(settings.DATA_VERSION_CHECK_INTERVAL)
+
     yield
     # Shutdown
+    stop_version_watcher()
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    shutdown_pca_service()
+    shutdown_job_manager()
 
 app = FastAPI(
     title="LENS Player Profiler API",
@@ -17,7 +84,7 @@ app = FastAPI(
 )
 
 # Import here to avoid circular imports
-from app.api import forwards, algorithms, stats
+from app.api import forwards, algorithms, stats, jobs, positions
 
 # Configure CORS
 app.add_middleware(
@@ -28,11 +95,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip (plus Brotli / zstd when installed) for the large JSON responses
+app.add_middleware(CompressionMiddleware)
+
+# Outermost, so Server-Timing "total" includes compression
+if settings.SERVER_TIMING:
+    app.add_middleware(TimingMiddleware)
+
 
 # Include routers
 app.include_router(forwards.router, prefix="/api/forwards", tags=["forwards"])
 app.include_router(algorithms.router, prefix="/api/algorithms", tags=["algorithms"])
 app.include_router(stats.router, prefix="/api/stats", tags=["stats"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+# Generic /api/{position}/... routes go last so the fixed prefixes above win
+app.include_router(positions.router, prefix="/api", tags=["positions"])
 
 
 
@@ -44,7 +121,14 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
-# Add after creating the app
-@app.on_event("startup")
-async def startup_event():
-    init_database()
\ No newline at end of file
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe - 503 until the analyzer snapshot is loaded (status "failed" plus
+    the error while a failed warm-up waits for its retry). Only reads existing state,
+    so it answers immediately even while the snapshot is loading.
+    """
+    pca_analyzer = peek_pca_analyzer()
+    content = {**readiness,
+               "pca_precompute": pca_analyzer.precompute_status if pca_analyzer is not None else None}
+    return JSONResponse(status_code=200 if is_ready() else 503, content=content)
@@ -7,11 +7,21 @@ class MetricWeight(BaseModel):
     metric: str
     weight: float  # 0-100 from slider
 
+class RecommendationFilters(BaseModel):
+    """Optional constraints applied before scoring"""
+    min_90s: Optional[float] = None
+    min_goals: Optional[float] = None
+    min_age: Optional[int] = None
+    max_age: Optional[int] = None
+    teams: Optional[List[str]] = None
+    leagues: Optional[List[str]] = None
+
 class RecommendationRequest(BaseModel):
     """Request body for player recommendations"""
     weights: List[MetricWeight]
     algorithm: str = "weighted_score"
     limit: int = 10
+    filters: Optional[RecommendationFilters] = None
 
 class PlayerRecommendation(BaseModel):
     """Single player recommendation"""
@@ -23,12 +33,29 @@ class PlayerRecommendation(BaseModel):
     key_stats: Dict[str, float]
     percentile_ranks: Dict[str, float]
     image_url: Optional[str] = None  # ADD THIS LINE
+    pareto_front: Optional[int] = None  # Front layer when ranked with "pareto"
 
 class RecommendationResponse(BaseModel):
     """Response with top player recommendations"""
     algorithm_used: str
     recommendations: List[PlayerRecommendation]
 
+class SimilarPlayer(BaseModel):
+    """Single neighbour in a similarity search"""
+    player_id: int
+    name: str
+    team: str
+    position: str
+    distance: float
+    similarity: float
+
+class SimilarPlayersResponse(BaseModel):
+    """Players most similar to a reference player"""
+    player_id: int
+    name: str
+    metric: str
+    similar: List[SimilarPlayer]
+
 class PCAPoint(BaseModel):
     """Single point for PCA visualization"""
     player_id: int
@@ -37,6 +64,7 @@ class PCAPoint(BaseModel):
     x: float
     y: float
     cluster: Optional[str] = None
+    cluster_id: Optional[int] = None
 
 class ClusterCenter(BaseModel):
     """Cluster center information"""
@@ -46,12 +74,73 @@ class ClusterCenter(BaseModel):
     y: float
     count: int
 
+class PCAProjectionRequest(BaseModel):
+    """Players to place on the existing PCA map without refitting it"""
+    player_ids: List[int]
+    k: Optional[int] = None
+
+class PCAProjectionResponse(BaseModel):
+    """Projected players and the clustering they were assigned in"""
+    k: int
+    points: List[PCAPoint]
+    missing: List[int]  # requested ids that are not forwards with percentiles
+
+class PCACell(BaseModel):
+    """Aggregated grid/hexagon cell for zoomed-out PCA views"""
+    x: float
+    y: float
+    count: int
+    cluster: str  # dominant cluster in the cell
+    cluster_id: int
+
+class PCAColumns(BaseModel):
+    """PCA points as parallel arrays (layout=columns) - index i is one player"""
+    player_id: List[int]
+    name: List[str]
+    team: List[str]
+    x: List[float]
+    y: List[float]
+    cluster_id: List[int]  # label is "Group {cluster_id + 1}"
+
 class PCAResponse(BaseModel):
     """PCA data for visualization"""
     points: List[PCAPoint]
+    columns: Optional[PCAColumns] = None  # filled instead of points when layout=columns
     explained_variance: List[float]
     pc_interpretation: Dict[str, str]
     cluster_centers: List[ClusterCenter]
+    lod: Optional[str] = None  # "grid" or "hex" when cells are returned
+    cell_size: Optional[float] = None
+    cells: Optional[List[PCACell]] = None
+
+class PercentilesBatchRequest(BaseModel):
+    """Players whose percentiles to fetch in one call (e.g. a radar comparison)"""
+    position: str = "forward"
+    player_ids: List[int]
+
+class PercentilesBatchResponse(BaseModel):
+    """Metric ids and raw `*_pct` columns -> percentile, per requested player"""
+    position: str
+    players: Dict[int, Dict[str, float]]
+    missing: List[int]  # requested ids with no percentiles for this position
+
+class JobRequest(BaseModel):
+    """Submit a long-running analysis to /api/jobs"""
+    type: str  # "pca" or "recommend"
+    k: Optional[int] = None  # pca: clusters (optimal when omitted)
+    position: str = "forward"  # recommend: position group
+    requests: List[RecommendationRequest] = []  # recommend: scored as one batch
+
+class JobStatus(BaseModel):
+    """State of a submitted job (timestamps are unix seconds)"""
+    job_id: str
+    type: str
+    status: str  # queued, running, done or failed
+    progress: float
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
 
 class Algorithm(BaseModel):
     """Algorithm description"""
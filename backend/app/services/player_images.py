@@ -6,6 +6,12 @@ from urllib.parse import quote
 import hashlib
 import json
 from datetime import datetime, timedelta
+from app.core.cache import ResultCache
+from app.core.timing import timed
+
+class ImageLookupError(Exception):
+    """The image search failed (HTTP error, quota, network) - as opposed to finding nothing"""
+
 
 class PlayerImageService:
     def __init__(self):
@@ -13,6 +19,9 @@ class PlayerImageService:
         self.cx = os.getenv('GOOGLE_CX')  # Custom Search Engine ID
         self.cache_dir = 'backend/cache/player_images'
         self.cache_duration = timedelta(days=30)  # Cache for 30 days
+        # The per-player JSON files in cache_dir are the durable store; the shared result
+        # cache (CACHE_BACKEND) sits in front so workers/instances skip the file read
+        self.cache = ResultCache("images", ttl=int(self.cache_duration.total_seconds()))
         
         # Create cache directory if it doesn't exist
         os.makedirs(self.cache_dir, exist_ok=True)
@@ -21,8 +30,12 @@ class PlayerImageService:
         """Generate cache key for player"""
         return hashlib.md5(f"{player_name}_{team}".encode()).hexdigest()
     
-    def _get_cached_image(self, cache_key: str) -> Optional[str]:
-        """Check if we have a cached image URL"""
+    def _get_cached_image(self, cache_key: str, refill: bool = True) -> Optional[str]:
+        """Check if we have a cached image URL (refill: copy a file entry into the shared cache)"""
+        cached = self.cache.get(None, {"player": cache_key})
+        if cached is not None:
+            return cached["image_url"]
+        
         cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
         
         if os.path.exists(cache_file):
@@ -32,13 +45,30 @@ class PlayerImageService:
                     
                 # Check if cache is still valid
                 cached_time = datetime.fromisoformat(cache_data['timestamp'])
-                if datetime.now() - cached_time < self.cache_duration:
+                remaining = self.cache_duration - (datetime.now() - cached_time)
+                if remaining > timedelta(0):
+                    # Shared copy expires with the file entry, not a fresh 30 days from now
+                    ttl = int(remaining.total_seconds())
+                    if refill and ttl > 0:
+                        self.cache.set(None, {"player": cache_key}, {"image_url": cache_data['image_url']}, ttl=ttl)
                     return cache_data['image_url']
             except:
                 pass
                 
         return None
     
+    def get_cached_image(self, player_name: str, team: str) -> Optional[str]:
+        """Return the cached image URL for a player, or None if missing/expired"""
+        return self._get_cached_image(self._get_cache_key(player_name, team))
+
+    def has_cached_image(self, player_name: str, team: str) -> bool:
+        """Whether a valid cached image URL exists - read-only, nothing is written to the caches"""
+        return self._get_cached_image(self._get_cache_key(player_name, team), refill=False) is not None
+
+    def is_configured(self) -> bool:
+        """Whether Google Custom Search credentials are available"""
+        return bool(self.api_key and self.cx)
+
     def _save_to_cache(self, cache_key: str, image_url: str):
         """Save image URL to cache"""
         cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
@@ -49,11 +79,15 @@ class PlayerImageService:
         
         with open(cache_file, 'w') as f:
             json.dump(cache_data, f)
+        self.cache.set(None, {"player": cache_key}, {"image_url": image_url})
     
-    def search_player_image(self, player_name: str, team: str) -> Optional[str]:
+    @timed("image_lookup")
+    def search_player_image(self, player_name: str, team: str, raise_errors: bool = False) -> Optional[str]:
         """
         Search for player image using Google Custom Search API
-        Returns the first suitable image URL or None
+        Returns the first suitable image URL or None. With raise_errors, a failed
+        lookup raises ImageLookupError instead of also returning None, so callers
+        that record "no image" (the warm job) can tell the two apart.
         """
         # Check cache first
         cache_key = self._get_cache_key(player_name, team)
@@ -62,6 +96,8 @@ class PlayerImageService:
             return cached_url
         
         if not self.api_key or not self.cx:
+            if raise_errors:
+                raise ImageLookupError("Google API credentials not configured")
             print("Google API credentials not configured")
             return None
             
@@ -97,9 +133,13 @@ class PlayerImageService:
                             return image_url
                             
             else:
-                print(f"API Error: {response.status_code}")
+                raise ImageLookupError(f"API Error: {response.status_code}")
                 
         except Exception as e:
+            if raise_errors:
+                if isinstance(e, ImageLookupError):
+                    raise
+                raise ImageLookupError(str(e)) from e
             print(f"Error fetching player image: {e}")
             
         return None
@@ -0,0 +1,133 @@
+"""
+Benchmark response serialization for the large endpoints
+Compares the default FastAPI path (response_model validation + stdlib json)
+with FastJSONResponse (orjson, no re-validation) for /pca-data and /recommend
+shaped payloads
+"""
+import sys
+import os
+
+# Add parent directory to path so we can import app modules
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+import argparse
+import json
+import time
+import numpy as np
+from app.core import serialization
+from app.core.config import settings
+from app.models.schemas import PCAResponse, RecommendationResponse
+
+# Optional PCAResponse fields, as /pca-data sends them without lod/layout
+NO_LOD = {"columns": None, "lod": None, "cell_size": None, "cells": None}
+
+
+def synthetic_pca(n_points: int, k: int = 5) -> dict:
+    """A /pca-data body with n_points forwards"""
+    rng = np.random.default_rng(0)
+    coords = rng.normal(size=(n_points, 2))
+    clusters = rng.integers(0, k, n_points)
+    return {
+        "points": [
+            {
+                "player_id": i + 1,
+                "name": f"Player {i + 1}",
+                "team": f"Team {i % 20}",
+                "x": float(coords[i, 0]),
+                "y": float(coords[i, 1]),
+                "cluster": f"Group {clusters[i] + 1}",
+                "cluster_id": int(clusters[i])
+            }
+            for i in range(n_points)
+        ],
+        "explained_variance": [0.41, 0.17],
+        "pc_interpretation": {"PC1": "Goal Threat", "PC2": "Creativity"},
+        "cluster_centers": [
+            {"cluster_id": c, "label": f"Group {c + 1}", "x": 0.0, "y": 0.0, "count": int((clusters == c).sum())}
+            for c in range(k)
+        ],
+        **NO_LOD
+    }
+
+
+def synthetic_recommendations(n_players: int) -> dict:
+    """A /recommend body with n_players recommendations"""
+    rng = np.random.default_rng(1)
+    return {
+        "algorithm_used": "weighted_score",
+        "recommendations": [
+            {
+                "player_id": i + 1,
+                "name": f"Player {i + 1}",
+                "team": f"Team {i % 20}",
+                "position": "FW",
+                "match_score": float(rng.random() * 100),
+                "key_stats": {"goals": float(rng.integers(0, 30)), "assists": float(rng.integers(0, 15))},
+                "percentile_ranks": {f"stat_{j}": round(float(rng.random() * 100), 2) for j in range(12)},
+                "image_url": None,
+                "pareto_front": None
+            }
+            for i in range(n_players)
+        ]
+    }
+
+
+def live_pca() -> dict:
+    """The current /pca-data body from the database"""
+    from app.core.analyzers import get_pca_analyzer
+    results = get_pca_analyzer().get_pca()
+    body = {key: results[key] for key in ["points", "explained_variance", "pc_interpretation", "cluster_centers"]}
+    return {**body, **NO_LOD}
+
+
+def default_path(model, payload: dict) -> bytes:
+    """What FastAPI does for a response_model: validate, dump, stdlib JSON"""
+    validated = model.model_validate(payload)
+    return json.dumps(validated.model_dump(mode="json"), ensure_ascii=False,
+                      allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(model, payload: dict) -> bytes:
+    """FastJSONResponse: cached PCA payloads as-is, recommendations validated once"""
+    if model is PCAResponse:
+        return serialization.dumps(payload)
+    return serialization.dumps(model.model_validate(payload).model_dump())
+
+
+def timed(func, model, payload: dict, repeat: int):
+    """Best-of-repeat seconds and the bytes produced"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func(model, payload)
+        best = min(best, time.perf_counter() - start)
+    return best, body
+
+
+def run(n_points: int, repeat: int, live: bool):
+    if serialization.orjson is None or not settings.FAST_JSON:
+        print("orjson is not installed (or FAST_JSON is off) - the fast path falls back to the stdlib encoder")
+
+    cases = [
+        ("pca-data", PCAResponse, live_pca() if live else synthetic_pca(n_points)),
+        ("recommend", RecommendationResponse, synthetic_recommendations(min(n_points, 500))),
+    ]
+
+    print(f"{'payload':<12}{'path':<10}{'ms':>10}{'bytes':>12}{'speedup':>10}")
+    for name, model, payload in cases:
+        base_time, base_body = timed(default_path, model, payload, repeat)
+        fast_time, fast_body = timed(fast_path, model, payload, repeat)
+        assert json.loads(base_body) == json.loads(fast_body), f"{name}: bodies differ"
+        print(f"{name:<12}{'default':<10}{base_time * 1000:>10.2f}{len(base_body):>12}{'':>10}")
+        print(f"{name:<12}{'fast':<10}{fast_time * 1000:>10.2f}{len(fast_body):>12}{base_time / fast_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of large responses")
+    parser.add_argument('--points', type=int, default=5000, help="Synthetic PCA points")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per path (best is reported)")
+    parser.add_argument('--live', action='store_true', help="Use the real PCA map from the database")
+    args = parser.parse_args()
+
+    run(args.points, args.repeat, args.live)
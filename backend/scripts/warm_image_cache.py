@@ -0,0 +1,201 @@
+"""
+Script to warm the player image cache for ALL players
+Run this after scraping new data so the API rarely has to call Google on a request
+"""
+import sys
+import os
+
+# Add parent directory to path so we can import app modules
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+# The image cache path is relative to the backend directory (where uvicorn runs)
+os.chdir(backend_dir)
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.core.database import execute_query
+from app.services.player_images import player_image_service
+
+STATE_FILE = os.path.join('backend', 'cache', 'image_warm_state.json')
+
+
+class RateLimiter:
+    """Spaces out calls across threads to at most `rate` per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def load_state(restart: bool) -> dict:
+    """Load the resume checkpoint (last processed player id, known misses, failed lookups)"""
+    if not restart and os.path.exists(STATE_FILE):
+        try:
+            with open(STATE_FILE, 'r') as f:
+                return json.load(f)
+        except Exception:
+            print("Could not read checkpoint, starting from scratch")
+    return {'last_player_id': 0, 'misses': [], 'errors': []}
+
+
+def save_state(state: dict):
+    """Write the checkpoint atomically so an interrupted run can resume"""
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    tmp_file = f"{STATE_FILE}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_file, STATE_FILE)
+
+
+def resolve_image(player: dict, limiter: RateLimiter) -> str:
+    """Resolve a single player's image, returning 'cached', 'resolved', 'miss' or 'error'"""
+    if player_image_service.get_cached_image(player['name'], player['team']):
+        return 'cached'
+
+    limiter.wait()
+    try:
+        # Failures (quota, HTTP errors) raise - only a successful empty search is a miss
+        image_url = player_image_service.search_player_image(player['name'], player['team'],
+                                                             raise_errors=True)
+    except Exception as e:
+        print(f"\n  Error resolving {player['name']}: {e}")
+        return 'error'
+
+    return 'resolved' if image_url else 'miss'
+
+
+def warm_image_cache(concurrency: int = 4, rate: float = 2.0, batch_size: int = 50,
+                     limit: int = None, restart: bool = False, retry_misses: bool = False):
+    """Walk every player and resolve missing or expired image URLs"""
+
+    if not player_image_service.is_configured():
+        print("Google API credentials not configured (GOOGLE_API_KEY / GOOGLE_CX)")
+        return
+
+    state = load_state(restart)
+    known_misses = set() if retry_misses else set(state.get('misses', []))
+    errors = set(state.get('errors', []))
+
+    query = """
+    SELECT p.id as player_id, p.name, p.team
+    FROM football_data.players p
+    ORDER BY p.id
+    """
+    players = execute_query(query)
+    players['team'] = players['team'].fillna('Unknown')
+    # Rest of the current pass, plus players whose lookup failed on an earlier run
+    players = players[(players['player_id'] > state['last_player_id']) | players['player_id'].isin(errors)]
+    players = players[~players['player_id'].isin(known_misses)]
+    full_pass = not limit or limit >= len(players)
+    if limit:
+        players = players.head(limit)
+
+    total = len(players)
+    if state['last_player_id']:
+        print(f"Resuming after player id {state['last_player_id']}"
+              + (f" (retrying {len(errors)} failed lookups)" if errors else ""))
+    print(f"Warming image cache for {total} players "
+          f"({concurrency} workers, {rate}/s rate limit)...")
+
+    counts = {'cached': 0, 'resolved': 0, 'miss': 0, 'error': 0}
+    misses = set(state.get('misses', []))
+    limiter = RateLimiter(rate)
+    records = players.to_dict('records')
+    start = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for batch_start in range(0, total, batch_size):
+            batch = records[batch_start:batch_start + batch_size]
+            outcomes = list(executor.map(lambda p: resolve_image(p, limiter), batch))
+
+            for player, outcome in zip(batch, outcomes):
+                counts[outcome] += 1
+                player_id = int(player['player_id'])
+                if outcome == 'error':
+                    errors.add(player_id)
+                    continue
+                errors.discard(player_id)
+                if outcome == 'miss':
+                    misses.add(player_id)
+                else:
+                    misses.discard(player_id)
+
+            # Failed lookups are kept in 'errors' and retried first on the next run,
+            # so one failure does not hold the checkpoint back for the rest of the run
+            state['last_player_id'] = max(state['last_player_id'], int(batch[-1]['player_id']))
+            state['misses'] = sorted(misses)
+            state['errors'] = sorted(errors)
+            save_state(state)
+
+            done = batch_start + len(batch)
+            elapsed = time.monotonic() - start
+            lookups = done - counts['cached']
+            print(f"  Processed {done}/{total} players "
+                  f"({lookups / elapsed if elapsed > 0 else 0:.2f} lookups/s)...", end='\r')
+
+    # Pass finished - the next run starts over, so entries that expired since are refreshed
+    if full_pass:
+        state['last_player_id'] = 0
+        save_state(state)
+
+    elapsed = time.monotonic() - start
+    lookups = counts['resolved'] + counts['miss'] + counts['error']
+
+    # Coverage over the whole player universe, not just this run (read-only check)
+    universe = execute_query("SELECT p.name, p.team FROM football_data.players p")
+    universe['team'] = universe['team'].fillna('Unknown')
+    covered = sum(
+        1 for name, team in zip(universe['name'], universe['team'])
+        if player_image_service.has_cached_image(name, team)
+    )
+
+    print("\n\n📊 Image cache warm-up summary:")
+    print(f"  Already cached: {counts['cached']}")
+    print(f"  Resolved:       {counts['resolved']}")
+    print(f"  No result:      {counts['miss']}")
+    print(f"  Errors:         {counts['error']}")
+    print(f"  Throughput:     {lookups / elapsed if elapsed > 0 else 0:.2f} lookups/s "
+          f"({total / elapsed if elapsed > 0 else 0:.1f} players/s) in {elapsed:.1f}s")
+    if len(universe):
+        print(f"  Coverage:       {covered}/{len(universe)} players "
+              f"({covered / len(universe) * 100:.1f}%)")
+
+    if counts['error'] == 0 and total > 0:
+        print("\n✅ Image cache warm-up complete!")
+    elif counts['error']:
+        print("\n⚠️  Some lookups failed - run again to retry them")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm the player image cache")
+    parser.add_argument('--concurrency', type=int, default=4, help="Concurrent lookups")
+    parser.add_argument('--rate', type=float, default=2.0, help="Max API calls per second")
+    parser.add_argument('--batch-size', type=int, default=50, help="Players per checkpoint")
+    parser.add_argument('--limit', type=int, default=None, help="Stop after N players")
+    parser.add_argument('--restart', action='store_true', help="Ignore the saved checkpoint")
+    parser.add_argument('--retry-misses', action='store_true',
+                        help="Retry players that previously returned no image")
+    args = parser.parse_args()
+
+    warm_image_cache(
+        concurrency=args.concurrency,
+        rate=args.rate,
+        batch_size=args.batch_size,
+        limit=args.limit,
+        restart=args.restart,
+        retry_misses=args.retry_misses
+    )
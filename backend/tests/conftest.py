@@ -0,0 +1,92 @@
+import datetime
+import json
+import os
+
+# No warm-up, database, worker processes or files on disk - set before app.core.config is imported
+os.environ.setdefault("ANALYZER_WARMUP", "off")
+os.environ.setdefault("CACHE_BACKEND", "memory")
+os.environ.setdefault("SNAPSHOT_DIR", "")
+os.environ.setdefault("PCA_WORKER_PROCESSES", "0")
+os.environ.setdefault("PCA_PRECOMPUTE_ALL_K", "false")
+os.environ.setdefault("DATA_VERSION_CHECK_INTERVAL", "0")
+
+import numpy as np
+import pandas as pd
+import pytest
+from app.core import analyzers, cache, feature_store
+from app.core.metrics import POSITION_METRICS, RADAR_PERCENTILES
+from app.core.pca_analysis import PCA_FEATURE_COLUMNS
+
+GROUP_SIZES = {"forward": 120, "midfielder": 80, "defender": 80, "goalkeeper": 20}
+POSITION_CODES = {"forward": "FW", "midfielder": "MF", "defender": "DF", "goalkeeper": "GK"}
+PERCENTILE_KEYS = sorted(
+    {col for metrics in POSITION_METRICS.values() for metric in metrics.values() for col in metric["columns"]}
+    | {col[:-len("_pct")] for cols in RADAR_PERCENTILES.values() for col in cols}
+    | {col[:-len("_pct")] for col in PCA_FEATURE_COLUMNS}
+)
+
+
+def make_players(seed: int = 0) -> pd.DataFrame:
+    """Rows shaped like the feature store query: correlated percentiles, a few gaps"""
+    rng = np.random.default_rng(seed)
+    rows, player_id = [], 1
+    for group, size in GROUP_SIZES.items():
+        styles = rng.normal(size=(size, 3))
+        for i in range(size):
+            percentiles = {
+                key: None if rng.random() < 0.03
+                else round(float(np.clip(50 + 25 * styles[i, j % 3] + rng.normal(0, 10), 0, 100)), 2)
+                for j, key in enumerate(PERCENTILE_KEYS)
+            }
+            rows.append({
+                "player_id": player_id,
+                "name": f"{group.title()} {player_id}",
+                "team": f"Team {player_id % 12}" if rng.random() > 0.05 else None,
+                "position": POSITION_CODES[group],
+                "age": int(rng.integers(17, 38)) if rng.random() > 0.05 else None,
+                "league": ["Premier League", "La Liga", "Serie A"][player_id % 3],
+                "position_group": group,
+                "percentiles": json.dumps(percentiles),
+                "performance_gls": str(int(rng.integers(0, 30))),
+                "performance_ast": str(int(rng.integers(0, 15))),
+                "expected_xg": str(round(float(rng.random()) * 20, 1)),
+                "playing_time_90s": str(round(float(rng.random()) * 38, 1)),
+                "standard_sh": str(int(rng.integers(0, 100))),
+                "touches_att_pen": str(int(rng.integers(0, 200))),
+                "computed_at": datetime.datetime(2025, 1, 1),
+            })
+            player_id += 1
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope="session")
+def players() -> pd.DataFrame:
+    return make_players()
+
+
+@pytest.fixture
+def fake_db(monkeypatch, players):
+    """
+    Serve the feature store's queries from `players` and start from an empty
+    analyzer registry and result cache. Returns the frame.
+    """
+    def execute_query(query, params=None):
+        if "COUNT(*)" in query:
+            return pd.DataFrame({"n": [len(players)], "last_computed": [players["computed_at"].max()]})
+        return players.drop(columns=["computed_at"])
+
+    monkeypatch.setattr(feature_store, "execute_query", execute_query)
+    monkeypatch.setattr(analyzers, "_feature_store", None)
+    monkeypatch.setattr(analyzers, "_analyzers", {})
+    monkeypatch.setattr(analyzers, "_pca_analyzer", None)
+    monkeypatch.setattr(analyzers, "_pca_service", None)
+    monkeypatch.setattr(cache, "_backend", cache.MemoryCacheBackend())
+    return players
+
+
+@pytest.fixture
+def client(fake_db):
+    """API client without the lifespan (no database init, warm-up or watcher)"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from app.core.cache import MemoryCacheBackend, ResultCache, _COMPRESSED, _MAGIC, pack, unpack
+
+
+def assert_same(restored, original):
+    """Equal structure, with arrays matching in dtype, shape and values"""
+    if isinstance(original, np.ndarray):
+        assert isinstance(restored, np.ndarray)
+        assert restored.dtype == original.dtype
+        assert restored.shape == original.shape
+        np.testing.assert_array_equal(restored, original)
+    elif isinstance(original, dict):
+        assert restored.keys() == original.keys()
+        for key in original:
+            assert_same(restored[key], original[key])
+    elif isinstance(original, (list, tuple)):
+        assert len(restored) == len(original)
+        for r, o in zip(restored, original):
+            assert_same(r, o)
+    else:
+        assert restored == original
+
+
+@pytest.mark.parametrize("array", [
+    np.array([], dtype=np.float32),
+    np.empty((0, 3), dtype=np.float64),
+    np.empty((4, 0), dtype=np.int32),
+    np.array(3.5),
+    np.arange(6, dtype=np.int64).reshape(2, 3),
+    np.arange(24, dtype=np.float32).reshape(2, 3, 4),
+    np.array([[1.0, np.nan], [np.inf, -0.0]]),
+    np.array([True, False, True]),
+    np.arange(12, dtype=np.uint8).reshape(3, 4).T,  # non-contiguous
+])
+def test_array_round_trip(array):
+    assert_same(unpack(pack({"a": array})), {"a": array})
+
+
+def test_nested_values_round_trip():
+    value = {
+        "optimal_k": 4,
+        "name": "forwards",
+        "missing": None,
+        "explained": [0.5, 0.25],
+        "centroids": {"4": np.ones((4, 2), dtype=np.float32)},
+        "columns": {"x": np.arange(3, dtype=np.float32), "team": ["A", None, "B"]},
+        "pairs": [np.zeros(2), [np.ones(1), 1]],
+    }
+    assert_same(unpack(pack(value)), value)
+
+
+def test_tuples_come_back_as_lists():
+    assert unpack(pack({"t": (1, 2)})) == {"t": [1, 2]}
+
+
+def test_large_payload_is_compressed():
+    value = {"features": np.zeros((100, 50), dtype=np.float32)}
+    data = pack(value)
+
+    assert data[len(_MAGIC)] & _COMPRESSED
+    assert len(data) < value["features"].nbytes
+    assert_same(unpack(data), value)
+
+
+def test_small_payload_is_not_compressed():
+    data = pack({"k": 3})
+
+    assert not data[len(_MAGIC)] & _COMPRESSED
+    assert unpack(data) == {"k": 3}
+
+
+def test_restored_arrays_are_read_only():
+    restored = unpack(pack({"a": np.arange(3.0)}))["a"]
+
+    with pytest.raises(ValueError):
+        restored[0] = 1.0
+
+
+def test_unpack_rejects_other_data():
+    with pytest.raises(ValueError):
+        unpack(b'{"json": true}')
+
+
+def test_result_cache_treats_corrupt_entries_as_misses(monkeypatch):
+    backend = MemoryCacheBackend()
+    monkeypatch.setattr("app.core.cache._backend", backend)
+    cache = ResultCache("test", ttl=60)
+
+    cache.set("v1", {"k": 1}, {"a": np.arange(3)})
+    assert_same(cache.get("v1", {"k": 1}), {"a": np.arange(3)})
+    assert cache.get("v2", {"k": 1}) is None  # other data version
+
+    backend.set(cache.key("v1", {"k": 1}), _MAGIC + bytes([_COMPRESSED]) + b"not zlib")
+    assert cache.get("v1", {"k": 1}) is None
@@ -0,0 +1,162 @@
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app.core import compression
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+BODY = {"points": [{"id": i, "name": f"Player {i}", "x": i / 10} for i in range(200)]}
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+@pytest.fixture
+def middleware():
+    inner = FastAPI()
+
+    @inner.get("/tagged")
+    def tagged(version: str = "1"):
+        return JSONResponse(BODY, headers={"ETag": f'W/"v{version}"'})
+
+    @inner.get("/strong")
+    def strong():
+        return JSONResponse(BODY, headers={"ETag": '"strong"'})
+
+    @inner.get("/untagged")
+    def untagged():
+        return JSONResponse(BODY)
+
+    @inner.get("/failed")
+    def failed():
+        return JSONResponse({"detail": "x" * 2000}, status_code=500, headers={"ETag": 'W/"v1"'})
+
+    @inner.get("/small")
+    def small():
+        return JSONResponse({"ok": True}, headers={"ETag": 'W/"small"'})
+
+    @inner.get("/binary")
+    def binary():
+        return Response(b"\x00" * 4096, media_type="application/octet-stream")
+
+    @inner.get("/stream")
+    def stream():
+        return StreamingResponse((json.dumps(row) + "\n" for row in BODY["points"]),
+                                 media_type="application/x-ndjson")
+
+    return CompressionMiddleware(inner, minimum_size=256, cache_entries=4)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Number of whole-body compressions"""
+    counter = {"n": 0}
+    original = compression.compress
+
+    def counting(body, encoding):
+        counter["n"] += 1
+        return original(body, encoding)
+    monkeypatch.setattr(compression, "compress", counting)
+    return counter
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("br, gzip;q=0.5", "gzip"),
+    ("gzip;q=0", None),
+    ("*", "gzip"),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header, ["gzip"]) == expected
+    assert choose_encoding(header, []) is None
+
+
+def test_optional_encodings_need_their_library():
+    offered = compression.available_encodings()
+    assert "gzip" in offered
+    assert ("br" in offered) == (compression.brotli is not None)
+    assert ("zstd" in offered) == (compression.zstandard is not None)
+
+
+def test_gzip(middleware, calls):
+    response = TestClient(middleware).get("/tagged", headers=GZIP)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(json.dumps(BODY))
+    assert response.json() == BODY
+    assert calls["n"] == 1
+
+
+def test_cache_is_keyed_by_etag_and_encoding(middleware, calls):
+    client = TestClient(middleware)
+    first = client.get("/tagged", headers=GZIP)
+    second = client.get("/tagged", headers=GZIP)
+    assert calls["n"] == 1
+    assert middleware.cache.hits == 1
+    assert second.content == first.content and second.headers["etag"] == first.headers["etag"]
+    assert ('W/"v1"', "gzip") in middleware.cache._entries
+
+    # A new data version is a new key
+    client.get("/tagged", params={"version": "2"}, headers=GZIP)
+    assert calls["n"] == 2
+    assert set(middleware.cache._entries) == {('W/"v1"', "gzip"), ('W/"v2"', "gzip")}
+
+    # Untagged bodies are compressed every time
+    client.get("/untagged", headers=GZIP)
+    client.get("/untagged", headers=GZIP)
+    assert calls["n"] == 4
+    assert len(middleware.cache._entries) == 2
+
+
+def test_strong_etag_becomes_weak(middleware):
+    response = TestClient(middleware).get("/strong", headers=GZIP)
+    assert response.headers["etag"] == 'W/"strong"'
+    # The cache keys on the application's tag, before it is weakened
+    assert ('"strong"', "gzip") in middleware.cache._entries
+
+
+def test_errors_are_not_cached(middleware, calls):
+    client = TestClient(middleware)
+    for _ in range(2):
+        response = client.get("/failed", headers=GZIP)
+        assert response.status_code == 500
+        assert response.headers["content-encoding"] == "gzip"
+    assert calls["n"] == 2
+    assert not middleware.cache._entries
+
+    # The success body with the same tag is still compressed from its own bytes
+    assert client.get("/tagged", headers=GZIP).json() == BODY
+
+
+@pytest.mark.parametrize("path", ["/small", "/binary"])
+def test_pass_through(middleware, calls, path):
+    response = TestClient(middleware).get(path, headers=GZIP)
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert calls["n"] == 0
+    assert not middleware.cache._entries
+
+
+def test_no_accepted_encoding(middleware, calls):
+    response = TestClient(middleware).get("/tagged", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == BODY
+    assert calls["n"] == 0
+
+
+def test_streamed_body(middleware, calls):
+    response = TestClient(middleware).get("/stream", headers=GZIP)
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert [json.loads(line) for line in response.text.splitlines()] == BODY["points"]
+    assert calls["n"] == 0
+
+
+def test_app_compresses_data_responses(client):
+    response = client.get("/api/forwards/pca-data", headers=GZIP)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].startswith('W/"')
+    assert response.json()["points"]
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import pytest
+from app.core import compute_pool
+from app.core.analyzers import get_pca_analyzer
+from app.core.compute_pool import ComputeBusy, PCAComputeService
+
+
+@pytest.fixture
+def service(fake_db, monkeypatch):
+    monkeypatch.setattr(compute_pool.settings, "PCA_PRECOMPUTE_ALL_K", True)
+    monkeypatch.setattr(compute_pool, "PRECOMPUTE_BACKOFF_S", 0.01)
+    return PCAComputeService(get_pca_analyzer(), workers=0, max_inflight=2)
+
+
+def run_until_precomputed(service):
+    async def main():
+        result = await service.get_pca()
+        await service._precompute_task
+        return result
+    return asyncio.run(main())
+
+
+def test_default_map_precomputes_every_k_through_the_service(service, monkeypatch):
+    computed = []
+    compute = service._compute
+
+    async def traced(key, shared=True):
+        computed.append(key[2])
+        return await compute(key, shared)
+    monkeypatch.setattr(service, "_compute", traced)
+
+    result = run_until_precomputed(service)
+
+    status = service.analyzer.precompute_status
+    assert status["state"] == "done"
+    assert status["done"] == status["total"] == 10
+    # Every k was clustered by the service (the optimal one is already cached with the default map)
+    assert sorted(computed[1:] + [result["optimal_k"]]) == list(range(2, 11))
+    version, features, _ = service.analyzer.cache_key()
+    for k in range(2, 11):
+        assert service.analyzer.local_pca((version, features, k)) is not None
+    assert not any(thread.name == "pca-precompute" for thread in threading.enumerate())
+
+
+def test_precompute_waits_while_requests_fill_the_pool(service, monkeypatch):
+    busy = {"left": 3}
+    get_pca = service.get_pca
+
+    async def sometimes_busy(custom_k=None, feature_cols=compute_pool.PCA_FEATURE_COLUMNS):
+        if custom_k is not None and busy["left"]:
+            busy["left"] -= 1
+            raise ComputeBusy("full")
+        return await get_pca(custom_k, feature_cols)
+    monkeypatch.setattr(service, "get_pca", sometimes_busy)
+
+    run_until_precomputed(service)
+
+    assert busy["left"] == 0
+    assert service.analyzer.precompute_status["state"] == "done"
+
+
+def test_precompute_runs_once_per_version(service):
+    async def main():
+        await service.get_pca()
+        first = service._precompute_task
+        await first
+        await service.get_pca(custom_k=3)
+        return first
+    first = asyncio.run(main())
+
+    assert service._precompute_task is first
+
+
+def test_precompute_off(service, monkeypatch):
+    monkeypatch.setattr(compute_pool.settings, "PCA_PRECOMPUTE_ALL_K", False)
+
+    assert asyncio.run(service.get_pca()) is not None
+    assert service._precompute_task is None
+    assert service.analyzer.precompute_status["state"] == "idle"
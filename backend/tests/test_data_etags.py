@@ -0,0 +1,76 @@
+import datetime
+import pandas as pd
+import pytest
+from app.core import analyzers, feature_store
+
+REQUEST = {"weights": [{"metric": "finishing", "weight": 80}, {"metric": "creativity", "weight": 40}], "limit": 5}
+
+
+@pytest.fixture
+def bump_data(monkeypatch, fake_db):
+    """Make the percentiles table look rewritten and let the registry reload it"""
+    def bump():
+        def execute_query(query, params=None):
+            if "COUNT(*)" in query:
+                return pd.DataFrame({"n": [len(fake_db)], "last_computed": [datetime.datetime(2025, 2, 1)]})
+            return fake_db.drop(columns=["computed_at"])
+        monkeypatch.setattr(feature_store, "execute_query", execute_query)
+        assert analyzers.reload_if_changed()
+    return bump
+
+
+@pytest.mark.parametrize("path", ["/api/forward/recommend", "/api/forwards/recommend"])
+def test_recommend_304(client, path):
+    first = client.post(path, json=REQUEST)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"') and first.headers["cache-control"] == "no-cache"
+
+    again = client.post(path, json=REQUEST, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+
+
+def test_recommend_etag_follows_params(client):
+    etag = client.post("/api/forward/recommend", json=REQUEST).headers["etag"]
+    reordered = {**REQUEST, "weights": REQUEST["weights"][::-1]}
+    assert client.post("/api/forward/recommend", json=reordered, headers={"If-None-Match": etag}).status_code == 304
+
+    for changed in [
+        {**REQUEST, "limit": 6},
+        {**REQUEST, "weights": [{"metric": "finishing", "weight": 80}]},
+        {**REQUEST, "filters": {"max_age": 25}},
+    ]:
+        response = client.post("/api/forward/recommend", json=changed, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+
+def test_recommend_etag_follows_data_version(client, bump_data):
+    etag = client.post("/api/forward/recommend", json=REQUEST).headers["etag"]
+    bump_data()
+    response = client.post("/api/forward/recommend", json=REQUEST, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_pca_data_304(client):
+    first = client.get("/api/forwards/pca-data")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = client.get("/api/forwards/pca-data", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+
+    for params in [{"k": 3}, {"layout": "columns"}, {"lod": "grid"}, {"lod": "grid", "bins": 20}]:
+        response = client.get("/api/forwards/pca-data", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 200, params
+        assert response.headers["etag"] != etag
+
+
+def test_pca_data_etag_follows_data_version(client, bump_data):
+    etag = client.get("/api/forwards/pca-data").headers["etag"]
+    bump_data()
+    response = client.get("/api/forwards/pca-data", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
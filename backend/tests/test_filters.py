@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+from app.core.analyzers import get_analyzer
+from app.core.filters import FilterIndex
+
+
+@pytest.fixture
+def forwards(fake_db):
+    """The forward analyzer's snapshot and the same rows as a typed DataFrame"""
+    snapshot = get_analyzer("forward").snapshot
+    df = fake_db[fake_db["position_group"] == "forward"].copy()
+    for col in ["playing_time_90s", "performance_gls", "age"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return snapshot, df
+
+
+def selected(snapshot, mask):
+    return set(snapshot.player_ids[mask].tolist())
+
+
+def in_set(series, values):
+    return series.str.strip().str.lower().isin([v.strip().lower() for v in values])
+
+
+@pytest.mark.parametrize("filters, expected", [
+    # Thresholds fall between the data's one-decimal values so float32 storage can't tip a row over
+    ({"min_90s": 10.25}, lambda df: df["playing_time_90s"] >= 10.25),
+    ({"min_goals": 12}, lambda df: df["performance_gls"] >= 12),
+    ({"min_age": 25}, lambda df: df["age"] >= 25),
+    ({"max_age": 25}, lambda df: df["age"] <= 25),
+    ({"min_age": 21, "max_age": 29}, lambda df: df["age"].between(21, 29)),
+    ({"min_age": 40}, lambda df: df["age"] >= 40),
+    ({"teams": ["team 3", " TEAM 7 "]}, lambda df: in_set(df["team"], ["Team 3", "Team 7"])),
+    ({"teams": ["Nobody FC"]}, lambda df: in_set(df["team"], ["Nobody FC"])),
+    ({"leagues": ["la liga"]}, lambda df: df["league"] == "La Liga"),
+    (
+        {"min_90s": 5.05, "min_goals": 3, "max_age": 30, "teams": ["Team 1", "team 2", "Team 5"],
+         "leagues": ["Premier League", "Serie A"]},
+        lambda df: (df["playing_time_90s"] >= 5.05) & (df["performance_gls"] >= 3) & (df["age"] <= 30)
+        & in_set(df["team"], ["Team 1", "Team 2", "Team 5"])
+        & df["league"].isin(["Premier League", "Serie A"]),
+    ),
+])
+def test_mask_matches_pandas_filter(forwards, filters, expected):
+    snapshot, df = forwards
+    mask = FilterIndex(snapshot).mask(filters)
+    assert mask is not None and mask.dtype == bool and len(mask) == len(snapshot)
+    assert selected(snapshot, mask) == set(df.loc[expected(df).fillna(False).astype(bool), "player_id"])
+
+
+def test_missing_values_never_match(forwards):
+    snapshot, df = forwards
+    assert df["age"].isna().any() and df["team"].isna().any()
+    mask = FilterIndex(snapshot).mask({"min_age": 0, "max_age": 100})
+    assert selected(snapshot, mask) == set(df.loc[df["age"].notna(), "player_id"])
+    teams = sorted(df["team"].dropna().unique())
+    mask = FilterIndex(snapshot).mask({"teams": teams})
+    assert selected(snapshot, mask) == set(df.loc[df["team"].notna(), "player_id"])
+
+
+@pytest.mark.parametrize("filters", [{}, {"min_age": None, "teams": None}, {"teams": [], "leagues": []}])
+def test_no_filters_is_none(forwards, filters):
+    snapshot, _ = forwards
+    assert FilterIndex(snapshot).mask(filters) is None
+
+
+def test_recommend_applies_filters(client, fake_db):
+    df = fake_db[fake_db["position_group"] == "forward"]
+    age = pd.to_numeric(df["age"], errors="coerce")
+    allowed = set(df.loc[(age <= 24) & (df["league"] == "Serie A"), "player_id"])
+
+    response = client.post("/api/forward/recommend", json={
+        "weights": [{"metric": "finishing", "weight": 100}],
+        "limit": 200,
+        "filters": {"max_age": 24, "leagues": ["serie a"]},
+    })
+    assert response.status_code == 200
+    ids = {player["player_id"] for player in response.json()["recommendations"]}
+    assert ids and ids == allowed
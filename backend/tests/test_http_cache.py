@@ -0,0 +1,71 @@
+import pytest
+from fastapi import Request
+from app.core.http_cache import StaticPayload, data_etag, etag_matches, make_etag, recommendation_params
+from app.models.schemas import RecommendationRequest
+
+
+def request_with(headers):
+    return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]})
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("", False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"abcd"', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+    assert etag_matches(header, 'W/"abc"') is expected
+
+
+def test_static_payload():
+    payload = StaticPayload([{"id": "finishing", "weight": 1.5}], max_age=60)
+    assert payload.body == b'[{"id":"finishing","weight":1.5}]'
+    assert payload.etag == make_etag(payload.body)
+
+    response = payload.response(request_with({}))
+    assert response.status_code == 200 and response.body == payload.body
+    assert response.headers["etag"] == payload.etag
+    assert response.headers["cache-control"] == "public, max-age=60"
+
+    response = payload.response(request_with({"If-None-Match": payload.etag}))
+    assert response.status_code == 304 and response.body == b""
+    assert response.headers["etag"] == payload.etag
+    assert payload.response(request_with({"If-None-Match": '"stale"'})).status_code == 200
+
+
+def test_recommendation_params_ignore_weight_order():
+    a = RecommendationRequest(weights=[{"metric": "finishing", "weight": 80}, {"metric": "pace_dribbling", "weight": 20}])
+    b = RecommendationRequest(weights=[{"metric": "pace_dribbling", "weight": 20}, {"metric": "finishing", "weight": 80}])
+    c = RecommendationRequest(weights=[{"metric": "finishing", "weight": 80}, {"metric": "pace_dribbling", "weight": 30}])
+    etag = data_etag("v1", "forward/recommend", recommendation_params(a))
+    assert etag.startswith('W/"')
+    assert data_etag("v1", "forward/recommend", recommendation_params(b)) == etag
+    assert data_etag("v1", "forward/recommend", recommendation_params(c)) != etag
+    assert data_etag("v2", "forward/recommend", recommendation_params(a)) != etag
+    assert data_etag("v1", "midfielder/recommend", recommendation_params(a)) != etag
+
+
+@pytest.mark.parametrize("path", ["/api/forward/metrics", "/api/forwards/metrics", "/api/goalkeeper/metrics",
+                                  "/api/algorithms/list"])
+def test_catalog_304(client, path):
+    first = client.get(path)
+    assert first.status_code == 200 and first.json()
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"].startswith("public, max-age=")
+
+    again = client.get(path, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+    assert client.get(path, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_catalogs_differ_per_position(client):
+    forward = client.get("/api/forward/metrics").headers["etag"]
+    assert client.get("/api/forwards/metrics").headers["etag"] == forward
+    assert client.get("/api/midfielder/metrics").headers["etag"] != forward
+    assert client.get("/api/midfielder/metrics", headers={"If-None-Match": forward}).status_code == 200
@@ -0,0 +1,122 @@
+import math
+from collections import Counter, defaultdict
+
+import numpy as np
+import pytest
+from app.core.lod import _hex_cells, bin_points, in_bbox, parse_bbox
+
+
+@pytest.fixture
+def scatter():
+    rng = np.random.default_rng(3)
+    coords = np.vstack([rng.normal(loc, 1.5, size=(200, 2)) for loc in ([0, 0], [5, 2], [-3, 6])])
+    clusters = np.repeat([0, 1, 2], 200)
+    return coords, clusters
+
+
+def dominant(clusters):
+    """Majority cluster, lowest id on ties"""
+    counts = Counter(clusters)
+    best = max(counts.values())
+    return min(c for c, n in counts.items() if n == best)
+
+
+def brute_force_grid(coords, clusters, size):
+    origin = coords.min(axis=0)
+    cells = defaultdict(list)
+    for (x, y), cluster in zip(coords, clusters):
+        i, j = math.floor((x - origin[0]) / size), math.floor((y - origin[1]) / size)
+        cells[(i, j)].append(int(cluster))
+    return {
+        (round(origin[0] + (i + 0.5) * size, 9), round(origin[1] + (j + 0.5) * size, 9)): (len(members), dominant(members))
+        for (i, j), members in cells.items()
+    }
+
+
+def hex_lattice(coords, size):
+    """Centres of the pointy-top hexagon lattice covering the map"""
+    origin = coords.min(axis=0)
+    radius = size / math.sqrt(3)
+    span = int(np.ceil(np.max(coords.max(axis=0) - origin) / radius)) + 2
+    q, r = np.meshgrid(np.arange(-span, span + 1), np.arange(-span, span + 1))
+    return np.column_stack([
+        origin[0] + radius * math.sqrt(3) * (q.ravel() + r.ravel() / 2),
+        origin[1] + radius * 1.5 * r.ravel(),
+    ])
+
+
+def as_cells(binned):
+    return {(round(c["x"], 9), round(c["y"], 9)): (c["count"], c["cluster_id"]) for c in binned["cells"]}
+
+
+@pytest.mark.parametrize("bins", [1, 7, 40])
+def test_grid_matches_brute_force(scatter, bins):
+    coords, clusters = scatter
+    binned = bin_points(coords, clusters, "grid", bins)
+    assert binned["cell_size"] == pytest.approx(np.max(np.ptp(coords, axis=0)) / bins)
+    assert sum(c["count"] for c in binned["cells"]) == len(coords)
+    assert as_cells(binned) == brute_force_grid(coords, clusters, binned["cell_size"])
+
+
+@pytest.mark.parametrize("bins", [1, 7, 40])
+def test_hex_matches_brute_force(scatter, bins):
+    coords, clusters = scatter
+    binned = bin_points(coords, clusters, "hex", bins)
+    assert sum(c["count"] for c in binned["cells"]) == len(coords)
+
+    # Every point sits in a nearest lattice hexagon (points on an edge may take either side)
+    _, centres = _hex_cells(coords, binned["cell_size"], coords.min(axis=0))
+    lattice = hex_lattice(coords, binned["cell_size"])
+    members = defaultdict(list)
+    for point, centre, cluster in zip(coords, centres, clusters):
+        nearest = np.min(np.linalg.norm(lattice - point, axis=1))
+        assert np.min(np.linalg.norm(lattice - centre, axis=1)) == pytest.approx(0, abs=1e-9)
+        assert np.linalg.norm(centre - point) == pytest.approx(nearest, abs=1e-9)
+        members[(round(centre[0], 9), round(centre[1], 9))].append(int(cluster))
+
+    assert as_cells(binned) == {centre: (len(m), dominant(m)) for centre, m in members.items()}
+
+
+def test_cluster_labels(scatter):
+    coords, clusters = scatter
+    for cell in bin_points(coords, clusters, "hex", 3)["cells"]:
+        assert cell["cluster"] == f"Group {cell['cluster_id'] + 1}"
+
+
+def test_degenerate_inputs():
+    assert bin_points(np.empty((0, 2)), np.empty(0, dtype=np.int64)) == {"cell_size": 0.0, "cells": []}
+    same = bin_points(np.ones((4, 2)), np.array([1, 1, 0, 1]), "grid")
+    assert same["cell_size"] == 1.0
+    assert [(c["count"], c["cluster_id"]) for c in same["cells"]] == [(4, 1)]
+    with pytest.raises(ValueError):
+        bin_points(np.ones((4, 2)), np.zeros(4, dtype=np.int64), "square")
+    with pytest.raises(ValueError):
+        bin_points(np.ones((4, 2)), np.zeros(4, dtype=np.int64), "grid", 0)
+
+
+def test_bbox():
+    assert parse_bbox("-1,-2.5,3,4") == (-1.0, -2.5, 3.0, 4.0)
+    for value in ["1,2,3", "3,0,1,4", "a,b,c,d"]:
+        with pytest.raises(ValueError):
+            parse_bbox(value)
+    coords = np.array([[0, 0], [1, 1], [2, 2], [1, 3]])
+    assert in_bbox(coords, (0, 0, 1, 2)).tolist() == [True, True, False, False]
+
+
+def test_pca_data_lod(client):
+    response = client.get("/api/forwards/pca-data", params={"lod": "hex", "bins": 10})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["points"] == [] and body["lod"] == "hex"
+    full = client.get("/api/forwards/pca-data").json()
+    assert sum(c["count"] for c in body["cells"]) == len(full["points"])
+
+    x_min, y_min = (min(p[axis] for p in full["points"]) for axis in ("x", "y"))
+    box = f"{x_min},{y_min},{x_min + 1},{y_min + 1}"
+    inside = client.get("/api/forwards/pca-data", params={"lod": "grid", "bbox": box}).json()
+    assert inside["points"] == [
+        p for p in full["points"] if x_min <= p["x"] <= x_min + 1 and y_min <= p["y"] <= y_min + 1
+    ]
+    assert client.get("/api/forwards/pca-data", params={"lod": "tiles"}).status_code == 400
+    assert client.get("/api/forwards/pca-data", params={"lod": "grid", "bins": 0}).status_code == 400
+    assert client.get("/api/forwards/pca-data", params={"bbox": "1,2"}).status_code == 400
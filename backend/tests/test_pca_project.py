@@ -0,0 +1,45 @@
+import pytest
+
+
+@pytest.fixture
+def forward_ids(fake_db):
+    return fake_db.loc[fake_db["position_group"] == "forward", "player_id"].tolist()
+
+
+@pytest.mark.parametrize("player_ids", [[], [99999], [99999, -1, 99999]])
+def test_nothing_to_project(client, player_ids):
+    response = client.post("/api/forwards/pca-project", json={"player_ids": player_ids, "k": 4})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body == {"k": 4, "points": [], "missing": player_ids}
+
+
+def test_mixed_known_and_unknown_ids(client, forward_ids):
+    known = forward_ids[:3]
+    response = client.post("/api/forwards/pca-project",
+                           json={"player_ids": [known[0], 99999, known[1], known[2], -5], "k": 4})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["k"] == 4
+    assert body["missing"] == [99999, -5]
+    assert [point["player_id"] for point in body["points"]] == known
+    for point in body["points"]:
+        assert 0 <= point["cluster_id"] < 4
+        assert point["cluster"] == f"Group {point['cluster_id'] + 1}"
+
+
+def test_projection_matches_the_map(client, forward_ids):
+    """Players already on the map land on their own coordinates and cluster"""
+    pca = client.get("/api/forwards/pca-data", params={"k": 4}).json()
+    on_map = {point["player_id"]: point for point in pca["points"]}
+    ids = [player_id for player_id in forward_ids if player_id in on_map][:10]
+
+    body = client.post("/api/forwards/pca-project", json={"player_ids": ids, "k": 4}).json()
+
+    for point in body["points"]:
+        expected = on_map[point["player_id"]]
+        assert point["x"] == pytest.approx(expected["x"], abs=1e-6)
+        assert point["y"] == pytest.approx(expected["y"], abs=1e-6)
+        assert point["cluster"] == expected["cluster"]
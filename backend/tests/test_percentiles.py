@@ -0,0 +1,61 @@
+import pytest
+from app.api.stats import MAX_BATCH_PLAYERS
+from app.core.metrics import POSITION_METRICS
+
+
+@pytest.mark.parametrize("position", ["forward", "midfielder", "defender", "goalkeeper"])
+def test_percentiles_agree_with_recommendation_ranks(client, position):
+    metrics = list(POSITION_METRICS[position])
+    response = client.post(f"/api/{position}/recommend", json={
+        "weights": [{"metric": metric, "weight": 50} for metric in metrics],
+        "limit": 15,
+    })
+    assert response.status_code == 200
+    recommendations = response.json()["recommendations"]
+    assert recommendations
+
+    batch = client.post("/api/stats/percentiles", json={
+        "position": position,
+        "player_ids": [player["player_id"] for player in recommendations],
+    }).json()
+    assert batch["missing"] == []
+
+    for player in recommendations:
+        percentiles = batch["players"][str(player["player_id"])]
+        single = client.get(f"/api/stats/percentiles/{position}/{player['player_id']}").json()
+        assert single == percentiles
+        for metric in metrics:
+            # /recommend shows 50 when a player has none of the metric's columns
+            assert player["percentile_ranks"][metric] == percentiles.get(metric, 50.0), metric
+
+
+def test_batch_limit(client):
+    ids = list(range(1, MAX_BATCH_PLAYERS + 2))
+    response = client.post("/api/stats/percentiles", json={"position": "forward", "player_ids": ids})
+    assert response.status_code == 400
+    assert str(MAX_BATCH_PLAYERS) in response.json()["detail"]
+
+    # Exactly at the limit is fine - ids past the 120 forwards are reported missing
+    response = client.post("/api/stats/percentiles", json={"position": "forward", "player_ids": ids[:-1]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["position"] == "forward"
+    assert sorted(int(pid) for pid in body["players"]) == list(range(1, 121))
+    assert sorted(body["missing"]) == list(range(121, MAX_BATCH_PLAYERS + 1))
+
+
+def test_batch_missing_and_position(client):
+    response = client.post("/api/stats/percentiles", json={"position": "forwards", "player_ids": [3, 999999, 250]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["position"] == "forward"
+    assert list(body["players"]) == ["3"]
+    assert sorted(body["missing"]) == [250, 999999]
+
+    assert client.post("/api/stats/percentiles", json={"position": "goalie", "player_ids": [1]}).status_code == 404
+    assert client.post("/api/stats/percentiles", json={"position": "forward", "player_ids": []}).json()["players"] == {}
+
+
+def test_single_player_errors(client):
+    assert client.get("/api/stats/percentiles/forward/999999").status_code == 404
+    assert client.get("/api/stats/percentiles/goalie/1").status_code == 404
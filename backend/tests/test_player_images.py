@@ -0,0 +1,57 @@
+import json
+import os
+import time
+from datetime import datetime, timedelta
+import pytest
+from app.core import cache
+from app.services.player_images import PlayerImageService
+
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # the service keeps its JSON files under the working directory
+    backend = cache.MemoryCacheBackend()
+    monkeypatch.setattr(cache, "_backend", backend)
+    return backend
+
+
+def write_entry(service, key, url, age):
+    with open(os.path.join(service.cache_dir, f"{key}.json"), "w") as f:
+        json.dump({"image_url": url, "timestamp": (datetime.now() - age).isoformat()}, f)
+
+
+def shared_expiry(service, backend, key):
+    entry = backend._entries.get(service.cache.key(None, {"player": key}))
+    return None if entry is None else entry[1]
+
+
+def test_refill_keeps_the_remaining_lifetime(backend):
+    service = PlayerImageService()
+    key = service._get_cache_key("Some Player", "Some Team")
+    write_entry(service, key, "http://img/a.png", age=timedelta(days=29))
+
+    assert service.get_cached_image("Some Player", "Some Team") == "http://img/a.png"
+
+    remaining = shared_expiry(service, backend, key) - time.time()
+    assert timedelta(hours=23, minutes=59).total_seconds() < remaining <= timedelta(days=1).total_seconds()
+
+
+def test_expired_file_entry_is_not_refilled(backend):
+    service = PlayerImageService()
+    key = service._get_cache_key("Old Player", "Old Team")
+    write_entry(service, key, "http://img/old.png", age=timedelta(days=31))
+
+    assert service.get_cached_image("Old Player", "Old Team") is None
+    assert shared_expiry(service, backend, key) is None
+
+
+def test_saved_lookup_survives_a_new_shared_cache(backend, monkeypatch):
+    service = PlayerImageService()
+    key = service._get_cache_key("New Player", "New Team")
+    service._save_to_cache(key, "http://img/new.png")
+
+    remaining = shared_expiry(service, backend, key) - time.time()
+    assert remaining == pytest.approx(timedelta(days=30).total_seconds(), abs=60)
+
+    monkeypatch.setattr(cache, "_backend", cache.MemoryCacheBackend())  # e.g. a restarted worker
+    assert PlayerImageService().get_cached_image("New Player", "New Team") == "http://img/new.png"
@@ -0,0 +1,41 @@
+import pytest
+from app.core.analyzers import get_analyzer
+from app.core.calculations import PlayerAnalyzer
+
+REQUEST = {"weights": [{"metric": "finishing", "weight": 80}, {"metric": "creativity", "weight": 40}], "limit": 5}
+
+
+@pytest.fixture
+def broken_scoring(monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("connection to database lost")
+    monkeypatch.setattr(PlayerAnalyzer, "calculate_metric_scores", fail)
+
+
+@pytest.mark.parametrize("path", ["/api/forward/recommend", "/api/forwards/recommend"])
+def test_failure_is_a_500_without_validators(client, broken_scoring, path):
+    response = client.post(path, json=REQUEST, headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 500
+    assert "connection to database lost" in response.json()["detail"]
+    assert "etag" not in response.headers
+    assert "cache-control" not in response.headers
+
+
+def test_failure_is_not_served_later(client, monkeypatch):
+    """Once scoring works again the client gets the real ranking, not an error"""
+    def fail(*args, **kwargs):
+        raise RuntimeError("connection to database lost")
+    with monkeypatch.context() as patch:
+        patch.setattr(PlayerAnalyzer, "calculate_metric_scores", fail)
+        assert client.post("/api/forward/recommend", json=REQUEST).status_code == 500
+
+    response = client.post("/api/forward/recommend", json=REQUEST)
+    assert response.status_code == 200
+    assert len(response.json()["recommendations"]) == 5
+    assert response.headers["etag"]
+
+
+def test_get_recommendations_raises_instead_of_placeholder(fake_db, broken_scoring):
+    with pytest.raises(RuntimeError):
+        get_analyzer("forward").get_recommendations({"finishing": 50})
@@ -0,0 +1,74 @@
+import json
+import numpy as np
+import pytest
+from app.core import serialization
+from app.core.config import settings
+from app.core.serialization import FastJSONResponse, dumps
+from app.models.schemas import SimilarPlayer
+
+CONTENT = {
+    "int": np.int64(7),
+    "float": np.float32(0.5),
+    "bool": np.bool_(True),
+    "array": np.array([1.5, 2.5]),
+    "matrix": np.arange(4, dtype=np.int32).reshape(2, 2),
+    "model": SimilarPlayer(player_id=1, name="A", team="B", position="FW", distance=0.25, similarity=0.75),
+    "text": "Vinícius",
+    1: "non-string key",
+}
+EXPECTED = {
+    "int": 7,
+    "float": 0.5,
+    "bool": True,
+    "array": [1.5, 2.5],
+    "matrix": [[0, 1], [2, 3]],
+    "model": {"player_id": 1, "name": "A", "team": "B", "position": "FW", "distance": 0.25, "similarity": 0.75},
+    "text": "Vinícius",
+    "1": "non-string key",
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        if serialization.orjson is None:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(settings, "FAST_JSON", True)
+    else:
+        monkeypatch.setattr(settings, "FAST_JSON", False)
+    return request.param
+
+
+def test_dumps_round_trips_numpy(encoder):
+    body = dumps(CONTENT)
+    assert isinstance(body, bytes)
+    assert json.loads(body) == EXPECTED
+
+
+def test_encoders_agree():
+    if serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    content = {k: v for k, v in CONTENT.items() if k != 1}
+    assert json.loads(dumps(content)) == json.loads(
+        json.dumps(content, default=serialization._default, separators=(",", ":"))
+    )
+
+
+def test_unknown_types_raise(encoder):
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+def test_nan(encoder):
+    if encoder == "orjson":
+        assert json.loads(dumps({"x": np.array([np.nan, 1.0]), "y": float("nan")})) == {"x": [None, 1.0], "y": None}
+    else:
+        with pytest.raises(ValueError):
+            dumps({"y": float("nan")})
+
+
+def test_fast_json_response(encoder):
+    response = FastJSONResponse({"points": np.array([[0.5, 1.0]]), "k": np.int64(3)}, headers={"ETag": '"x"'})
+    assert response.media_type == "application/json"
+    assert response.headers["etag"] == '"x"'
+    assert json.loads(response.body) == {"points": [[0.5, 1.0]], "k": 3}
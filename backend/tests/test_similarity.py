@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from app.core.analyzers import get_analyzer
+
+
+def brute_force(index, player_id, metric):
+    """Every other indexed player ordered by a full scan, with the score /similar reports"""
+    X = np.nan_to_num(index.snapshot.matrix(index.feature_cols)[index.rows], nan=50.0).astype(np.float64)
+    X = (X - X.mean(axis=0)) / X.std(axis=0)
+    row = index.row_by_player[player_id]
+    if metric == "cosine":
+        unit = X / np.linalg.norm(X, axis=1, keepdims=True)
+        scores = unit @ unit[row]
+    else:
+        scores = 1 / (1 + np.linalg.norm(X - X[row], axis=1))
+    order = [i for i in np.argsort(-scores, kind="stable") if i != row]
+    ids = index.snapshot.player_ids[index.rows]
+    return [(int(ids[i]), float(scores[i])) for i in order]
+
+
+@pytest.mark.parametrize("metric", ["cosine", "euclidean"])
+@pytest.mark.parametrize("position", ["forward", "goalkeeper"])
+def test_query_matches_brute_force(fake_db, position, metric):
+    index = get_analyzer(position).similarity_index
+    for player_id in list(index.row_by_player)[::7]:
+        expected = brute_force(index, player_id, metric)[:10]
+        results = index.query(player_id, limit=10, metric=metric)
+        assert [r["player_id"] for r in results] == [pid for pid, _ in expected]
+        assert [r["similarity"] for r in results] == pytest.approx([score for _, score in expected], abs=1e-9)
+        similarities = [r["similarity"] for r in results]
+        assert similarities == sorted(similarities, reverse=True)
+
+
+@pytest.mark.parametrize("metric", ["cosine", "euclidean"])
+def test_similar_route(client, metric):
+    index = get_analyzer("forward").similarity_index
+    player_id = next(iter(index.row_by_player))
+
+    response = client.get(f"/api/forward/{player_id}/similar", params={"metric": metric, "limit": 5})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["player_id"] == player_id and body["metric"] == metric
+    assert [p["player_id"] for p in body["similar"]] == [pid for pid, _ in brute_force(index, player_id, metric)[:5]]
+    assert player_id not in [p["player_id"] for p in body["similar"]]
+
+    # The legacy forward route serves the same neighbours
+    assert client.get(f"/api/forwards/{player_id}/similar", params={"metric": metric, "limit": 5}).json() == body
+
+
+def test_limit_larger_than_pool(fake_db):
+    index = get_analyzer("goalkeeper").similarity_index
+    player_id = next(iter(index.row_by_player))
+    results = index.query(player_id, limit=1000, metric="euclidean")
+    assert len(results) == len(index.row_by_player) - 1
+
+
+def test_similar_errors(client):
+    assert client.get("/api/forward/1/similar", params={"metric": "manhattan"}).status_code == 400
+    assert client.get("/api/forward/1/similar", params={"limit": 0}).status_code == 400
+    assert client.get("/api/forward/999999/similar").status_code == 404
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from app.core.skyline import pareto_fronts
+
+
+def brute_force_fronts(X: np.ndarray) -> np.ndarray:
+    """Peel non-dominated layers using the full pairwise dominance matrix (higher is better)"""
+    # dominates[j, i]: row j is >= row i everywhere and > somewhere
+    dominates = (np.all(X[:, None, :] >= X[None, :, :], axis=2)
+                 & np.any(X[:, None, :] > X[None, :, :], axis=2))
+    fronts = np.full(len(X), np.inf)
+    remaining = np.ones(len(X), dtype=bool)
+    front = 1
+    while remaining.any():
+        layer = remaining & ~dominates[remaining].any(axis=0)
+        fronts[layer] = front
+        remaining &= ~layer
+        front += 1
+    return fronts
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n_rows, n_cols", [(1, 3), (40, 1), (60, 2), (300, 3), (600, 4)])
+def test_matches_brute_force(seed, n_rows, n_cols):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, n_cols))
+
+    np.testing.assert_array_equal(pareto_fronts(X), brute_force_fronts(X))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force_with_ties(seed):
+    # Coarse integer scores: many duplicate rows and equal sums across blocks
+    rng = np.random.default_rng(seed)
+    X = rng.integers(0, 4, size=(500, 3)).astype(float)
+
+    np.testing.assert_array_equal(pareto_fronts(X), brute_force_fronts(X))
+
+
+def test_max_rows_stops_after_the_front_that_reaches_it():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 3))
+    full = brute_force_fronts(X)
+
+    fronts = pareto_fronts(X, max_rows=50)
+
+    assigned = np.isfinite(fronts)
+    last = fronts[assigned].max()
+    np.testing.assert_array_equal(fronts[assigned], full[assigned])
+    np.testing.assert_array_equal(assigned, full <= last)
+    assert assigned.sum() >= 50
+    assert (full <= last - 1).sum() < 50
+
+
+def test_empty_input():
+    assert len(pareto_fronts(np.empty((0, 3)))) == 0
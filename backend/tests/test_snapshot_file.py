@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.core.snapshot import PlayerSnapshot
+from app.core.snapshot_file import read_snapshot, snapshot_path, write_snapshot
+
+
+@pytest.fixture
+def snapshot():
+    return PlayerSnapshot.from_frame(pd.DataFrame({
+        'player_id': [7, 3, 11, 5],
+        'name': ['A', 'B', None, 'D'],
+        'team': ['X', 'X', 'Y', None],
+        'position_group': ['forward', 'forward', 'defender', 'defender'],
+        'age': [21, None, 30, 25],
+        'shooting_pct': [99.5, 12.25, None, 50.0],
+    }))
+
+
+@pytest.fixture
+def slices():
+    return {'forward': slice(0, 2), 'defender': slice(2, 4)}
+
+
+def test_round_trip(tmp_path, snapshot, slices):
+    path = snapshot_path(str(tmp_path), "v1")
+    write_snapshot(path, snapshot, slices, "v1")
+
+    loaded, loaded_slices = read_snapshot(path, "v1")
+
+    assert loaded_slices == slices
+    assert loaded.columns == snapshot.columns
+    np.testing.assert_array_equal(loaded.player_ids, snapshot.player_ids)
+    np.testing.assert_array_equal(loaded.features, snapshot.features)  # NaN == NaN here
+    assert loaded.features.dtype == np.float32
+    for field in ('name', 'team', 'position_group'):
+        assert loaded.labels(field) == snapshot.labels(field)
+    assert loaded.labels('name') == ['A', 'B', None, 'D']
+
+
+def test_round_trip_views_are_read_only(tmp_path, snapshot, slices):
+    path = snapshot_path(str(tmp_path), "v1")
+    write_snapshot(path, snapshot, slices, "v1")
+
+    loaded, _ = read_snapshot(path)
+
+    assert not loaded.features.flags.writeable
+    with pytest.raises(ValueError):
+        loaded.features[0, 0] = 1.0
+
+
+def test_path_depends_on_version(tmp_path):
+    assert snapshot_path(str(tmp_path), "v1") != snapshot_path(str(tmp_path), "v2")
+
+
+def test_version_mismatch(tmp_path, snapshot, slices):
+    path = snapshot_path(str(tmp_path), "v1")
+    write_snapshot(path, snapshot, slices, "v1")
+
+    assert read_snapshot(path, "v2") is None
+    assert read_snapshot(path) is not None  # no version given: any version is accepted
+
+
+def test_missing_file(tmp_path):
+    assert read_snapshot(str(tmp_path / "nope.bin")) is None
+
+
+# Empty, inside the magic, inside the header, half way, and into the trailing code
+# arrays (cutting only the last array's alignment padding would leave the data intact)
+@pytest.mark.parametrize("keep", [0, 6, 20, 0.5, -100])
+def test_truncated_file(tmp_path, snapshot, slices, keep):
+    path = snapshot_path(str(tmp_path), "v1")
+    write_snapshot(path, snapshot, slices, "v1")
+    data = open(path, "rb").read()
+    if isinstance(keep, float):
+        keep = int(len(data) * keep)
+    elif keep < 0:
+        keep = len(data) + keep
+
+    with open(path, "wb") as f:
+        f.write(data[:keep])
+
+    assert read_snapshot(path, "v1") is None
+
+
+def test_not_a_snapshot_file(tmp_path):
+    path = tmp_path / "garbage.bin"
+    path.write_bytes(b"definitely not a snapshot" * 10)
+
+    assert read_snapshot(str(path)) is None